@@ -8,6 +8,7 @@ sys.path.insert(0, project_root)
 
 # Imports should now work
 from src.db.database import init_db
+from src.db.connection import close_all
 from tkinter import Tk
 from src.ui.interface import MediaPlayerUI
 
@@ -21,6 +22,8 @@ def main():
         root = Tk()
         app = MediaPlayerUI(root)
         root.mainloop()
+        app.shutdown()
+        close_all()
 
     except ImportError as e:
         print(f"Import error: {e}")
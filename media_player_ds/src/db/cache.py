@@ -0,0 +1,128 @@
+"""Bounded in-process caches for the database layer.
+
+LRUCache keeps the most recently used entries up to an entry limit and a
+byte limit, and counts hits, misses and evictions so the limits can be
+tuned. Values should be immutable (row tuples, tuples of rows): callers
+build fresh Song objects from them, so nothing handed out can change a
+cached entry.
+
+Every invalidation bumps ``generation``. A reader that misses notes the
+generation before querying SQLite and passes it to ``put``; if a write
+invalidated anything in between, the (possibly stale) row is not cached.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+def estimate_size(value) -> int:
+    """Approximate bytes held by a value, following tuples and lists"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(estimate_size(item) for item in value)
+    return size
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with entry and byte limits"""
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = estimate_size):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.generation = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable, default=None):
+        """Return the cached value (marking it most recently used) or default"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value, generation: Optional[int] = None) -> bool:
+        """Cache value, evicting least recently used entries to stay within the limits.
+
+        With generation (read before fetching value), nothing is stored if
+        the cache was invalidated since. Returns whether value was stored.
+        """
+        size = self.sizeof(value)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            if self.max_bytes is not None and size > self.max_bytes:
+                return False
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                    self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable):
+        self.invalidate_many((key,))
+
+    def invalidate_many(self, keys: Iterable[Hashable]):
+        """Drop keys (present or not) and stop in-flight reads from caching stale values"""
+        with self._lock:
+            self.generation += 1
+            for key in keys:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[1]
+                    self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self.generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __repr__(self):
+        return f"LRUCache({len(self)}/{self.max_entries} entries, {self._bytes} bytes)"
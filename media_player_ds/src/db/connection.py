@@ -0,0 +1,96 @@
+"""Persistent per-thread SQLite connections for the database layer.
+
+Opening a connection costs far more than a single-row query, so every
+thread keeps one long-lived connection per database file instead of
+connecting on each call. Connections are opened in WAL mode with tuned
+pragmas, and sqlite3's per-connection statement cache means the constant
+SQL strings in database.py are prepared once and reused for the lifetime
+of the connection.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Prepared statements kept per connection (sqlite3's default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+PRAGMAS = (
+    ("journal_mode", "WAL"),      # readers never block the writer
+    ("synchronous", "NORMAL"),    # fsync on checkpoint instead of every commit (safe with WAL)
+    ("temp_store", "MEMORY"),
+    ("cache_size", "-16000"),     # ~16 MB page cache
+    ("busy_timeout", "5000"),     # wait up to 5s for another writer instead of failing
+)
+
+_local = threading.local()
+_registry_lock = threading.Lock()
+_open_connections: List[sqlite3.Connection] = []
+_generation = 0  # bumped by close_all() so other threads drop their closed connections
+
+
+def _thread_connections() -> Dict[str, sqlite3.Connection]:
+    connections = getattr(_local, "connections", None)
+    if connections is None or _local.generation != _generation:
+        connections = _local.connections = {}
+        _local.generation = _generation
+    return connections
+
+
+def _open(path: str) -> sqlite3.Connection:
+    # check_same_thread=False only so close_all() can close connections
+    # owned by other threads; each connection is still used by one thread.
+    conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE,
+                           check_same_thread=False)
+    for name, value in PRAGMAS:
+        conn.execute(f"PRAGMA {name} = {value}")
+    with _registry_lock:
+        _open_connections.append(conn)
+    return conn
+
+
+def get_connection(db_path: str) -> sqlite3.Connection:
+    """Return this thread's connection to db_path, opening it on first use"""
+    key = os.path.abspath(db_path)
+    connections = _thread_connections()
+    conn = connections.get(key)
+    if conn is None:
+        conn = connections[key] = _open(key)
+    return conn
+
+
+@contextmanager
+def transaction(db_path: str):
+    """Yield this thread's connection and commit on success, roll back on error"""
+    conn = get_connection(db_path)
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def close_connection(db_path: Optional[str] = None):
+    """Close this thread's connection to db_path (or all of them when None)"""
+    connections = _thread_connections()
+    keys = list(connections) if db_path is None else [os.path.abspath(db_path)]
+    for key in keys:
+        conn = connections.pop(key, None)
+        if conn is not None:
+            with _registry_lock:
+                if conn in _open_connections:
+                    _open_connections.remove(conn)
+            conn.close()
+
+
+def close_all():
+    """Close every connection opened by any thread (e.g. on application exit)"""
+    global _generation
+    with _registry_lock:
+        connections = list(_open_connections)
+        _open_connections.clear()
+        _generation += 1
+    for conn in connections:
+        conn.close()
@@ -3,243 +3,777 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 import sqlite3
+import threading
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from src.db.connection import get_connection, transaction
+from src.db import migrations, search_index
+from src.db.cache import LRUCache
 from src.model.song import Song
+from src.utils.logger import get_logger
 
-
+log = get_logger("db")
 
 
 DB_PATH = "songs.db"
 
+SONG_COLUMNS = "id, title, artist, album, duration, file_path, genre, year, created_at"
+# Same columns prefixed with the table name, for queries that join songs_fts
+QUALIFIED_SONG_COLUMNS = ", ".join(f"songs.{column.strip()}" for column in SONG_COLUMNS.split(","))
+
+# Rows handed to each executemany() call by insert_songs_bulk
+DEFAULT_BULK_CHUNK_SIZE = 1000
+
+# Rows pulled per fetchmany() call by the streaming readers (iter_songs, iter_search)
+DEFAULT_FETCH_SIZE = 1000
+
+INSERT_SONG_SQL = '''
+    INSERT INTO songs (title, artist, album, duration, file_path, genre, year)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Restores put a song back under its original id (and creation time)
+RESTORE_SONG_SQL = f'''
+    INSERT INTO songs ({SONG_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Ids bound per "id IN (...)" query, below SQLite's default host parameter limit
+ID_CHUNK_SIZE = 500
+
+# Read-through cache of song rows for get_song_by_id, keyed by (DB_PATH, id).
+# Every write in this module invalidates the ids it touched once it commits,
+# so writes that bypass this module must call invalidate_caches().
+SONG_CACHE_MAX_ENTRIES = 4096
+SONG_CACHE_MAX_BYTES = 4 * 1024 * 1024
+_song_cache = LRUCache(SONG_CACHE_MAX_ENTRIES, SONG_CACHE_MAX_BYTES)
+
+# Search results (search_songs, count_search_results and query pages of
+# get_songs_page) are cached under the catalog write generation, which
+# every write bumps. Entries from before a write are never looked up again
+# and age out of the LRU, so invalidation is O(1) whatever the cache holds.
+SEARCH_CACHE_MAX_ENTRIES = 256
+SEARCH_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_search_cache = LRUCache(SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_MAX_BYTES)
+
+_write_generation = 0
+_write_generation_lock = threading.Lock()
+
+def _songs_written(song_ids: Iterable[int] = ()):
+    """Invalidate cached reads after a write to songs has committed"""
+    global _write_generation
+    with _write_generation_lock:
+        _write_generation += 1
+    _song_cache.invalidate_many([(DB_PATH, song_id) for song_id in song_ids])
+
+def write_generation() -> int:
+    """Counter bumped by every write to the songs table"""
+    return _write_generation
+
+def invalidate_caches():
+    """Drop every cached read (after writing to the database with raw SQL)"""
+    _songs_written()
+    _song_cache.clear()
+
+def clear_song_cache():
+    _song_cache.clear()
+
+def song_cache_stats() -> dict:
+    """Entries, bytes, hits, misses, hit rate, evictions and invalidations of the song cache"""
+    return _song_cache.stats()
+
+def clear_search_cache():
+    _search_cache.clear()
+
+def search_cache_stats() -> dict:
+    """Same counters as song_cache_stats(), for the search result cache"""
+    stats = _search_cache.stats()
+    stats["write_generation"] = _write_generation
+    return stats
+
+def _search_cache_key(conn, query: str, *extra) -> tuple:
+    """Cache key for a search: the normalized query, stamped with the write generation"""
+    generation = _write_generation  # read before querying, so a racing write makes the entry unreachable
+    match_query = search_index.build_match_query(query)
+    if match_query is not None and search_index.has_search_index(conn):
+        # "Hotel  CAL" and "hotel cal" run the same FTS query
+        normalized = ("match", match_query)
+    else:
+        normalized = ("like", query)
+    return (DB_PATH, generation) + normalized + extra
+
+def _song_values(song: Song) -> tuple:
+    return (song.title, song.artist, song.album, song.duration,
+            song.file_path, song.genre, song.year)
+
+def _row_to_song(row) -> Song:
+    """Build a Song from a row selected with SONG_COLUMNS"""
+    return Song(
+        song_id=row[0],
+        title=row[1],
+        artist=row[2],
+        album=row[3] or "",
+        duration=row[4] or 0,
+        file_path=row[5] or "",
+        genre=row[6] or "",
+        year=row[7],
+        created_at=row[8]
+    )
+
 def init_db():
-    """Initialize SQLite DB and create songs table if not exists"""
+    """Create the database, or upgrade its schema to the latest migration"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS songs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                artist TEXT NOT NULL,
-                album TEXT,
-                duration INTEGER DEFAULT 0,
-                file_path TEXT,
-                genre TEXT,
-                year INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        conn.commit()
-        print("Database initialized successfully")
+        with transaction(DB_PATH) as conn:
+            version = migrations.migrate(conn)
+        invalidate_caches()  # the file may have been replaced
+        log.info("Database initialized successfully (schema version %d)", version)
 
     except sqlite3.Error as e:
-        print(f"Error initializing database: {e}")
-    finally:
-        if conn:
-            conn.close()
+        log.error("Error initializing database: %s", e)
 
-def get_all_songs() -> List[Song]:
-    """Retrieve all songs from the database"""
-    songs = []
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+def iter_songs(batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Song]:
+    """Stream every song in title order, reading batch_size rows at a time.
 
-        cursor.execute('''
-            SELECT id, title, artist, album, duration, file_path, genre, year, created_at
+    Only one batch of rows is held in memory, so building an index from
+    the generator costs memory for the index only. The rows come from the
+    covering title index, so no sort is needed first. Consume the
+    generator fully (or close it) before writing on the same thread.
+    """
+    try:
+        cursor = get_connection(DB_PATH).execute(f'''
+            SELECT {SONG_COLUMNS}
             FROM songs
-            ORDER BY title, artist
+            ORDER BY title, artist, id
         ''')
-
-        rows = cursor.fetchall()
-
-        for row in rows:
-            song = Song(
-                song_id=row[0],
-                title=row[1],
-                artist=row[2],
-                album=row[3] or "",
-                duration=row[4] or 0,
-                file_path=row[5] or "",
-                genre=row[6] or "",
-                year=row[7],
-                created_at=row[8]
-            )
-            songs.append(song)
+        yield from _iter_cursor(cursor, batch_size)
 
     except sqlite3.Error as e:
-        print(f"Error retrieving songs: {e}")
+        log.error("Error retrieving songs: %s", e)
+
+def _iter_cursor(cursor, batch_size: int) -> Iterator[Song]:
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield _row_to_song(row)
     finally:
-        if conn:
-            conn.close()
+        cursor.close()
 
-    return songs
+def get_all_songs() -> List[Song]:
+    """Retrieve all songs from the database"""
+    return list(iter_songs())
 
 def get_song_by_id(song_id: int) -> Optional[Song]:
-    """Retrieve a specific song by ID"""
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
+    """Retrieve a specific song by ID.
+
+    Served from the song cache when possible; each call returns a new
+    Song, so callers may modify it freely.
+    """
+    key = (DB_PATH, song_id)
+    row = _song_cache.get(key)
+    if row is not None:
+        return _row_to_song(row)
 
-        cursor.execute('''
-            SELECT id, title, artist, album, duration, file_path, genre, year, created_at
+    generation = _song_cache.generation
+    try:
+        cursor = get_connection(DB_PATH).execute(f'''
+            SELECT {SONG_COLUMNS}
             FROM songs WHERE id = ?
         ''', (song_id,))
 
         row = cursor.fetchone()
-
         if row:
-            return Song(
-                song_id=row[0],
-                title=row[1],
-                artist=row[2],
-                album=row[3] or "",
-                duration=row[4] or 0,
-                file_path=row[5] or "",
-                genre=row[6] or "",
-                year=row[7],
-                created_at=row[8]
-            )
+            _song_cache.put(key, row, generation)
+            return _row_to_song(row)
 
     except sqlite3.Error as e:
-        print(f"Error retrieving song: {e}")
-    finally:
-        if conn:
-            conn.close()
+        log.error("Error retrieving song: %s", e)
 
     return None
 
+# Orders for get_songs_page. A cursor is the tuple of a song's sort key
+# values, so it stays valid when rows around it are inserted or deleted.
+ORDER_BY_ID = "id"
+ORDER_BY_TITLE = "title"
+ORDER_BY_RANK = "rank"  # search relevance (BM25), only with a query
+
+DEFAULT_PAGE_SIZE = 50
+
+_PAGE_KEYS = {
+    ORDER_BY_ID: ("songs.id",),
+    ORDER_BY_TITLE: ("songs.title", "songs.artist", "songs.id"),
+    # score is the weighted bm25() alias from _page_query. Not "rank": in a
+    # WHERE clause that name resolves to FTS5's own (unweighted) rank column
+    ORDER_BY_RANK: ("score", "songs.title", "songs.artist", "songs.id"),
+}
+# Where each key sits in a page row: SONG_COLUMNS, then score
+_PAGE_KEY_COLUMNS = {
+    ORDER_BY_ID: (0,),
+    ORDER_BY_TITLE: (1, 2, 0),
+    ORDER_BY_RANK: (9, 1, 2, 0),
+}
+
+class SongPage(NamedTuple):
+    """One page of songs plus the cursor of every song on it"""
+    songs: List[Song]
+    cursors: List[tuple]
+
+    @property
+    def first(self) -> Optional[tuple]:
+        """Pass as before= to fetch the previous page"""
+        return self.cursors[0] if self.cursors else None
+
+    @property
+    def last(self) -> Optional[tuple]:
+        """Pass as after= to fetch the next page"""
+        return self.cursors[-1] if self.cursors else None
+
+def _page_query(conn, order_by: str, query: Optional[str]) -> Tuple[str, str, List[str], list, str]:
+    """(select list, source, where clauses, params, effective order) for an ordering and search filter"""
+    if order_by not in _PAGE_KEYS:
+        raise ValueError(f"unknown page order {order_by!r}")
+    select, source, where, select_params, where_params = QUALIFIED_SONG_COLUMNS, "songs", [], [], []
+    if query is not None:
+        match_query = search_index.build_match_query(query)
+        if match_query is not None and search_index.has_search_index(conn):
+            source = "songs_fts JOIN songs ON songs.id = songs_fts.rowid"
+            where.append("songs_fts MATCH ?")
+            where_params.append(match_query)
+            if order_by == ORDER_BY_RANK:
+                select += ", bm25(songs_fts, ?, ?, ?) AS score"
+                select_params.extend(search_index.BM25_WEIGHTS)
+        else:
+            # Same LIKE fallback as iter_search; it has no relevance, so rank becomes title order
+            pattern = f'%{query}%'
+            where.append("(songs.title LIKE ? OR songs.artist LIKE ? OR songs.album LIKE ?)")
+            where_params.extend((pattern, pattern, pattern))
+            if order_by == ORDER_BY_RANK:
+                order_by = ORDER_BY_TITLE
+    elif order_by == ORDER_BY_RANK:
+        raise ValueError("rank order needs a search query")
+    return select, source, where, select_params + where_params, order_by
+
+def get_songs_page(after: Optional[tuple] = None, limit: int = DEFAULT_PAGE_SIZE,
+                   order_by: str = ORDER_BY_TITLE, before: Optional[tuple] = None,
+                   query: Optional[str] = None) -> SongPage:
+    """Return up to limit songs following the cursor after (from the start when None).
+
+    Keyset (seek) pagination: the page starts with an index seek to the
+    cursor, so page 10,000 costs the same as page 1, unlike LIMIT/OFFSET.
+    order_by is ORDER_BY_TITLE (title, artist, id) or ORDER_BY_ID. With
+    before instead of after, the page holds the songs just before that
+    cursor (still in ascending order), for scrolling back.
+
+    With a query the page is limited to full-text matches (see
+    iter_search) and may use ORDER_BY_RANK, best matches first. Rank
+    pages still seek by cursor, but every page re-scores all matches, so
+    query pages are kept in the search result cache.
+    """
+    try:
+        conn = get_connection(DB_PATH)
+        cache_key = None
+        if query is not None:
+            cache_key = _search_cache_key(conn, query, "page", order_by, limit,
+                                          None if after is None else tuple(after),
+                                          None if before is None else tuple(before))
+            cached = _search_cache.get(cache_key)
+            if cached is not None:
+                rows, cursors = cached
+                return SongPage([_row_to_song(row) for row in rows], list(cursors))
+
+        select, source, where, params, order_by = _page_query(conn, order_by, query)
+        keys = _PAGE_KEYS[order_by]
+        cursor = before if before is not None else after
+        if cursor is not None:
+            if len(cursor) != len(keys):
+                raise ValueError(f"cursor {cursor!r} does not match the {order_by!r} order")
+            where.append(f"({', '.join(keys)}) {'<' if before is not None else '>'} "
+                         f"({', '.join('?' * len(keys))})")
+            params.extend(cursor)
+        direction = " DESC" if before is not None else ""
+
+        rows = conn.execute(f'''
+            SELECT {select}
+            FROM {source}
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {", ".join(key + direction for key in keys)}
+            LIMIT ?
+        ''', params + [limit]).fetchall()
+        if before is not None:
+            rows.reverse()
+
+        key_columns = _PAGE_KEY_COLUMNS[order_by]
+        cursors = [tuple(row[i] for i in key_columns) for row in rows]
+        if cache_key is not None:
+            _search_cache.put(cache_key, (tuple(rows), tuple(cursors)))
+        return SongPage([_row_to_song(row) for row in rows], cursors)
+
+    except sqlite3.Error as e:
+        log.error("Error retrieving songs page: %s", e)
+        return SongPage([], [])
+
+def get_page_cursor_at(offset: int, order_by: str = ORDER_BY_TITLE,
+                       query: Optional[str] = None) -> Optional[tuple]:
+    """Cursor of the song at position offset (for scrollbar jumps; O(offset), unlike page fetches)"""
+    try:
+        conn = get_connection(DB_PATH)
+        select, source, where, params, order_by = _page_query(conn, order_by, query)
+        keys = _PAGE_KEYS[order_by]
+        if order_by != ORDER_BY_RANK:
+            select = ", ".join(keys)  # only the key columns, read from the rowid or a covering index
+        row = conn.execute(f'''
+            SELECT {select}
+            FROM {source}
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY {", ".join(keys)}
+            LIMIT 1 OFFSET ?
+        ''', params + [max(offset, 0)]).fetchone()
+        if row is None:
+            return None
+        if order_by == ORDER_BY_RANK:
+            return tuple(row[i] for i in _PAGE_KEY_COLUMNS[ORDER_BY_RANK])
+        return tuple(row)
+
+    except sqlite3.Error as e:
+        log.error("Error locating song offset: %s", e)
+        return None
+
+def count_search_results(query: str) -> int:
+    """Number of songs iter_search(query) would return"""
+    try:
+        conn = get_connection(DB_PATH)
+        cache_key = _search_cache_key(conn, query, "count")
+        count = _search_cache.get(cache_key)
+        if count is None:
+            _, source, where, params, _ = _page_query(conn, ORDER_BY_TITLE, query)
+            count = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {' AND '.join(where)}",
+                                 params).fetchone()[0]
+            _search_cache.put(cache_key, count)
+        return count
+    except sqlite3.Error as e:
+        log.error("Error counting search results: %s", e)
+        return 0
+
+def get_songs_after_id(after_id: Optional[int], limit: int) -> List[Song]:
+    """Return up to limit songs with id > after_id (from the start when None), by id"""
+    return get_songs_page(None if after_id is None else (after_id,), limit, ORDER_BY_ID).songs
+
+def get_songs_before_id(before_id: int, limit: int) -> List[Song]:
+    """Return up to limit songs with id < before_id, in ascending id order"""
+    return get_songs_page(limit=limit, order_by=ORDER_BY_ID, before=(before_id,)).songs
+
+def get_song_id_at(offset: int) -> Optional[int]:
+    """Return the id of the song at position offset in id order (for scrollbar jumps)"""
+    cursor = get_page_cursor_at(offset, ORDER_BY_ID)
+    return cursor[0] if cursor else None
+
+def count_songs() -> int:
+    """Number of songs in the library"""
+    try:
+        return get_connection(DB_PATH).execute("SELECT COUNT(*) FROM songs").fetchone()[0]
+    except sqlite3.Error as e:
+        log.error("Error counting songs: %s", e)
+        return 0
+
 def insert_song_to_db(song: Song) -> bool:
     """Insert a new song into the DB"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO songs (title, artist, album, duration, file_path, genre, year)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (song.title, song.artist, song.album, song.duration,
-              song.file_path, song.genre, song.year))
-
-        song.id = cursor.lastrowid  # Set the ID from the inserted row
-        conn.commit()
-
-        print(f"Successfully inserted song: {song}")
+        with transaction(DB_PATH) as conn:
+            cursor = conn.execute(INSERT_SONG_SQL, _song_values(song))
+
+            song.id = cursor.lastrowid  # Set the ID from the inserted row
+        _songs_written((song.id,))
+
+        log.debug("Successfully inserted song: %s", song)
         return True
 
     except sqlite3.Error as e:
-        print(f"Error inserting song: {e}")
+        log.error("Error inserting song: %s", e)
         return False
-    finally:
-        if conn:
-            conn.close()
+
+def insert_songs_bulk(songs: Iterable[Song],
+                      chunk_size: int = DEFAULT_BULK_CHUNK_SIZE) -> Tuple[int, List[Tuple[Song, str]]]:
+    """Insert many songs in one transaction using executemany.
+
+    Songs are written chunk_size rows at a time, each chunk inside a
+    savepoint. If a chunk fails, it is rolled back and retried row by row
+    so only the offending songs are rejected. Inserted songs get their new
+    IDs assigned; if the transaction itself fails, nothing is written and
+    every song keeps the ID it came with. Returns (inserted_count, [(failed_song, error), ...]).
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    songs = list(songs)
+    original_ids = [song.id for song in songs]
+    inserted = 0
+    failed = []
+
+    try:
+        with transaction(DB_PATH) as conn:
+            # Explicit BEGIN so releasing the chunk savepoints never commits early
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+
+            # Index the whole batch with one statement at the end (see search_index)
+            indexed = search_index.has_search_index(conn)
+            if indexed:
+                last_existing_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM songs").fetchone()[0]
+                search_index.suspend_insert_trigger(conn)
+
+            for start in range(0, len(songs), chunk_size):
+                chunk = songs[start:start + chunk_size]
+
+                conn.execute("SAVEPOINT bulk_chunk")
+                try:
+                    conn.executemany(INSERT_SONG_SQL, [_song_values(song) for song in chunk])
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO bulk_chunk")
+                    conn.execute("RELEASE bulk_chunk")
+                    log.warning("Bulk insert chunk of %d songs failed (%s) - retrying row by row",
+                                len(chunk), e)
+                    inserted += _insert_rows_individually(conn, chunk, failed)
+                    continue
+                conn.execute("RELEASE bulk_chunk")
+
+                # We hold the write lock, so the chunk received consecutive rowids
+                last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+                for offset, song in enumerate(chunk):
+                    song.id = last_id - len(chunk) + 1 + offset
+                inserted += len(chunk)
+
+            if indexed:
+                search_index.index_rows_after(conn, last_existing_id)
+        _songs_written(song.id for song in songs if song.id is not None)
+
+    except sqlite3.Error as e:
+        log.error("Error during bulk insert: %s", e)
+        # The whole batch was rolled back: take back the ids handed out so far
+        for song, song_id in zip(songs, original_ids):
+            song.id = song_id
+        return 0, [(song, str(e)) for song in songs]
+
+    log.debug("Bulk inserted %d songs (%d failed)", inserted, len(failed))
+    return inserted, failed
+
+def _insert_rows_individually(conn, chunk: List[Song], failed: List[Tuple[Song, str]]) -> int:
+    """Insert a failed chunk one row at a time, collecting per-row errors"""
+    inserted = 0
+    for song in chunk:
+        conn.execute("SAVEPOINT bulk_row")
+        try:
+            song.id = conn.execute(INSERT_SONG_SQL, _song_values(song)).lastrowid
+            inserted += 1
+        except sqlite3.Error as e:
+            conn.execute("ROLLBACK TO bulk_row")
+            failed.append((song, str(e)))
+            log.warning("Error inserting song '%s': %s", song.title, e)
+        conn.execute("RELEASE bulk_row")
+    return inserted
 
 def update_song_in_db(song: Song) -> bool:
     """Update an existing song in the DB"""
     if not song.id:
-        print("Error: Song ID is required for update")
+        log.error("Error: Song ID is required for update")
         return False
 
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            UPDATE songs 
-            SET title = ?, artist = ?, album = ?, duration = ?, 
-                file_path = ?, genre = ?, year = ?
-            WHERE id = ?
-        ''', (song.title, song.artist, song.album, song.duration,
-              song.file_path, song.genre, song.year, song.id))
-
-        if cursor.rowcount > 0:
-            conn.commit()
-            print(f"Successfully updated song: {song}")
+        with transaction(DB_PATH) as conn:
+            cursor = conn.execute('''
+                UPDATE songs 
+                SET title = ?, artist = ?, album = ?, duration = ?, 
+                    file_path = ?, genre = ?, year = ?
+                WHERE id = ?
+            ''', (song.title, song.artist, song.album, song.duration,
+                  song.file_path, song.genre, song.year, song.id))
+            updated = cursor.rowcount > 0
+        _songs_written((song.id,))
+
+        if updated:
+            log.debug("Successfully updated song: %s", song)
             return True
         else:
-            print(f"No song found with ID: {song.id}")
+            log.warning("No song found with ID: %s", song.id)
             return False
 
     except sqlite3.Error as e:
-        print(f"Error updating song: {e}")
+        log.error("Error updating song: %s", e)
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def delete_song_from_db(song_id: int) -> bool:
     """Delete a song from the DB by ID"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Get song info before deleting for confirmation
-        cursor.execute('SELECT title, artist FROM songs WHERE id = ?', (song_id,))
-        song_info = cursor.fetchone()
-
-        if not song_info:
-            print(f"No song found with ID {song_id}.")
-            return False
-
-        # DELETE command
-        cursor.execute("DELETE FROM songs WHERE id = ?", (song_id,))
-        
-        # Verify deletion
-        if cursor.rowcount > 0:
-            conn.commit()
-            print(f"Song with ID {song_id} deleted from database.")
+        with transaction(DB_PATH) as conn:
+            # DELETE command; rowcount tells us whether the song existed
+            cursor = conn.execute("DELETE FROM songs WHERE id = ?", (song_id,))
+            deleted = cursor.rowcount > 0
+        _songs_written((song_id,))
+
+        if deleted:
+            log.debug("Song with ID %s deleted from database.", song_id)
             return True
         else:
-            print(f"Failed to delete song with ID {song_id}.")
+            log.warning("No song found with ID %s.", song_id)
             return False
             
     except sqlite3.Error as e:
-        print(f"Database error: {e}")
+        log.error("Database error: %s", e)
         return False
-    finally:
-        if conn:
-            conn.close()
 
-def search_songs(query: str) -> List[Song]:
-    """Search songs by title or artist"""
-    songs = []
+DELETED_SONG_COLUMNS = "song_id, title, artist, album, duration, file_path, genre, year, created_at"
+
+def spill_deleted_songs(area: str, songs: List[Song]) -> bool:
+    """Append songs (oldest first) to the deleted_songs log in one transaction"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT id, title, artist, album, duration, file_path, genre, year, created_at
-            FROM songs 
-            WHERE title LIKE ? OR artist LIKE ? OR album LIKE ?
-            ORDER BY title, artist
-        ''', (f'%{query}%', f'%{query}%', f'%{query}%'))
-
-        rows = cursor.fetchall()
-
-        for row in rows:
-            song = Song(
-                song_id=row[0],
-                title=row[1],
-                artist=row[2],
-                album=row[3] or "",
-                duration=row[4] or 0,
-                file_path=row[5] or "",
-                genre=row[6] or "",
-                year=row[7],
-                created_at=row[8]
-            )
-            songs.append(song)
+        with transaction(DB_PATH) as conn:
+            conn.executemany(f'''
+                INSERT INTO deleted_songs (area, {DELETED_SONG_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(area,) + _restore_values(song) for song in songs])
+        return True
 
     except sqlite3.Error as e:
-        print(f"Error searching songs: {e}")
-    finally:
-        if conn:
-            conn.close()
+        log.error("Error spilling deleted songs: %s", e)
+        return False
+
+def take_deleted_songs(area: str, limit: int) -> List[Song]:
+    """Remove the newest limit songs of an area from the log and return them oldest first"""
+    try:
+        with transaction(DB_PATH) as conn:
+            rows = conn.execute(f'''
+                SELECT seq, {DELETED_SONG_COLUMNS}
+                FROM deleted_songs WHERE area = ?
+                ORDER BY seq DESC LIMIT ?
+            ''', (area, limit)).fetchall()
+            if rows:
+                conn.execute("DELETE FROM deleted_songs WHERE area = ? AND seq >= ?", (area, rows[-1][0]))
+        return [_row_to_song(row[1:]) for row in reversed(rows)]
+
+    except sqlite3.Error as e:
+        log.error("Error reading back deleted songs: %s", e)
+        return []
+
+def get_deleted_songs_page(area: str, after_seq: int, limit: int) -> List[Tuple[int, Song]]:
+    """Return up to limit (seq, song) pairs of an area logged after after_seq, oldest first"""
+    try:
+        cursor = get_connection(DB_PATH).execute(f'''
+            SELECT seq, {DELETED_SONG_COLUMNS}
+            FROM deleted_songs WHERE area = ? AND seq > ?
+            ORDER BY seq LIMIT ?
+        ''', (area, after_seq, limit))
+        return [(row[0], _row_to_song(row[1:])) for row in cursor.fetchall()]
+
+    except sqlite3.Error as e:
+        log.error("Error paging deleted songs: %s", e)
+        return []
+
+def count_deleted_songs(area: str) -> int:
+    try:
+        cursor = get_connection(DB_PATH).execute(
+            "SELECT COUNT(*) FROM deleted_songs WHERE area = ?", (area,))
+        return cursor.fetchone()[0]
+
+    except sqlite3.Error as e:
+        log.error("Error counting deleted songs: %s", e)
+        return 0
+
+def flush_deleted_session(history: Iterable[Song] = ()) -> Optional[int]:
+    """Move every logged 'session' song to 'history', newest first (LIFO, as a flush pops them).
+
+    history (oldest first) is appended to 'history' in the same transaction,
+    ahead of the moved songs. Returns the number of songs moved, or None if
+    nothing could be written.
+    """
+    try:
+        with transaction(DB_PATH) as conn:
+            conn.executemany(f'''
+                INSERT INTO deleted_songs (area, {DELETED_SONG_COLUMNS})
+                VALUES ('history', ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [_restore_values(song) for song in history])
+            conn.execute(f'''
+                INSERT INTO deleted_songs (area, {DELETED_SONG_COLUMNS})
+                SELECT 'history', {DELETED_SONG_COLUMNS}
+                FROM deleted_songs WHERE area = 'session'
+                ORDER BY seq DESC
+            ''')
+            moved = conn.execute("DELETE FROM deleted_songs WHERE area = 'session'").rowcount
+        return moved
+
+    except sqlite3.Error as e:
+        log.error("Error flushing deleted songs: %s", e)
+        return None
 
-    return songs
+def clear_deleted_songs(area: str) -> bool:
+    try:
+        with transaction(DB_PATH) as conn:
+            conn.execute("DELETE FROM deleted_songs WHERE area = ?", (area,))
+        return True
+
+    except sqlite3.Error as e:
+        log.error("Error clearing deleted songs: %s", e)
+        return False
+
+def delete_songs_from_db(song_ids: Iterable[int]) -> List[Song]:
+    """Delete many songs by ID in one transaction and return the rows that were deleted.
+
+    The songs are read and deleted under the same write lock, so the
+    returned Songs (in the order of song_ids, missing IDs skipped) are
+    exactly what was removed and can be restored with restore_songs_to_db.
+    """
+    song_ids = list(dict.fromkeys(song_ids))
+    found = {}
+    try:
+        with transaction(DB_PATH) as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            # One DELETE statement per chunk rather than executemany: the FTS delete
+            # trigger then updates the index once per statement, not once per row
+            for start in range(0, len(song_ids), ID_CHUNK_SIZE):
+                chunk = song_ids[start:start + ID_CHUNK_SIZE]
+                placeholders = ", ".join("?" * len(chunk))
+                for row in conn.execute(f"SELECT {SONG_COLUMNS} FROM songs WHERE id IN ({placeholders})", chunk):
+                    found[row[0]] = _row_to_song(row)
+                conn.execute(f"DELETE FROM songs WHERE id IN ({placeholders})", chunk)
+        _songs_written(song_ids)
+
+    except sqlite3.Error as e:
+        log.error("Error during bulk delete: %s", e)
+        return []
+
+    log.debug("Bulk deleted %d of %d songs", len(found), len(song_ids))
+    return [found[song_id] for song_id in song_ids if song_id in found]
+
+def restore_songs_to_db(songs: Iterable[Song]) -> Tuple[int, List[Tuple[Song, str]]]:
+    """Re-insert deleted songs under their original IDs in one transaction.
+
+    Songs are staged with one executemany and copied into songs with a
+    single statement; if that fails (e.g. an ID is taken again), they are
+    retried row by row so only the conflicting songs are rejected. Returns (restored_count, [(failed_song, error), ...]).
+    """
+    songs = list(songs)
+    restored = 0
+    failed = []
+    try:
+        with transaction(DB_PATH) as conn:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+            conn.execute("SAVEPOINT restore_batch")
+            try:
+                # Stage the rows, then copy them with one statement in id order: the FTS
+                # insert trigger can only buffer index updates while rowids ascend
+                conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS restore_staging AS SELECT {SONG_COLUMNS} FROM songs WHERE 0")
+                conn.execute("DELETE FROM restore_staging")
+                conn.executemany(f"INSERT INTO restore_staging ({SONG_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                 [_restore_values(song) for song in songs])
+                conn.execute(f"INSERT INTO songs ({SONG_COLUMNS}) SELECT {SONG_COLUMNS} FROM restore_staging ORDER BY id")
+                conn.execute("DELETE FROM restore_staging")
+                restored = len(songs)
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO restore_batch")
+                log.warning("Bulk restore of %d songs failed (%s) - retrying row by row", len(songs), e)
+                for song in songs:
+                    conn.execute("SAVEPOINT restore_row")
+                    try:
+                        conn.execute(RESTORE_SONG_SQL, _restore_values(song))
+                        restored += 1
+                    except sqlite3.Error as row_error:
+                        conn.execute("ROLLBACK TO restore_row")
+                        failed.append((song, str(row_error)))
+                    conn.execute("RELEASE restore_row")
+            conn.execute("RELEASE restore_batch")
+        _songs_written(song.id for song in songs)
+
+    except sqlite3.Error as e:
+        log.error("Error during bulk restore: %s", e)
+        return 0, [(song, str(e)) for song in songs]
+
+    log.debug("Restored %d songs (%d failed)", restored, len(failed))
+    return restored, failed
+
+def _restore_values(song: Song) -> tuple:
+    return (song.id,) + _song_values(song) + (_timestamp(song.created_at),)
+
+def _timestamp(value) -> str:
+    """created_at in the format CURRENT_TIMESTAMP stores; strings read back pass through"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+def iter_search(query: str, batch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Song]:
+    """Stream songs matching query by title, artist or album, best matches first.
+
+    Uses the FTS5 index: every word in the query matches as a prefix
+    ("queen boh" finds "Bohemian Rhapsody" by Queen) and results are
+    ranked with BM25. Falls back to a LIKE substring scan when the index
+    is missing or the query has no searchable words. Rows are read
+    batch_size at a time, as in iter_songs(). Streams bypass the search
+    result cache; search_songs() uses it.
+    """
+    try:
+        yield from _iter_cursor(_search_cursor(get_connection(DB_PATH), query), batch_size)
+
+    except sqlite3.Error as e:
+        log.error("Error searching songs: %s", e)
+
+def search_songs(query: str) -> List[Song]:
+    """Search songs by title, artist or album, best matches first (see iter_search).
+
+    Results are cached per normalized query until the next write, and
+    every call returns new Song objects.
+    """
+    try:
+        conn = get_connection(DB_PATH)
+        cache_key = _search_cache_key(conn, query, "songs")
+        rows = _search_cache.get(cache_key)
+        if rows is None:
+            rows = tuple(_search_cursor(conn, query).fetchall())
+            _search_cache.put(cache_key, rows)
+        return [_row_to_song(row) for row in rows]
+
+    except sqlite3.Error as e:
+        log.error("Error searching songs: %s", e)
+        return []
+
+def _search_cursor(conn, query: str) -> sqlite3.Cursor:
+    match_query = search_index.build_match_query(query)
+    if match_query is None or not search_index.has_search_index(conn):
+        return _search_songs_like(conn, query)
+    return conn.execute(f'''
+        SELECT {QUALIFIED_SONG_COLUMNS}
+        FROM songs_fts
+        JOIN songs ON songs.id = songs_fts.rowid
+        WHERE songs_fts MATCH ?
+        ORDER BY bm25(songs_fts, ?, ?, ?), songs.title, songs.artist, songs.id
+    ''', (match_query, *search_index.BM25_WEIGHTS))
+
+def _search_songs_like(conn, query: str) -> sqlite3.Cursor:
+    """Full-scan substring search, used when full-text search is unavailable"""
+    pattern = f'%{query}%'
+    return conn.execute(f'''
+        SELECT {SONG_COLUMNS}
+        FROM songs 
+        WHERE title LIKE ? OR artist LIKE ? OR album LIKE ?
+        ORDER BY title, artist, id
+    ''', (pattern, pattern, pattern))
+
+def rebuild_search_index() -> bool:
+    """Rebuild the full-text search index from the songs table"""
+    try:
+        with transaction(DB_PATH) as conn:
+            if search_index.has_search_index(conn):
+                search_index.rebuild_search_index(conn)
+                rebuilt = True
+            else:
+                rebuilt = search_index.create_search_index(conn)
+        _songs_written()  # cached searches ran against the old index
+        if rebuilt:
+            log.info("Search index rebuilt")
+        return rebuilt
+    except sqlite3.Error as e:
+        log.error("Error rebuilding search index: %s", e)
+        return False
 
 # Test functionality
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+"""Versioned schema migrations.
+
+The schema version is kept in SQLite's ``PRAGMA user_version`` header
+field. ``migrate`` applies every migration newer than the recorded version,
+in order, inside one write transaction and records the new version as it
+goes, so a failure leaves the database on the version it started with.
+
+Databases created before versioning existed report version 0 but already
+have the songs, deleted_songs and FTS tables. The first migrations use
+``IF NOT EXISTS`` so they are no-ops there and only the later ones change
+anything.
+
+To change the schema, append a migration with the next version number.
+Never edit one that has shipped.
+"""
+import sqlite3
+from typing import Callable, Tuple
+
+from src.db import search_index
+from src.utils.logger import get_logger
+
+log = get_logger("db")
+
+
+def _create_songs(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS songs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            artist TEXT NOT NULL,
+            album TEXT,
+            duration INTEGER DEFAULT 0,
+            file_path TEXT,
+            genre TEXT,
+            year INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _create_deleted_songs(conn: sqlite3.Connection):
+    # Append-only log of deleted songs spilled out of memory by a bounded DeleteStack.
+    # area is 'session' (still restorable) or 'history' (flushed); seq keeps push order.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS deleted_songs (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            area TEXT NOT NULL,
+            song_id INTEGER,
+            title TEXT NOT NULL,
+            artist TEXT NOT NULL,
+            album TEXT,
+            duration INTEGER DEFAULT 0,
+            file_path TEXT,
+            genre TEXT,
+            year INTEGER,
+            created_at TIMESTAMP
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_deleted_songs_area ON deleted_songs(area, seq)")
+
+
+def _create_search_index(conn: sqlite3.Connection):
+    if not search_index.create_search_index(conn):
+        log.warning("SQLite was built without FTS5 - search will use LIKE scans")
+
+
+def _create_title_order_index(conn: sqlite3.Connection):
+    # Covers every column (id is the rowid), so "ORDER BY title, artist" and
+    # keyset pages in that order are read straight from the index: no sort
+    # and no lookup back into the table
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_songs_title_order
+        ON songs(title, artist, album, duration, file_path, genre, year, created_at)
+    ''')
+
+
+def _create_title_keyset_index(conn: sqlite3.Connection):
+    # Replaces idx_songs_title_order with id right after (title, artist), so
+    # keyset pages in (title, artist, id) order are served by the index too;
+    # in the old index, ties on (title, artist) were ordered by album first
+    conn.execute("DROP INDEX IF EXISTS idx_songs_title_order")
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_songs_title_keyset
+        ON songs(title, artist, id, album, duration, file_path, genre, year, created_at)
+    ''')
+
+
+# (version, description, apply) in the order they must run
+MIGRATIONS: Tuple[Tuple[int, str, Callable[[sqlite3.Connection], None]], ...] = (
+    (1, "songs table", _create_songs),
+    (2, "deleted songs log", _create_deleted_songs),
+    (3, "full-text search index", _create_search_index),
+    (4, "covering index for title order", _create_title_order_index),
+    (5, "covering index for (title, artist, id) keyset order", _create_title_keyset_index),
+)
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version.
+
+    Call inside connection.transaction() so the upgrade commits (or rolls
+    back) as a whole.
+    """
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    version = schema_version(conn)
+
+    if version > LATEST_VERSION:
+        log.warning("Database schema version %d is newer than this application (%d) - not migrating",
+                    version, LATEST_VERSION)
+        return version
+
+    for target, description, apply in MIGRATIONS:
+        if target <= version:
+            continue
+        log.info("Migrating database schema to version %d: %s", target, description)
+        apply(conn)
+        conn.execute(f"PRAGMA user_version = {target}")
+        version = target
+    return version
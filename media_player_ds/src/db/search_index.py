@@ -0,0 +1,112 @@
+"""FTS5 full-text index over song titles, artists and albums.
+
+``songs_fts`` is an external-content FTS5 table: it stores only the
+inverted index and reads column values from ``songs``. AFTER INSERT,
+UPDATE and DELETE triggers on ``songs`` keep it in sync row by row, and
+``rebuild_search_index`` regenerates it from scratch. Prefix indexes on
+2 and 3 characters make ``term*`` queries cheap; results rank by BM25.
+
+Bulk loads skip the per-row work: ``suspend_insert_trigger`` drops the
+insert trigger and ``index_rows_after`` indexes the new rows with one
+statement and recreates it, both in the loader's transaction.
+"""
+import re
+import sqlite3
+from typing import Optional
+
+FTS_TABLE = "songs_fts"
+
+# BM25 column weights: a title hit counts more than an artist or album hit
+BM25_WEIGHTS = (10.0, 5.0, 2.0)
+
+_INSERT_TRIGGER = f'''
+    CREATE TRIGGER IF NOT EXISTS songs_fts_after_insert AFTER INSERT ON songs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, artist, album)
+        VALUES (new.id, new.title, new.artist, new.album);
+    END
+'''
+
+_SCHEMA = (
+    f'''
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, artist, album,
+        content='songs', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    ''',
+    _INSERT_TRIGGER,
+    f'''
+    CREATE TRIGGER IF NOT EXISTS songs_fts_after_delete AFTER DELETE ON songs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, artist, album)
+        VALUES ('delete', old.id, old.title, old.artist, old.album);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS songs_fts_after_update AFTER UPDATE OF title, artist, album ON songs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, artist, album)
+        VALUES ('delete', old.id, old.title, old.artist, old.album);
+        INSERT INTO {FTS_TABLE}(rowid, title, artist, album)
+        VALUES (new.id, new.title, new.artist, new.album);
+    END
+    ''',
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                       (FTS_TABLE,)).fetchone()
+    return row is not None
+
+
+def create_search_index(conn: sqlite3.Connection) -> bool:
+    """Create the FTS table and sync triggers, indexing existing rows.
+
+    Returns False when this SQLite build has no FTS5 support, in which case
+    search falls back to LIKE scans.
+    """
+    existed = has_search_index(conn)
+    try:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+    except sqlite3.OperationalError as e:
+        if "fts5" in str(e).lower():
+            return False
+        raise
+    if not existed:
+        rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn: sqlite3.Connection):
+    """Regenerate the whole index from the songs table"""
+    conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def suspend_insert_trigger(conn: sqlite3.Connection):
+    """Stop indexing inserted rows one by one (call inside a transaction)"""
+    conn.execute("DROP TRIGGER IF EXISTS songs_fts_after_insert")
+
+
+def index_rows_after(conn: sqlite3.Connection, last_indexed_id: int):
+    """Index every song with id > last_indexed_id in one statement and restore the trigger"""
+    conn.execute(f'''
+        INSERT INTO {FTS_TABLE}(rowid, title, artist, album)
+        SELECT id, title, artist, album FROM songs WHERE id > ?
+    ''', (last_indexed_id,))
+    conn.execute(_INSERT_TRIGGER)
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query where every word is a prefix term.
+
+    "hotel cal" becomes '"hotel"* "cal"*', which matches songs containing a
+    word starting with "hotel" and a word starting with "cal" in any
+    indexed column. Returns None when the text has no searchable words.
+    """
+    tokens = _TOKEN_PATTERN.findall(query.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
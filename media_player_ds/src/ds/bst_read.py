@@ -1,184 +1,588 @@
 from src.model.song import Song
-from typing import Optional, List
-import sqlite3
+from src.utils.logger import get_logger
+from typing import Iterable, Iterator, Optional, List
+import logging
+
+log = get_logger("bst")
+
+# Trees above this size are summarised instead of printed node by node
+MAX_PRINTED_TREE_SIZE = 31
 
 class BSTNode:
+    __slots__ = ("song", "left", "right", "height", "size")
+
     def __init__(self, song: Song):
         self.song = song
         self.left = None
         self.right = None
-        print(f"BST: Created new node for '{song.title}' by {song.artist}")
+        self.height = 1  # AVL height of the subtree rooted here (leaf = 1)
+        self.size = 1    # number of nodes in the subtree rooted here
+
+def _height(node) -> int:
+    return node.height if node else 0
+
+def _size(node) -> int:
+    return node.size if node else 0
+
+def _update_height(node):
+    """Recompute node's height and subtree size from its children"""
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+def _balance_factor(node) -> int:
+    return _height(node.left) - _height(node.right)
+
+def _rotate_right(node):
+    """Rotate node's left child up into its place and return the new subtree root"""
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rotate_left(node):
+    """Rotate node's right child up into its place and return the new subtree root"""
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+def _rebalance(node):
+    """Restore the AVL invariant at node and return the (possibly new) subtree root"""
+    _update_height(node)
+    balance = _balance_factor(node)
+
+    if balance > 1:
+        if _balance_factor(node.left) < 0:
+            log.debug("BST: Left-Right case at '%s' -> rotating LEFT then RIGHT", node.song.title)
+            node.left = _rotate_left(node.left)
+        else:
+            log.debug("BST: Left-Left case at '%s' -> rotating RIGHT", node.song.title)
+        return _rotate_right(node)
+
+    if balance < -1:
+        if _balance_factor(node.right) > 0:
+            log.debug("BST: Right-Left case at '%s' -> rotating RIGHT then LEFT", node.song.title)
+            node.right = _rotate_right(node.right)
+        else:
+            log.debug("BST: Right-Right case at '%s' -> rotating LEFT", node.song.title)
+        return _rotate_left(node)
+
+    return node
 
 class SongBST:
+    """Title index backed by an AVL tree.
+
+    Heights are kept balanced on every insert, so search and insert are
+    O(log n) even when songs arrive already sorted by title (as they do from
+    database.get_all_songs). All operations are iterative, so large catalogs
+    never run into Python's recursion limit.
+
+    Every node also records the size of its subtree, which gives order
+    statistics: kth(i) and rank(title) are O(log n), and range(lo, hi) /
+    prefix(p) are lazy generators that seek in O(log n) and then cost O(1)
+    amortized per song yielded.
+    """
+
     def __init__(self):
         self.root = None
         self.node_count = 0
-        print("BST: Initialized empty Binary Search Tree")
-    
+        self.rotation_count = 0
+        log.debug("BST: Initialized empty AVL-balanced Binary Search Tree")
+
+    @classmethod
+    def from_sorted(cls, songs: Iterable[Song], count: Optional[int] = None) -> "SongBST":
+        """Build a perfectly balanced tree from songs already sorted by title"""
+        bst = cls()
+        bst.load_sorted(songs, count)
+        return bst
+
+    def load_sorted(self, songs: Iterable[Song], count: Optional[int] = None):
+        """Replace the tree contents with songs already sorted by title in O(n).
+
+        The middle song of every range becomes the subtree root, so no title
+        comparisons or rotations are needed. Duplicate titles keep the first
+        song, matching insert(). Callers must pass songs in title order, e.g.
+        database.iter_songs().
+
+        With count (the number of songs the iterable will yield, e.g. from
+        database.count_songs()) the tree is built while the songs stream in,
+        without first collecting them into a list. If the stream turns out
+        shorter (duplicate titles, or rows deleted meanwhile) the tree is
+        rebuilt from its own nodes; extra songs are inserted one by one.
+        """
+        skipped = 0
+        if count is None:
+            # Drop duplicates up front so the count is exact and no rebuild is needed
+            unique_songs = []
+            for song in songs:
+                if unique_songs and unique_songs[-1].title == song.title:
+                    skipped += 1
+                    continue
+                unique_songs.append(song)
+            songs = unique_songs
+            count = len(songs)
+        log.debug("\nBST BULK LOAD: Building balanced tree from %d pre-sorted songs", count)
+
+        stream = iter(songs)
+        last_title = None
+        built = 0
+
+        def _next_song():
+            # Next song with a new title, or None once the stream is exhausted
+            nonlocal last_title, skipped
+            for song in stream:
+                if song.title == last_title:
+                    skipped += 1
+                    continue
+                last_title = song.title
+                return song
+            return None
+
+        def _build(n):
+            # In-order build of n nodes: left subtree, root, right subtree.
+            # Recursion depth is only O(log n).
+            nonlocal built
+            if n <= 0:
+                return None
+            left = _build(n // 2)
+            song = _next_song()
+            if song is None:
+                return left
+            node = BSTNode(song)
+            built += 1
+            node.left = left
+            node.right = _build(n - n // 2 - 1)
+            _update_height(node)
+            return node
+
+        self.root = _build(count)
+        self.node_count = built
+
+        if built < count:
+            # Holes on the right would break the AVL bounds: rebalance from the tree itself
+            log.debug("BST BULK LOAD: Stream ended after %d of %d songs - rebuilding", built, count)
+            self.load_sorted(list(self.range()))
+        for song in iter(_next_song, None):
+            self.insert(song)
+
+        if skipped:
+            log.debug("BST BULK LOAD: Skipped %d songs with duplicate titles", skipped)
+        log.debug("BST BULK LOAD: Complete. Tree has %d nodes (height %d)", self.node_count, self.height())
+        self._print_tree_structure()
+
+    def height(self) -> int:
+        """Return the height of the tree (0 when empty)"""
+        return _height(self.root)
+
     def insert(self, song: Song):
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nBST INSERT: Starting insertion of '%s'", song.title)
 
-        print(f"\nBST INSERT: Starting insertion of '{song.title}'")
-        
-        def _insert(root, song, depth=0):
-            indent = "  " * depth
-            
-            if root is None:
-                print(f"{indent}BST: Creating new node at depth {depth}")
-                self.node_count += 1
-                return BSTNode(song)
-            
-            if root.song.title == song.title:
-                print(f"{indent}BST: Song '{song.title}' already exists, skipping")
-                return root
-            elif song.title < root.song.title:
-                print(f"{indent}BST: '{song.title}' < '{root.song.title}' -> Going LEFT")
-                root.left = _insert(root.left, song, depth + 1)
+        # Walk down to the insertion point, remembering the path for rebalancing
+        path = []
+        node = self.root
+        while node is not None:
+            if node.song.title == song.title:
+                if trace:
+                    log.debug("%sBST: Song '%s' already exists, skipping", "  " * len(path), song.title)
+                return
+            path.append(node)
+            if song.title < node.song.title:
+                if trace:
+                    log.debug("%sBST: '%s' < '%s' -> Going LEFT",
+                              "  " * (len(path) - 1), song.title, node.song.title)
+                node = node.left
             else:
-                print(f"{indent}BST: '{song.title}' > '{root.song.title}' -> Going RIGHT")
-                root.right = _insert(root.right, song, depth + 1)
-            
-            return root
-        
-        self.root = _insert(self.root, song)
-        print(f"BST: Insertion complete. Tree now has {self.node_count} nodes")
-        self._print_tree_structure()
+                if trace:
+                    log.debug("%sBST: '%s' > '%s' -> Going RIGHT",
+                              "  " * (len(path) - 1), song.title, node.song.title)
+                node = node.right
+
+        if trace:
+            log.debug("%sBST: Creating new node at depth %d for '%s' by %s",
+                      "  " * len(path), len(path), song.title, song.artist)
+        new_node = BSTNode(song)
+        self.node_count += 1
+
+        if not path:
+            self.root = new_node
+        elif song.title < path[-1].song.title:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        # Every ancestor gains one node, even above the point where rebalancing stops
+        for node in path:
+            node.size += 1
+
+        # Retrace towards the root; one rotation is enough to fix an insertion
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            subtree_root = _rebalance(node)
+
+            if subtree_root is not node:
+                self.rotation_count += 1
+                self._replace_child(path[i - 1] if i > 0 else None, node, subtree_root)
+                break
+            if node.height == old_height:
+                break
+
+        if trace:
+            log.debug("BST: Insertion complete. Tree now has %d nodes (height %d)",
+                      self.node_count, self.height())
+            self._print_tree_structure()
+
+    def delete(self, title: str, song: Optional[Song] = None) -> Optional[Song]:
+        """Remove the node for title in O(log n) and return its song.
+
+        When song is given, the node is only removed if it holds that exact
+        object (titles are unique in the tree, so another song with the same
+        title may be the one indexed). The walk follows title, so it still
+        finds song after its title attribute was changed in place. Returns
+        None if nothing was removed.
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nBST DELETE: Removing '%s'", title)
+
+        path = []
+        node = self.root
+        while node is not None and node.song is not song and node.song.title != title:
+            path.append(node)
+            node = node.left if title < node.song.title else node.right
+
+        if node is None or (song is not None and node.song is not song):
+            if trace:
+                log.debug("BST DELETE: '%s' not found - nothing to remove", title)
+            return None
+
+        removed = node.song
+        if node.left is not None and node.right is not None:
+            # Two children: take the in-order successor's song, then unlink the successor
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            if trace:
+                log.debug("BST DELETE: Two children - replacing with successor '%s'", successor.song.title)
+            node.song = successor.song
+            node = successor
+
+        # node now has at most one child
+        child = node.left if node.left is not None else node.right
+        self._replace_child(path[-1] if path else None, node, child)
+        self.node_count -= 1
+
+        # Retrace to the root; a deletion can need a rotation at every level
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            subtree_root = _rebalance(node)
+            if subtree_root is not node:
+                self.rotation_count += 1
+                self._replace_child(path[i - 1] if i > 0 else None, node, subtree_root)
+
+        if trace:
+            log.debug("BST: Deletion complete. Tree now has %d nodes (height %d)",
+                      self.node_count, self.height())
+            self._print_tree_structure()
+        return removed
+
+    def update_key(self, old_title: str, new_title: str, song: Optional[Song] = None) -> Optional[Song]:
+        """Re-key the song indexed under old_title to new_title in O(log n).
+
+        song.title may already hold new_title (SongTable.update_song edits
+        the shared object before the change reaches the tree); otherwise it
+        is set here. If the new title still sorts between the node's in-order
+        neighbours the node keeps its place and nothing is restructured;
+        otherwise it is deleted and reinserted. Returns the song, or None if
+        old_title (holding song, when given) is not indexed or another song
+        already holds new_title, in which case the moved song is dropped
+        from the index just as insert() skips duplicates.
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nBST UPDATE KEY: '%s' -> '%s'", old_title, new_title)
+
+        # Track the closest ancestors on each side: they bound the node's position
+        lower = upper = None
+        node = self.root
+        while node is not None and node.song is not song and node.song.title != old_title:
+            if old_title < node.song.title:
+                upper = node
+                node = node.left
+            else:
+                lower = node
+                node = node.right
+
+        if node is None or (song is not None and node.song is not song):
+            if trace:
+                log.debug("BST UPDATE KEY: '%s' not found - nothing to move", old_title)
+            return None
+        moved = node.song
+
+        if node.left is not None:
+            lower = node.left
+            while lower.right is not None:
+                lower = lower.right
+        if node.right is not None:
+            upper = node.right
+            while upper.left is not None:
+                upper = upper.left
+
+        if ((lower is None or lower.song.title < new_title)
+                and (upper is None or new_title < upper.song.title)):
+            if trace:
+                log.debug("BST UPDATE KEY: '%s' stays between its neighbours - re-keyed in place", new_title)
+            moved.title = new_title
+            return moved
+
+        self.delete(old_title, moved)
+        moved.title = new_title
+        self.insert(moved)
+        if self.search_by_title(new_title) is not moved:
+            log.warning("BST: Title '%s' is already indexed by another song; '%s' left the title index",
+                        new_title, old_title)
+            return None
+        return moved
+
+    def _replace_child(self, parent, old_child, new_child):
+        """Point parent (or the root when parent is None) at new_child instead of old_child"""
+        if parent is None:
+            self.root = new_child
+        elif parent.left is old_child:
+            parent.left = new_child
+        else:
+            parent.right = new_child
     
     def search_by_title(self, title: str) -> Optional[Song]:
-        
-        print(f"\nBST SEARCH: Looking for '{title}'")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nBST SEARCH: Looking for '%s'", title)
         comparisons = 0
-        
-        def _search(root, title, depth=0):
-            nonlocal comparisons
-            indent = "  " * depth
+        result = None
+        node = self.root
+        depth = 0
+
+        while True:
             comparisons += 1
-            
-            if root is None:
-                print(f"{indent}BST: Reached leaf node - NOT FOUND")
-                return None
-            
-            print(f"{indent}BST: Comparing '{title}' with '{root.song.title}'")
-            
-            if root.song.title == title:
-                print(f"{indent}BST: FOUND! '{title}' at depth {depth}")
-                return root.song
-            elif title < root.song.title:
-                print(f"{indent}BST: '{title}' < '{root.song.title}' -> Searching LEFT")
-                return _search(root.left, title, depth + 1)
+
+            if node is None:
+                if trace:
+                    log.debug("%sBST: Reached leaf node - NOT FOUND", "  " * depth)
+                break
+
+            if trace:
+                log.debug("%sBST: Comparing '%s' with '%s'", "  " * depth, title, node.song.title)
+
+            if node.song.title == title:
+                if trace:
+                    log.debug("%sBST: FOUND! '%s' at depth %d", "  " * depth, title, depth)
+                result = node.song
+                break
+            elif title < node.song.title:
+                if trace:
+                    log.debug("%sBST: '%s' < '%s' -> Searching LEFT", "  " * depth, title, node.song.title)
+                node = node.left
             else:
-                print(f"{indent}BST: '{title}' > '{root.song.title}' -> Searching RIGHT")
-                return _search(root.right, title, depth + 1)
-        
-        result = _search(self.root, title)
-        print(f"BST: Search completed in {comparisons} comparisons")
-        print(f"BST: Result: {'FOUND' if result else 'NOT FOUND'}")
+                if trace:
+                    log.debug("%sBST: '%s' > '%s' -> Searching RIGHT", "  " * depth, title, node.song.title)
+                node = node.right
+            depth += 1
+
+        if trace:
+            log.debug("BST: Search completed in %d comparisons", comparisons)
+            log.debug("BST: Result: %s", "FOUND" if result else "NOT FOUND")
         return result
     
+    def range(self, lo: Optional[str] = None, hi: Optional[str] = None) -> Iterator[Song]:
+        """Lazily yield songs with lo <= title < hi in title order.
+
+        Either bound may be None for an open end, so range() walks the whole
+        tree. Only the O(log n) path to the next song is held in memory.
+        The tree must not be modified while the generator is in use.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("BST RANGE: Scanning titles from %r up to %r", lo, hi)
+
+        # Seek: keep every node on the path to lo whose title is >= lo
+        stack = []
+        node = self.root
+        while node is not None:
+            if lo is None or node.song.title >= lo:
+                stack.append(node)
+                node = node.left
+            else:
+                node = node.right
+
+        while stack:
+            node = stack.pop()
+            if hi is not None and node.song.title >= hi:
+                return
+            yield node.song
+            node = node.right
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+    def prefix(self, prefix: str) -> Iterator[Song]:
+        """Lazily yield songs whose title starts with prefix, in title order"""
+        for song in self.range(prefix):
+            if not song.title.startswith(prefix):
+                return
+            yield song
+
+    def successor(self, title: str) -> Optional[Song]:
+        """Song with the smallest title greater than title (title need not be in the tree)"""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.song.title > title:
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best.song if best else None
+
+    def predecessor(self, title: str) -> Optional[Song]:
+        """Song with the largest title smaller than title (title need not be in the tree)"""
+        best = None
+        node = self.root
+        while node is not None:
+            if node.song.title < title:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best.song if best else None
+
+    def kth(self, index: int) -> Song:
+        """Song at position index (0-based) in title order, in O(log n)"""
+        if index < 0:
+            index += _size(self.root)
+        if not 0 <= index < _size(self.root):
+            raise IndexError("BST index out of range")
+
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index == left_size:
+                return node.song
+            else:
+                index -= left_size + 1
+                node = node.right
+
+    def rank(self, title: str) -> int:
+        """Number of songs whose title sorts before title, i.e. kth(rank(t)) is the first title >= t"""
+        rank = 0
+        node = self.root
+        while node is not None:
+            if node.song.title < title:
+                rank += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
     def inorder_traversal(self) -> List[Song]:
         """Return all songs in sorted order with verbose logging"""
-        print(f"\nBST TRAVERSAL: Starting in-order traversal of {self.node_count} nodes")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nBST TRAVERSAL: Starting in-order traversal of %d nodes", self.node_count)
         songs = []
-        visit_count = 0
-        
-        def _inorder(root, depth=0):
-            nonlocal visit_count
-            indent = "  " * depth
-            
-            if root:
-                visit_count += 1
-                print(f"{indent}BST: Visiting node '{root.song.title}' at depth {depth}")
-                
-                # Left subtree
-                if root.left:
-                    print(f"{indent}BST: Traversing LEFT subtree")
-                    _inorder(root.left, depth + 1)
-                else:
-                    print(f"{indent}BST: No left child")
-                
-                # Process current node
-                print(f"{indent}BST: Processing '{root.song.title}' (#{len(songs) + 1} in sorted order)")
-                songs.append(root.song)
-                
-                # Right subtree
-                if root.right:
-                    print(f"{indent}BST: Traversing RIGHT subtree")
-                    _inorder(root.right, depth + 1)
-                else:
-                    print(f"{indent}BST: No right child")
-        
-        _inorder(self.root)
-        print(f"BST: Traversal complete. Visited {visit_count} nodes, collected {len(songs)} songs")
-        print(f"BST: Songs in alphabetical order:")
-        for i, song in enumerate(songs, 1):
-            print(f"   {i}. {song.title} - {song.artist}")
+
+        # Iterative in-order walk with an explicit stack (depth is O(log n))
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+            node = stack.pop()
+            if trace:
+                log.debug("%sBST: Processing '%s' (#%d in sorted order)",
+                          "  " * len(stack), node.song.title, len(songs) + 1)
+            songs.append(node.song)
+            node = node.right
+
+        if trace:
+            log.debug("BST: Traversal complete. Visited %d nodes, collected %d songs", len(songs), len(songs))
+            log.debug("BST: Songs in alphabetical order:")
+            for i, song in enumerate(songs, 1):
+                log.debug("   %d. %s - %s", i, song.title, song.artist)
         
         return songs
     
     def _print_tree_structure(self):
-        """Print visual representation of tree structure"""
+        """Log visual representation of tree structure"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
         if not self.root:
-            print("BST: Tree is empty")
+            log.debug("BST: Tree is empty")
+            return
+
+        if self.node_count > MAX_PRINTED_TREE_SIZE:
+            log.debug("BST: Tree structure: root '%s', %d nodes, height %d, %d rotations so far",
+                      self.root.song.title, self.node_count, self.height(), self.rotation_count)
             return
         
-        print("BST: Current tree structure:")
+        log.debug("BST: Current tree structure:")
         
         def _print_structure(root, level=0, prefix="Root: "):
             if root:
-                print("  " * level + prefix + f"'{root.song.title}'")
+                log.debug("%s%s'%s'", "  " * level, prefix, root.song.title)
                 if root.left or root.right:
                     if root.left:
                         _print_structure(root.left, level + 1, "L--- ")
                     else:
-                        print("  " * (level + 1) + "L--- (empty)")
+                        log.debug("%sL--- (empty)", "  " * (level + 1))
                     if root.right:
                         _print_structure(root.right, level + 1, "R--- ")
                     else:
-                        print("  " * (level + 1) + "R--- (empty)")
+                        log.debug("%sR--- (empty)", "  " * (level + 1))
         
         _print_structure(self.root)
 
 # Legacy functions with verbose output
 def get_all_songs():
     """Get songs from database as Song objects with verbose logging"""
-    print("\nBST: Loading songs from database (legacy function)")
+    log.debug("\nBST: Loading songs from database (legacy function)")
     try:
-        conn = sqlite3.connect("songs.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT id, title, artist, album, year FROM songs")
-        rows = cursor.fetchall()
-        conn.close()
-        
-        print(f"BST: Retrieved {len(rows)} songs from database")
-        
-        songs = []
-        for i, row in enumerate(rows, 1):
-            song = Song(
-                song_id=row[0],
-                title=row[1],
-                artist=row[2],
-                album=row[3],
-                year=row[4]
-            )
-            songs.append(song)
-            print(f"BST: Loaded song #{i}: {song.title} - {song.artist}")
-        
+        from src.db.database import get_all_songs as load_songs
+        songs = load_songs()
+        log.debug("BST: Retrieved %d songs from database", len(songs))
+
+        if log.isEnabledFor(logging.DEBUG):
+            for i, song in enumerate(songs, 1):
+                log.debug("BST: Loaded song #%d: %s - %s", i, song.title, song.artist)
+
         return songs
     except Exception as e:
-        print(f"BST: Error loading songs: {e}")
+        log.error("BST: Error loading songs: %s", e)
         return []
 
 def read_song_data():
     """Legacy function - returns dict format for GUI with verbose logging"""
-    print("\nBST: Converting songs to dictionary format for GUI compatibility")
+    log.debug("\nBST: Converting songs to dictionary format for GUI compatibility")
     songs = get_all_songs()
     song_dicts = [song.to_dict() for song in songs]
-    print(f"BST: Converted {len(song_dicts)} songs to dictionary format")
+    log.debug("BST: Converted %d songs to dictionary format", len(song_dicts))
     return song_dicts
 
 def insert(root, song_data):
-    """Legacy insert function with verbose logging"""
+    """Legacy insert function with verbose logging (AVL-balanced, returns the new root)"""
     if isinstance(song_data, dict):
-        print(f"BST: Converting dictionary to Song object: {song_data.get('title')}")
+        log.debug("BST: Converting dictionary to Song object: %s", song_data.get('title'))
         song = Song(
             song_id=song_data.get("id"),
             title=song_data.get("title", ""),
@@ -188,36 +592,36 @@ def insert(root, song_data):
         )
     else:
         song = song_data
-        print(f"BST: Using Song object directly: {song.title}")
+        log.debug("BST: Using Song object directly: %s", song.title)
     
     if root is None:
-        print(f"BST: Creating root node for '{song.title}'")
+        log.debug("BST: Creating root node for '%s'", song.title)
         return BSTNode(song)
     elif song.title < root.song.title:
-        print(f"BST: '{song.title}' goes to LEFT of '{root.song.title}'")
+        log.debug("BST: '%s' goes to LEFT of '%s'", song.title, root.song.title)
         root.left = insert(root.left, song)
     else:
-        print(f"BST: '{song.title}' goes to RIGHT of '{root.song.title}'")
+        log.debug("BST: '%s' goes to RIGHT of '%s'", song.title, root.song.title)
         root.right = insert(root.right, song)
     
-    return root
+    return _rebalance(root)
 
 def search_by_title(root, title):
     """Legacy search function with verbose logging"""
     if root is None:
-        print(f"BST: Search reached null node - '{title}' not found")
+        log.debug("BST: Search reached null node - '%s' not found", title)
         return None
     
-    print(f"BST: Comparing '{title}' with '{root.song.title}'")
+    log.debug("BST: Comparing '%s' with '%s'", title, root.song.title)
     
     if root.song.title == title:
-        print(f"BST: Found '{title}' - returning song data")
+        log.debug("BST: Found '%s' - returning song data", title)
         return root.song.to_dict()
     elif title < root.song.title:
-        print(f"BST: '{title}' < '{root.song.title}' - searching left")
+        log.debug("BST: '%s' < '%s' - searching left", title, root.song.title)
         return search_by_title(root.left, title)
     else:
-        print(f"BST: '{title}' > '{root.song.title}' - searching right")
+        log.debug("BST: '%s' > '%s' - searching right", title, root.song.title)
         return search_by_title(root.right, title)
 
 def inorder(root):
@@ -0,0 +1,89 @@
+from src.model.song import Song
+from src.ds.bst_read import SongBST
+from src.ds.events import ChangeNotifier, SongChange, ADDED, UPDATED, REMOVED
+from src.ds.hashtable_update import SongTable
+from src.utils.logger import get_logger
+from typing import Callable, Iterable, List, MutableMapping, Optional
+
+log = get_logger("catalog")
+
+
+class SongCatalog:
+    """Single in-memory copy of the song library shared by every index.
+
+    The library is read from the database once, with every column, and each
+    row becomes exactly one Song object. The BST (title order) and the hash
+    table (id lookup, plus its autocomplete trie) hold references to those
+    same objects, so an in-place update through SongTable is visible from
+    the BST without reloading, and memory holds one Song per row.
+
+    Edits arrive as deltas (SongChange): SongTable.update_song publishes
+    them directly, and the DeleteStack's deletes and restores are fed in
+    through apply_change. Each delta touches the BST in O(log n) and is then
+    re-published on self.changes for views such as the song list.
+    """
+
+    def __init__(self, table_factory: Callable[[], MutableMapping] = dict):
+        self.table_factory = table_factory  # SongTable backend, e.g. OpenAddressingTable
+        self.bst = SongBST()
+        self.table = SongTable(table_factory)
+        self.table.changes.subscribe(self.apply_change)
+        self.changes = ChangeNotifier()
+
+    def __len__(self):
+        return len(self.table.table)
+
+    def load(self) -> bool:
+        """(Re)load the whole library from the database in one streamed query"""
+        try:
+            from src.db.database import count_songs, iter_songs
+        except ImportError:
+            log.warning("CATALOG: Database module not available")
+            return False
+
+        self.load_from_list(iter_songs(), count_songs())
+        return True
+
+    def load_from_list(self, songs: Iterable[Song], count: Optional[int] = None):
+        """Build every index from songs already sorted by title.
+
+        songs may be a stream such as database.iter_songs(): each song goes
+        into the hash table and on into the BST bulk loader as it arrives,
+        so no list of the whole library is built. Pass count with a stream
+        (see SongBST.load_sorted).
+        """
+        log.debug("CATALOG: Indexing %s songs", "all" if count is None else count)
+        self.table = SongTable(self.table_factory)
+        self.bst = SongBST.from_sorted(self.table.load_iter(songs), count)
+        self.table.changes.subscribe(self.apply_change)
+
+    def get_song(self, song_id) -> Optional[Song]:
+        return self.table.get_song(song_id)
+
+    def apply_change(self, change: SongChange):
+        """Apply one delta to the in-memory indexes and pass it on to subscribers"""
+        song = change.song
+        if change.kind == REMOVED:
+            # The change may carry a copy read back from the database; the BST holds the table's object
+            indexed = self.table.remove_song(song.id)
+            if indexed is not None:
+                self.bst.delete(indexed.title, indexed)
+        elif change.kind == ADDED:
+            self.table.add_song(song)
+            self.bst.insert(song)
+        elif change.kind == UPDATED:
+            # SongTable already changed the shared object; only a new title moves it in the BST
+            old_title = (change.old_values or {}).get("title")
+            if old_title is not None and old_title != song.title:
+                self.bst.update_key(old_title, song.title, song)
+        log.debug("CATALOG: Applied %s change for song %s", change.kind, song.id)
+        self.changes.emit(change.kind, song, change.old_values)
+
+    def rebuild_bst(self):
+        """Rebuild the title index from the in-memory songs (no database read)"""
+        songs = sorted(self.table.table.values(), key=lambda song: (song.title, song.artist))
+        self.bst = SongBST.from_sorted(songs)
+
+    def songs_by_id(self) -> List[Song]:
+        """All songs currently in the library, ordered by id"""
+        return sorted(self.table.table.values(), key=lambda song: song.id)
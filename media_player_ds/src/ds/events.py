@@ -0,0 +1,52 @@
+from src.model.song import Song
+from src.utils.logger import get_logger
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+log = get_logger("events")
+
+# Change kinds
+ADDED = "added"
+UPDATED = "updated"
+REMOVED = "removed"
+
+
+class SongChange(NamedTuple):
+    """A single change to the library.
+
+    song is the live Song object (already updated for UPDATED changes);
+    old_values maps each changed field to its value before the update.
+    """
+    kind: str
+    song: Song
+    old_values: Optional[Dict[str, object]] = None
+
+
+class ChangeNotifier:
+    """Minimal observer list used by the data structures to publish deltas.
+
+    Listeners are called synchronously, in subscription order. A failing
+    listener is logged and skipped so it cannot undo the change that has
+    already been applied by the publisher.
+    """
+
+    def __init__(self):
+        self._listeners: List[Callable[[SongChange], None]] = []
+
+    def subscribe(self, listener: Callable[[SongChange], None]):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[SongChange], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def emit(self, kind: str, song: Song, old_values: Optional[Dict[str, object]] = None):
+        if not self._listeners:
+            return
+        change = SongChange(kind, song, old_values)
+        log.debug("EVENTS: %s song %s ('%s') -> %d listener(s)", kind, song.id, song.title, len(self._listeners))
+        for listener in list(self._listeners):
+            try:
+                listener(change)
+            except Exception:
+                log.exception("EVENTS: Listener %r failed on %s change", listener, kind)
@@ -1,71 +1,213 @@
 from src.model.song import Song
-from typing import List, Optional
+from src.ds.events import ChangeNotifier, UPDATED
+from src.ds.trie_search import SongTrie
+from src.utils.logger import get_logger
+from typing import Callable, Dict, Iterable, Iterator, List, MutableMapping, Optional, Set
+import logging
+
+log = get_logger("hashtable")
+
+# Fields that can be looked up through a secondary index (see SongTable.find_by)
+FACET_FIELDS = ("artist", "album", "genre", "year")
+# Song fields refresh_song copies from the database
+REFRESHED_FIELDS = ("title", "artist", "album", "genre", "year", "duration", "file_path")
+
+
+def _facet_key(value):
+    """Index key for a field value: case- and whitespace-insensitive for text, None if empty"""
+    if isinstance(value, str):
+        return " ".join(value.casefold().split()) or None
+    return value
+
 
 class SongTable:
-    def __init__(self):
-        # Hash table: key = song ID, value = Song object
-        self.table = {}
+    def __init__(self, table_factory: Callable[[], MutableMapping] = dict):
+        # Hash table: key = song ID, value = Song object. The backend is
+        # pluggable, e.g. table_factory=OpenAddressingTable (open_addressing.py)
+        self.table = table_factory()
         self.total_operations = 0
         self.total_updates = 0
         self.collision_count = 0
-        print("HASH TABLE: Initialized empty hash table for song updates")
-        print("HASH TABLE: Using song ID as hash key for O(1) access time")
+        # Autocomplete index, built on first use and then kept in step with
+        # every add, update and remove (see prefix_index)
+        self._prefix_index: Optional[SongTrie] = None
+        # Secondary indexes, field -> value -> song ids; each one is built on
+        # its first lookup and then kept in step like the prefix index
+        self._facets: Dict[str, Dict[object, Set[int]]] = {}
+        # Subscribers (BST, UI) get an UPDATED delta after every in-memory edit
+        self.changes = ChangeNotifier()
+        log.debug("HASH TABLE: Initialized empty hash table for song updates")
+        log.debug("HASH TABLE: Using song ID as hash key for O(1) access time")
         self._print_table_stats()
 
-    def load_from_list(self, song_list: List[Song]):
-        """Load songs from list into the hash table with verbose logging"""
-        print(f"\nHASH TABLE LOAD: Loading {len(song_list)} songs into hash table")
-        print("HASH TABLE LOAD: Demonstrating hash function: song.id -> table[song.id]")
+    def load_from_list(self, song_list: Iterable[Song]):
+        """Load songs (a list or any iterable) into the hash table with verbose logging"""
+        for _ in self.load_iter(song_list):
+            pass
+
+    def load_iter(self, song_list: Iterable[Song]) -> Iterator[Song]:
+        """Store each song as it streams past and yield it on.
+
+        Lets one pass over database.iter_songs() fill this table and another
+        index (e.g. the BST bulk loader) without collecting a list first.
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nHASH TABLE LOAD: Loading songs into hash table")
+            log.debug("HASH TABLE LOAD: Demonstrating hash function: song.id -> table[song.id]")
         
+        i = 0
         for i, song in enumerate(song_list, 1):
-            print(f"\nHASH TABLE LOAD: Processing song #{i}: '{song.title}'")
-            
-            # Show hash function operation
-            hash_key = song.id
-            print(f"HASH FUNCTION: hash(song.id={song.id}) = {hash_key}")
-            print(f"HASH TABLE: Storing at table[{hash_key}]")
+            if trace:
+                log.debug("\nHASH TABLE LOAD: Processing song #%d: '%s'", i, song.title)
+
+                # Show hash function operation
+                log.debug("HASH FUNCTION: hash(song.id=%s) = %s", song.id, song.id)
+                log.debug("HASH TABLE: Storing at table[%s]", song.id)
             
             # Check for collision (ID already exists)
             if song.id in self.table:
-                print(f"COLLISION DETECTED: Key {song.id} already exists!")
-                existing_song = self.table[song.id]
-                print(f"   Existing: {existing_song.title} - {existing_song.artist}")
-                print(f"   New: {song.title} - {song.artist}")
                 self.collision_count += 1
-                print(f"COLLISION HANDLING: Overwriting existing entry (collision #{self.collision_count})")
-            else:
-                print(f"HASH TABLE: No collision - key {song.id} is available")
+                if trace:
+                    existing_song = self.table[song.id]
+                    log.debug("COLLISION DETECTED: Key %s already exists!", song.id)
+                    log.debug("   Existing: %s - %s", existing_song.title, existing_song.artist)
+                    log.debug("   New: %s - %s", song.title, song.artist)
+                    log.debug("COLLISION HANDLING: Overwriting existing entry (collision #%d)",
+                              self.collision_count)
+            elif trace:
+                log.debug("HASH TABLE: No collision - key %s is available", song.id)
             
             # Store in hash table
+            if self._facets:
+                self._unindex_facets(self.table.get(song.id))
             self.table[song.id] = song
-            print(f"HASH TABLE: Successfully stored '{song.title}' at key {song.id}")
-            print(f"HASH TABLE: Table size now: {len(self.table)} entries")
-            print(f"HASH TABLE: Load factor: {len(self.table)/1000:.3f} (assuming max 1000 songs)")
+            if self._prefix_index is not None:
+                self._prefix_index.add_song(song)
+            if self._facets:
+                self._index_facets(song)
+            if trace:
+                log.debug("HASH TABLE: Successfully stored '%s' at key %s", song.title, song.id)
+                log.debug("HASH TABLE: Table size now: %d entries", len(self.table))
+                if hasattr(self.table, "load_factor"):
+                    log.debug("HASH TABLE: Load factor: %.3f", self.table.load_factor)
+            yield song
         
-        print(f"\nHASH TABLE LOAD COMPLETE:")
-        print(f"   Total songs processed: {len(song_list)}")
-        print(f"   Final table size: {len(self.table)}")
-        print(f"   Collisions encountered: {self.collision_count}")
-        print(f"   Average access time: O(1) - constant time")
-        self._print_table_stats()
+        if trace:
+            log.debug("\nHASH TABLE LOAD COMPLETE:")
+            log.debug("   Total songs processed: %d", i)
+            log.debug("   Final table size: %d", len(self.table))
+            log.debug("   Collisions encountered: %d", self.collision_count)
+            log.debug("   Average access time: O(1) - constant time")
+            self._print_table_stats()
 
     def load_from_database(self):
         """Load all songs from database into hash table with verbose logging"""
-        print("\nHASH TABLE: Loading songs from database...")
+        log.debug("\nHASH TABLE: Loading songs from database...")
         
         try:
-            from src.db.database import get_all_songs
-            songs = get_all_songs()
-            print(f"DATABASE: Retrieved {len(songs)} songs from database")
-            
-            if songs:
-                self.load_from_list(songs)
-                print(f"HASH TABLE: Successfully loaded {len(songs)} songs into hash table")
+            from src.db.database import iter_songs
+            before = len(self.table)
+            self.load_from_list(iter_songs())
+            loaded = len(self.table) - before
+
+            if loaded:
+                log.debug("HASH TABLE: Successfully loaded %d songs into hash table", loaded)
             else:
-                print("DATABASE: No songs found in database")
+                log.debug("DATABASE: No songs found in database")
                 
         except ImportError:
-            print("HASH TABLE: Database module not available")
+            log.warning("HASH TABLE: Database module not available")
+
+    def add_song(self, song: Song):
+        """Insert or replace a single song (e.g. after a restore)"""
+        if self._facets:
+            self._unindex_facets(self.table.get(song.id))
+        self.table[song.id] = song
+        if self._prefix_index is not None:
+            self._prefix_index.add_song(song)
+        if self._facets:
+            self._index_facets(song)
+        log.debug("HASH TABLE: Stored '%s' at key %s", song.title, song.id)
+
+    def remove_song(self, song_id: int) -> Optional[Song]:
+        """Remove a song by ID, returning it (None if absent)"""
+        song = self.table.pop(song_id, None)
+        if song is not None:
+            if self._prefix_index is not None:
+                self._prefix_index.remove_song(song_id)
+            self._unindex_facets(song)
+            log.debug("HASH TABLE: Removed key %s ('%s')", song_id, song.title)
+        return song
+
+    @property
+    def prefix_index(self) -> SongTrie:
+        """Autocomplete trie over the table, built on first access.
+
+        Loading the table never pays for the trie; the first completion
+        request indexes every song once, and later changes are applied
+        incrementally.
+        """
+        if self._prefix_index is None:
+            self._prefix_index = SongTrie()
+            self._prefix_index.add_songs(self.table.values())
+        return self._prefix_index
+
+    def complete(self, prefix: str, limit: int = 10) -> List[str]:
+        """Titles, artists and albums starting with prefix, for search-as-you-type"""
+        return self.prefix_index.complete(prefix, limit)
+
+    def find_by(self, field: str, value) -> List[Song]:
+        """All songs whose field (artist, album, genre or year) equals value, in O(k).
+
+        Text matches ignore case and extra whitespace. The index for a field
+        is built from the table on its first lookup.
+        """
+        ids = self._facet(field).get(_facet_key(value), ())
+        log.debug("HASH TABLE FACET: %s = %r -> %d songs", field, value, len(ids))
+        return [self.table[song_id] for song_id in ids]
+
+    def facet_counts(self, field: str) -> Dict[object, int]:
+        """Number of songs per (normalized) value of field"""
+        return {key: len(ids) for key, ids in self._facet(field).items()}
+
+    def _facet(self, field: str) -> Dict[object, Set[int]]:
+        if field not in FACET_FIELDS:
+            raise ValueError(f"No secondary index on {field!r}; expected one of {', '.join(FACET_FIELDS)}")
+        index = self._facets.get(field)
+        if index is None:
+            index = self._facets[field] = {}
+            for song_id, song in self.table.items():
+                key = _facet_key(getattr(song, field))
+                if key is not None:
+                    index.setdefault(key, set()).add(song_id)
+            log.debug("HASH TABLE FACET: Built %s index (%d values)", field, len(index))
+        return index
+
+    def _index_facets(self, song: Song, fields=None):
+        for field in (self._facets if fields is None else fields):
+            index = self._facets.get(field)
+            key = _facet_key(getattr(song, field))
+            if index is not None and key is not None:
+                index.setdefault(key, set()).add(song.id)
+
+    def _unindex_facets(self, song: Optional[Song], old_values: Optional[dict] = None):
+        """Drop song from the built indexes, using old_values for fields changed in place"""
+        if song is None:
+            return
+        for field, index in self._facets.items():
+            if old_values is not None:
+                if field not in old_values:
+                    continue
+                value = old_values[field]
+            else:
+                value = getattr(song, field)
+            key = _facet_key(value)
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(song.id)
+                if not ids:
+                    del index[key]
 
     def display_all(self):
         """Print all songs in the table with verbose logging"""
@@ -93,181 +235,241 @@ class SongTable:
 
     def get_song(self, song_id: int) -> Optional[Song]:
         """Get a song by ID with verbose logging"""
-        print(f"\nHASH TABLE GET: Looking up song with ID {song_id}")
+        trace = log.isEnabledFor(logging.DEBUG)
         self.total_operations += 1
         
-        # Demonstrate hash function lookup
-        print(f"HASH FUNCTION: Calculating hash(song_id={song_id}) = {song_id}")
-        print(f"HASH TABLE: Accessing table[{song_id}] directly")
-        print(f"TIME COMPLEXITY: O(1) - constant time lookup")
+        if trace:
+            log.debug("\nHASH TABLE GET: Looking up song with ID %s", song_id)
+
+            # Demonstrate hash function lookup
+            log.debug("HASH FUNCTION: Calculating hash(song_id=%s) = %s", song_id, song_id)
+            log.debug("HASH TABLE: Accessing table[%s] directly", song_id)
+            log.debug("TIME COMPLEXITY: O(1) - constant time lookup")
         
         # Check if key exists
-        if song_id in self.table:
-            song = self.table[song_id]
-            print(f"HASH TABLE GET: FOUND! '{song.title}' - {song.artist}")
-            print(f"HASH TABLE GET: Retrieved in 1 operation (O(1) access)")
+        song = self.table.get(song_id)
+        if song is not None:
+            if trace:
+                log.debug("HASH TABLE GET: FOUND! '%s' - %s", song.title, song.artist)
+                log.debug("HASH TABLE GET: Retrieved in 1 operation (O(1) access)")
             return song
         else:
-            print(f"HASH TABLE GET: NOT FOUND - No song with ID {song_id}")
-            print(f"HASH TABLE GET: Available keys: {sorted(self.table.keys())}")
+            if trace:
+                log.debug("HASH TABLE GET: NOT FOUND - No song with ID %s", song_id)
+                log.debug("HASH TABLE GET: Available keys: %s", sorted(self.table.keys()))
             return None
 
     def update_song(self, song_id: int, title=None, artist=None, album=None,
-                    genre=None, year=None, duration=None, file_path=None) -> bool:
-        """Update a song by ID with enhanced fields and verbose logging"""
-        print(f"\nHASH TABLE UPDATE: Attempting to update song ID {song_id}")
+                    genre=None, year=None, duration=None, file_path=None, persist: bool = True) -> bool:
+        """Update a song by ID with enhanced fields and verbose logging.
+
+        With persist=False only the in-memory song is changed; the caller
+        saves it (e.g. update_song_in_db on a background thread).
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
         self.total_operations += 1
         
-        # First, demonstrate hash lookup
-        print(f"HASH FUNCTION: hash(song_id={song_id}) = {song_id}")
-        print(f"HASH TABLE: Checking table[{song_id}] for existing entry")
+        if trace:
+            log.debug("\nHASH TABLE UPDATE: Attempting to update song ID %s", song_id)
+
+            # First, demonstrate hash lookup
+            log.debug("HASH FUNCTION: hash(song_id=%s) = %s", song_id, song_id)
+            log.debug("HASH TABLE: Checking table[%s] for existing entry", song_id)
         
         if song_id not in self.table:
-            print(f"HASH TABLE UPDATE: Song ID '{song_id}' not found in hash table")
-            print(f"HASH TABLE UPDATE: Hash lookup failed - key does not exist")
-            print(f"HASH TABLE UPDATE: Available IDs: {sorted(self.table.keys())}")
+            if trace:
+                log.debug("HASH TABLE UPDATE: Song ID '%s' not found in hash table", song_id)
+                log.debug("HASH TABLE UPDATE: Hash lookup failed - key does not exist")
+                log.debug("HASH TABLE UPDATE: Available IDs: %s", sorted(self.table.keys()))
             return False
 
         song = self.table[song_id]
-        print(f"HASH TABLE UPDATE: Found song: '{song.title}' - {song.artist}")
-        print(f"HASH TABLE UPDATE: Hash lookup successful in O(1) time")
-        
-        # Show original values
-        print(f"ORIGINAL VALUES:")
-        print(f"   Title: '{song.title}'")
-        print(f"   Artist: '{song.artist}'")
-        print(f"   Album: '{song.album}'")
-        print(f"   Genre: '{song.genre}'")
-        print(f"   Year: {song.year}")
-        print(f"   Duration: {song.duration} seconds")
+        if trace:
+            log.debug("HASH TABLE UPDATE: Found song: '%s' - %s", song.title, song.artist)
+            log.debug("HASH TABLE UPDATE: Hash lookup successful in O(1) time")
+
+            # Show original values
+            log.debug("ORIGINAL VALUES:")
+            log.debug("   Title: '%s'", song.title)
+            log.debug("   Artist: '%s'", song.artist)
+            log.debug("   Album: '%s'", song.album)
+            log.debug("   Genre: '%s'", song.genre)
+            log.debug("   Year: %s", song.year)
+            log.debug("   Duration: %s seconds", song.duration)
         
-        # Track what's being updated
+        # Track what's being updated, and the values before the update
         updates_made = []
+        old_values = {}
         
-        print(f"\nUPDATE OPERATIONS:")
+        log.debug("\nUPDATE OPERATIONS:")
         
         # Update provided fields
         if title:
-            print(f"UPDATING TITLE: '{song.title}' -> '{title}'")
+            log.debug("UPDATING TITLE: '%s' -> '%s'", song.title, title)
+            old_values["title"] = song.title
             song.title = title
             updates_made.append("title")
             
         if artist:
-            print(f"UPDATING ARTIST: '{song.artist}' -> '{artist}'")
+            log.debug("UPDATING ARTIST: '%s' -> '%s'", song.artist, artist)
+            old_values["artist"] = song.artist
             song.artist = artist
             updates_made.append("artist")
             
         if album:
-            print(f"UPDATING ALBUM: '{song.album}' -> '{album}'")
+            log.debug("UPDATING ALBUM: '%s' -> '%s'", song.album, album)
+            old_values["album"] = song.album
             song.album = album
             updates_made.append("album")
             
         if genre:
-            print(f"UPDATING GENRE: '{song.genre}' -> '{genre}'")
+            log.debug("UPDATING GENRE: '%s' -> '%s'", song.genre, genre)
+            old_values["genre"] = song.genre
             song.genre = genre
             updates_made.append("genre")
             
         if year:
-            print(f"UPDATING YEAR: {song.year} -> {year}")
+            log.debug("UPDATING YEAR: %s -> %s", song.year, year)
+            old_values["year"] = song.year
             song.year = year
             updates_made.append("year")
             
         if duration:
-            print(f"UPDATING DURATION: {song.duration} -> {duration} seconds")
+            log.debug("UPDATING DURATION: %s -> %s seconds", song.duration, duration)
+            old_values["duration"] = song.duration
             song.duration = duration
             updates_made.append("duration")
             
         if file_path:
-            print(f"UPDATING FILE_PATH: '{song.file_path}' -> '{file_path}'")
+            log.debug("UPDATING FILE_PATH: '%s' -> '%s'", song.file_path, file_path)
+            old_values["file_path"] = song.file_path
             song.file_path = file_path
             updates_made.append("file_path")
 
         if not updates_made:
-            print("HASH TABLE UPDATE: No updates provided - no changes made")
+            log.debug("HASH TABLE UPDATE: No updates provided - no changes made")
             return True
 
-        print(f"HASH TABLE UPDATE: Updated fields: {', '.join(updates_made)}")
-        print(f"HASH TABLE UPDATE: In-memory update completed in O(1) time")
+        if self._prefix_index is not None and {"title", "artist", "album"}.intersection(updates_made):
+            self._prefix_index.update_song(song)
+        if self._facets:
+            self._unindex_facets(song, old_values)
+            self._index_facets(song, [field for field in self._facets if field in old_values])
+
+        log.debug("HASH TABLE UPDATE: Updated fields: %s", ", ".join(updates_made))
+        log.debug("HASH TABLE UPDATE: In-memory update completed in O(1) time")
         self.total_updates += 1
+        self.changes.emit(UPDATED, song, old_values)
+
+        if not persist:
+            self._print_updated_song(song)
+            return True
 
         # Persist to database if available
-        print(f"DATABASE PERSISTENCE: Attempting to save changes to database...")
+        log.debug("DATABASE PERSISTENCE: Attempting to save changes to database...")
         try:
             from src.db.database import update_song_in_db
             
             if update_song_in_db(song):
-                print(f"HASH TABLE UPDATE: Successfully updated song '{song_id}' in both hash table and database")
-                print(f"UPDATE STATISTICS: Update operation #{self.total_updates} completed")
+                log.debug("HASH TABLE UPDATE: Successfully updated song '%s' in both hash table and database",
+                          song_id)
+                log.debug("UPDATE STATISTICS: Update operation #%d completed", self.total_updates)
                 self._print_updated_song(song)
                 return True
             else:
-                print(f"HASH TABLE UPDATE: Failed to update song '{song_id}' in database")
-                print(f"HASH TABLE UPDATE: Hash table updated but database update failed")
+                log.warning("HASH TABLE UPDATE: Failed to update song '%s' in database", song_id)
+                log.warning("HASH TABLE UPDATE: Hash table updated but database update failed")
                 return True
                 
         except ImportError:
-            print(f"HASH TABLE UPDATE: Song '{song_id}' updated in memory (database not available)")
-            print(f"UPDATE STATISTICS: Update operation #{self.total_updates} completed")
+            log.debug("HASH TABLE UPDATE: Song '%s' updated in memory (database not available)", song_id)
+            log.debug("UPDATE STATISTICS: Update operation #%d completed", self.total_updates)
             self._print_updated_song(song)
             return True
 
     def refresh_song(self, song_id: int) -> bool:
         """Refresh a song from database with verbose logging"""
-        print(f"\nHASH TABLE REFRESH: Refreshing song ID {song_id} from database")
-        print(f"HASH FUNCTION: hash(song_id={song_id}) = {song_id}")
+        log.debug("\nHASH TABLE REFRESH: Refreshing song ID %s from database", song_id)
+        log.debug("HASH FUNCTION: hash(song_id=%s) = %s", song_id, song_id)
         
         try:
             from src.db.database import get_song_by_id
             updated_song = get_song_by_id(song_id)
             
             if updated_song:
-                old_song = self.table.get(song_id)
+                song = self.table.get(song_id)
+                
+                log.debug("HASH TABLE REFRESH: Retrieved updated song from database")
+                log.debug("HASH TABLE: Updating table[%s] with new data", song_id)
                 
-                print(f"HASH TABLE REFRESH: Retrieved updated song from database")
-                print(f"HASH TABLE: Updating table[{song_id}] with new data")
+                if song is None:
+                    self.add_song(updated_song)
+                    return True
                 
-                self.table[song_id] = updated_song
+                # Copy the stored values onto the shared Song object, as update_song does
+                old_values = {}
+                for field in REFRESHED_FIELDS:
+                    value = getattr(updated_song, field)
+                    if getattr(song, field) != value:
+                        old_values[field] = getattr(song, field)
+                        setattr(song, field, value)
                 
-                print(f"HASH TABLE REFRESH: Successfully refreshed song ID {song_id}")
-                if old_song:
-                    print(f"HASH TABLE REFRESH: Updated from '{old_song.title}' to '{updated_song.title}'")
+                if not old_values:
+                    log.debug("HASH TABLE REFRESH: Song ID %s is already up to date", song_id)
+                    return True
                 
+                if self._prefix_index is not None and {"title", "artist", "album"}.intersection(old_values):
+                    self._prefix_index.update_song(song)
+                if self._facets:
+                    self._unindex_facets(song, old_values)
+                    self._index_facets(song, [field for field in self._facets if field in old_values])
+                
+                log.debug("HASH TABLE REFRESH: Successfully refreshed song ID %s (%s)",
+                          song_id, ", ".join(old_values))
+                self.changes.emit(UPDATED, song, old_values)
                 return True
             else:
-                print(f"HASH TABLE REFRESH: Song ID {song_id} not found in database")
+                log.debug("HASH TABLE REFRESH: Song ID %s not found in database", song_id)
                 return False
                 
         except ImportError:
-            print("HASH TABLE REFRESH: Database module not available for refresh")
+            log.warning("HASH TABLE REFRESH: Database module not available for refresh")
             return False
 
     def _print_table_stats(self):
-        """Internal method to print hash table statistics"""
-        max_capacity = 1000  # Assuming reasonable max capacity
-        load_factor = len(self.table) / max_capacity if len(self.table) > 0 else 0
-        
-        print(f"HASH TABLE STATISTICS:")
-        print(f"   Current size: {len(self.table)} entries")
-        print(f"   Total operations: {self.total_operations}")
-        print(f"   Total updates: {self.total_updates}")
-        print(f"   Collisions encountered: {self.collision_count}")
-        print(f"   Load factor: {load_factor:.3f}")
-        print(f"   Average access time: O(1) - constant")
+        """Internal method to log hash table statistics"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        log.debug("HASH TABLE STATISTICS:")
+        log.debug("   Current size: %d entries", len(self.table))
+        log.debug("   Total operations: %d", self.total_operations)
+        log.debug("   Total updates: %d", self.total_updates)
+        log.debug("   Duplicate IDs overwritten: %d", self.collision_count)
         
-        if len(self.table) > 0:
-            collision_rate = (self.collision_count / len(self.table)) * 100
-            print(f"   Collision rate: {collision_rate:.1f}%")
+        # Only a backend that exposes its slots can report real load and probe lengths
+        if hasattr(self.table, "probe_stats"):
+            stats = self.table.probe_stats()
+            log.debug("   Capacity: %d slots, load factor: %.3f, tombstones: %d",
+                      stats["capacity"], stats["load_factor"], stats["tombstones"])
+            log.debug("   Probe length: avg %.2f, max %d (hits), avg %.2f (misses)",
+                      stats["avg_probe"], stats["max_probe"], stats["avg_miss_probe"])
+        else:
+            log.debug("   Backend: %s (load factor not exposed)", type(self.table).__name__)
 
     def _print_updated_song(self, song):
-        """Internal method to print updated song details"""
-        print(f"UPDATED SONG DETAILS:")
-        print(f"   ID: {song.id}")
-        print(f"   Title: '{song.title}'")
-        print(f"   Artist: '{song.artist}'")
-        print(f"   Album: '{song.album}'")
-        print(f"   Genre: '{song.genre}'")
-        print(f"   Year: {song.year}")
-        print(f"   Duration: {song.duration} seconds")
+        """Internal method to log updated song details"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        log.debug("UPDATED SONG DETAILS:")
+        log.debug("   ID: %s", song.id)
+        log.debug("   Title: '%s'", song.title)
+        log.debug("   Artist: '%s'", song.artist)
+        log.debug("   Album: '%s'", song.album)
+        log.debug("   Genre: '%s'", song.genre)
+        log.debug("   Year: %s", song.year)
+        log.debug("   Duration: %s seconds", song.duration)
 
     def demonstrate_hash_function(self, song_ids):
         """Demonstrate hash function operation with multiple IDs"""
@@ -0,0 +1,288 @@
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from src.utils.logger import get_logger
+from typing import Dict, Iterator
+
+log = get_logger("hashtable")
+
+# Slot markers: never used, and deleted (a tombstone keeps probe chains intact)
+_EMPTY = object()
+_DELETED = object()
+
+# Fibonacci hashing: multiply by 2^64 / golden ratio and keep the top bits.
+# Song ids are consecutive integers (hash(i) == i), which would otherwise
+# fill one solid run of slots and make every miss inside it scan to the end.
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+
+DEFAULT_CAPACITY = 8
+DEFAULT_MAX_LOAD = 0.7   # grow (or compact) once live entries + tombstones pass this
+DEFAULT_MIN_LOAD = 0.1   # shrink once live entries fall below this
+
+
+class OpenAddressingTable(MutableMapping):
+    """Hash table with linear probing over two flat slot arrays.
+
+    Keys and values live in parallel Python lists whose length (the
+    capacity) is a power of two. A key's home slot comes from Fibonacci
+    hashing of hash(key); collisions walk forward to the next free slot
+    (linear probing, so a probe run stays in one stretch of the arrays).
+    Deleting leaves a tombstone so later keys in the same run stay
+    reachable, except at the end of a run where the slot (and any
+    tombstones before it) can simply become empty again.
+
+    Resize policy: when live entries plus tombstones exceed max_load of
+    the capacity, the table is rebuilt, doubling the capacity if the live
+    entries alone need it and otherwise just dropping the tombstones. When
+    live entries fall below min_load it halves. probe_stats() measures the
+    real probe lengths of the current layout.
+    """
+
+    def __init__(self, items=(), capacity: int = DEFAULT_CAPACITY,
+                 max_load: float = DEFAULT_MAX_LOAD, min_load: float = DEFAULT_MIN_LOAD):
+        if not 0 < min_load < max_load < 1:
+            raise ValueError("expected 0 < min_load < max_load < 1")
+        self.max_load = max_load
+        self.min_load = min_load
+        self._min_capacity = _power_of_two(capacity)
+        self._resizes = 0
+        self._reset(self._min_capacity)
+        self.update(items)
+
+    def _reset(self, capacity: int):
+        self._keys = [_EMPTY] * capacity
+        self._values = [None] * capacity
+        self._mask = capacity - 1
+        self._shift = 64 - (capacity.bit_length() - 1)
+        self._size = 0
+        self._tombstones = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    @property
+    def load_factor(self) -> float:
+        return self._size / self.capacity
+
+    def __len__(self):
+        return self._size
+
+    def _home(self, key) -> int:
+        return ((hash(key) * _GOLDEN) & _MASK_64) >> self._shift
+
+    def _find(self, key) -> int:
+        """Slot holding key, or -1"""
+        keys, mask = self._keys, self._mask
+        index = ((hash(key) * _GOLDEN) & _MASK_64) >> self._shift
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                return -1
+            if slot_key is key or (slot_key is not _DELETED and slot_key == key):
+                return index
+            index = (index + 1) & mask
+
+    def __getitem__(self, key):
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        return self._values[index]
+
+    def get(self, key, default=None):
+        index = self._find(key)
+        return default if index < 0 else self._values[index]
+
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+    def __setitem__(self, key, value):
+        keys, mask = self._keys, self._mask
+        index = ((hash(key) * _GOLDEN) & _MASK_64) >> self._shift
+        free = -1  # first tombstone on the way, reused if key is not present
+        while True:
+            slot_key = keys[index]
+            if slot_key is _EMPTY:
+                break
+            if slot_key is _DELETED:
+                if free < 0:
+                    free = index
+            elif slot_key is key or slot_key == key:
+                self._values[index] = value
+                return
+            index = (index + 1) & mask
+
+        if free >= 0:
+            index = free
+            self._tombstones -= 1
+        keys[index] = key
+        self._values[index] = value
+        self._size += 1
+        if self._size + self._tombstones > self.max_load * self.capacity:
+            self._grow()
+
+    def __delitem__(self, key):
+        index = self._find(key)
+        if index < 0:
+            raise KeyError(key)
+        self._delete_at(index)
+
+    def pop(self, key, *default):
+        index = self._find(key)
+        if index < 0:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        value = self._values[index]
+        self._delete_at(index)
+        return value
+
+    def _delete_at(self, index: int):
+        keys, mask = self._keys, self._mask
+        self._values[index] = None
+        self._size -= 1
+        if keys[(index + 1) & mask] is _EMPTY:
+            # End of a probe run: nothing depends on this slot, nor on tombstones right before it
+            keys[index] = _EMPTY
+            index = (index - 1) & mask
+            while keys[index] is _DELETED:
+                keys[index] = _EMPTY
+                self._tombstones -= 1
+                index = (index - 1) & mask
+        else:
+            keys[index] = _DELETED
+            self._tombstones += 1
+
+        if self._size < self.min_load * self.capacity and self.capacity > self._min_capacity:
+            self._rehash(self.capacity // 2)
+
+    def __iter__(self) -> Iterator:
+        for key in self._keys:
+            if key is not _EMPTY and key is not _DELETED:
+                yield key
+
+    def values(self):
+        return _Values(self)
+
+    def items(self):
+        return _Items(self)
+
+    def _iter_values(self):
+        for key, value in zip(self._keys, self._values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield value
+
+    def _iter_items(self):
+        for key, value in zip(self._keys, self._values):
+            if key is not _EMPTY and key is not _DELETED:
+                yield key, value
+
+    def clear(self):
+        self._reset(self._min_capacity)
+
+    def compact(self):
+        """Rebuild in place to drop every tombstone"""
+        self._rehash(self.capacity)
+
+    def _grow(self):
+        capacity = self.capacity
+        # Double only if live entries alone are past half the limit; otherwise tombstones were the problem
+        if self._size > self.max_load * capacity / 2:
+            capacity *= 2
+        self._rehash(capacity)
+
+    def _rehash(self, capacity: int):
+        old_keys, old_values = self._keys, self._values
+        self._reset(max(capacity, self._min_capacity))
+        keys, values, mask, shift = self._keys, self._values, self._mask, self._shift
+        size = 0
+        for key, value in zip(old_keys, old_values):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            index = ((hash(key) * _GOLDEN) & _MASK_64) >> shift
+            while keys[index] is not _EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = value
+            size += 1
+        self._size = size
+        self._resizes += 1
+        log.debug("HASH TABLE RESIZE: %d entries rehashed into %d slots (load %.2f)",
+                  size, self.capacity, self.load_factor)
+
+    def probe_stats(self) -> Dict[str, float]:
+        """Measure the current layout.
+
+        avg_probe/max_probe: slots inspected to find each stored key;
+        avg_miss_probe: slots inspected by a lookup for an absent key,
+        averaged over every home slot.
+        """
+        keys, mask, capacity = self._keys, self._mask, self.capacity
+        total_probe = max_probe = 0
+        for index, key in enumerate(keys):
+            if key is _EMPTY or key is _DELETED:
+                continue
+            probe = ((index - self._home(key)) & mask) + 1
+            total_probe += probe
+            if probe > max_probe:
+                max_probe = probe
+
+        # A miss starting at slot i scans to the next empty slot; walk backwards
+        # from an empty slot so each distance is computed once
+        total_miss = 0
+        if self._size + self._tombstones < capacity:
+            start = keys.index(_EMPTY)
+            run = 0
+            for step in range(capacity):
+                index = (start - step) & mask
+                run = 0 if keys[index] is _EMPTY else run + 1
+                total_miss += run + 1
+
+        return {
+            "size": self._size,
+            "capacity": capacity,
+            "load_factor": self.load_factor,
+            "tombstones": self._tombstones,
+            "resizes": self._resizes,
+            "avg_probe": total_probe / self._size if self._size else 0.0,
+            "max_probe": max_probe,
+            "avg_miss_probe": total_miss / capacity,
+        }
+
+    def __repr__(self):
+        return f"OpenAddressingTable({len(self)} entries, capacity {self.capacity})"
+
+
+class _Values(ValuesView):
+    def __iter__(self):
+        return self._mapping._iter_values()
+
+
+class _Items(ItemsView):
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+def _power_of_two(n: int) -> int:
+    capacity = 1
+    while capacity < n:
+        capacity *= 2
+    return capacity
+
+
+# Test functionality with verbose output
+if __name__ == "__main__":
+    print("=" * 60)
+    print("OPEN ADDRESSING DEMONSTRATION: Linear probing with tombstones")
+    print("=" * 60)
+
+    table = OpenAddressingTable()
+    for song_id in range(1, 21):
+        table[song_id] = f"Song {song_id}"
+    print(f"After 20 inserts: {table} -> {table.probe_stats()}")
+
+    for song_id in range(1, 21, 2):
+        del table[song_id]
+    print(f"After 10 deletes: {table} -> {table.probe_stats()}")
+
+    table.compact()
+    print(f"After compact():  {table} -> {table.probe_stats()}")
@@ -1,118 +1,297 @@
-from collections import deque
 from src.model.song import Song
-from typing import Optional
+from src.utils.logger import get_logger
+from typing import Callable, Iterable, List, Optional, Tuple
+import logging
+
+log = get_logger("queue")
+
+# Songs per transaction when process_queue reports progress or can be cancelled
+PROGRESS_CHUNK_SIZE = 1000
+
+def _queue_key(song: Song):
+    """Key a queued song by its id; songs not saved yet (id None) are keyed by the object itself"""
+    return song.id if song.id is not None else song
+
+
+class _QueueNode:
+    __slots__ = ("song", "key", "prev", "next")
+
+    def __init__(self, song: Optional[Song], key=None):
+        self.song = song
+        self.key = key
+        self.prev = self
+        self.next = self
+
+
+class IndexedSongList:
+    """Doubly linked list of songs with a hash index from song key to node.
+
+    Supports the deque operations SongQueue uses (append, appendleft,
+    popleft, extendleft, len, iteration, indexing the ends) plus O(1)
+    removal and moves of any song by key. A song key is only ever in the
+    list once: adding a song that is already queued is a no-op.
+    """
+
+    def __init__(self, songs: Iterable[Song] = ()):
+        self._head = _QueueNode(None)  # sentinel: head.next is the front, head.prev the back
+        self.nodes = {}
+        for song in songs:
+            self.append(song)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __bool__(self):
+        return bool(self.nodes)
+
+    def __contains__(self, key):
+        return key in self.nodes
+
+    def __iter__(self):
+        node = self._head.next
+        while node is not self._head:
+            yield node.song
+            node = node.next
+
+    def __getitem__(self, index: int) -> Song:
+        """Index from either end; O(min(index, n - index)), O(1) for the ends"""
+        size = len(self.nodes)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("queue index out of range")
+        if index <= size // 2:
+            node = self._head.next
+            for _ in range(index):
+                node = node.next
+        else:
+            node = self._head.prev
+            for _ in range(size - 1 - index):
+                node = node.prev
+        return node.song
+
+    def append(self, song: Song) -> bool:
+        return self._add(song, self._head.prev)
+
+    def appendleft(self, song: Song) -> bool:
+        return self._add(song, self._head)
+
+    def extendleft(self, songs: Iterable[Song]):
+        """Like deque.extendleft: each song goes to the front, so the order is reversed"""
+        for song in songs:
+            self.appendleft(song)
+
+    def popleft(self) -> Song:
+        if not self.nodes:
+            raise IndexError("pop from an empty queue")
+        node = self._head.next
+        self._unlink(node)
+        del self.nodes[node.key]
+        return node.song
+
+    def remove(self, key) -> Optional[Song]:
+        node = self.nodes.pop(key, None)
+        if node is None:
+            return None
+        self._unlink(node)
+        return node.song
+
+    def move_after(self, key, anchor_key=None) -> bool:
+        """Move a song right after anchor_key (to the front when anchor_key is None)"""
+        node = self.nodes.get(key)
+        if node is None:
+            return False
+        if anchor_key is None:
+            anchor = self._head
+        else:
+            anchor = self.nodes.get(anchor_key)
+            if anchor is None:
+                return False
+        if anchor is node or anchor.next is node:
+            return True
+        self._unlink(node)
+        self._link_after(node, anchor)
+        return True
+
+    def clear(self):
+        self._head.prev = self._head.next = self._head
+        self.nodes.clear()
+
+    def _add(self, song: Song, after: _QueueNode) -> bool:
+        key = _queue_key(song)
+        if key in self.nodes:
+            return False
+        node = self.nodes[key] = _QueueNode(song, key)
+        self._link_after(node, after)
+        return True
+
+    @staticmethod
+    def _link_after(node: _QueueNode, after: _QueueNode):
+        node.prev = after
+        node.next = after.next
+        after.next.prev = node
+        after.next = node
+
+    @staticmethod
+    def _unlink(node: _QueueNode):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.prev = node.next = node
+
 
 class SongQueue:
     def __init__(self):
-        self.queue = deque()
+        self.queue = IndexedSongList()
         self.total_enqueued = 0
         self.total_dequeued = 0
-        print("QUEUE: Initialized empty song queue (FIFO - First In, First Out)")
+        log.debug("QUEUE: Initialized empty song queue (FIFO - First In, First Out)")
         self._print_queue_status()
 
-    def enqueue_song(self, song: Song):
-        """Add song to the queue (FIFO) with verbose logging"""
-        print(f"\nQUEUE ENQUEUE: Adding '{song.title}' by {song.artist}")
-        
-        # Show queue state before
-        print(f"QUEUE: Queue size before enqueue: {len(self.queue)}")
-        if self.queue:
-            print(f"QUEUE: Current front of queue: '{self.queue[0].title}'")
-            print(f"QUEUE: Current back of queue: '{self.queue[-1].title}'")
-        else:
-            print("QUEUE: Queue is currently empty")
+    def enqueue_song(self, song: Song) -> bool:
+        """Add song to the queue (FIFO) with verbose logging.
+
+        Returns False (and leaves the queue unchanged) if the song is
+        already queued.
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nQUEUE ENQUEUE: Adding '%s' by %s", song.title, song.artist)
+
+            # Show queue state before
+            log.debug("QUEUE: Queue size before enqueue: %d", len(self.queue))
+            if self.queue:
+                log.debug("QUEUE: Current front of queue: '%s'", self.queue[0].title)
+                log.debug("QUEUE: Current back of queue: '%s'", self.queue[-1].title)
+            else:
+                log.debug("QUEUE: Queue is currently empty")
         
         # Perform enqueue
-        self.queue.append(song)
+        if not self.queue.append(song):
+            log.debug("QUEUE: '%s' is already queued - not added again", song.title)
+            return False
         self.total_enqueued += 1
         
-        print(f"QUEUE: Song added to BACK of queue (position {len(self.queue)})")
-        print(f"QUEUE: Queue size after enqueue: {len(self.queue)}")
-        print(f"QUEUE: Total songs enqueued so far: {self.total_enqueued}")
-        
-        self._print_queue_contents()
-        self._print_queue_status()
+        if trace:
+            log.debug("QUEUE: Song added to BACK of queue (position %d)", len(self.queue))
+            log.debug("QUEUE: Queue size after enqueue: %d", len(self.queue))
+            log.debug("QUEUE: Total songs enqueued so far: %d", self.total_enqueued)
+
+            self._print_queue_contents()
+            self._print_queue_status()
+        return True
 
     def dequeue_song(self) -> Optional[Song]:
         """Remove and return the next song from queue with verbose logging"""
-        print(f"\nQUEUE DEQUEUE: Attempting to remove song from FRONT of queue")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nQUEUE DEQUEUE: Attempting to remove song from FRONT of queue")
         
         if not self.queue:
-            print("QUEUE: Cannot dequeue - Queue is EMPTY!")
+            log.debug("QUEUE: Cannot dequeue - Queue is EMPTY!")
             return None
         
-        # Show queue state before
-        print(f"QUEUE: Queue size before dequeue: {len(self.queue)}")
-        front_song = self.queue[0]
-        print(f"QUEUE: Song at FRONT (to be removed): '{front_song.title}'")
-        
-        if len(self.queue) > 1:
-            print(f"QUEUE: Next song in line: '{self.queue[1].title}'")
-        else:
-            print("QUEUE: This is the last song in queue")
+        if trace:
+            # Show queue state before
+            log.debug("QUEUE: Queue size before dequeue: %d", len(self.queue))
+            log.debug("QUEUE: Song at FRONT (to be removed): '%s'", self.queue[0].title)
+
+            if len(self.queue) > 1:
+                log.debug("QUEUE: Next song in line: '%s'", self.queue[1].title)
+            else:
+                log.debug("QUEUE: This is the last song in queue")
         
         # Perform dequeue - FIFO operation
         song = self.queue.popleft()
         self.total_dequeued += 1
         
-        print(f"QUEUE: Successfully dequeued: '{song.title}' by {song.artist}")
-        print(f"QUEUE: Queue size after dequeue: {len(self.queue)}")
-        print(f"QUEUE: Total songs dequeued so far: {self.total_dequeued}")
-        
-        if self.queue:
-            print(f"QUEUE: New front of queue: '{self.queue[0].title}'")
-        else:
-            print("QUEUE: Queue is now EMPTY")
-        
-        self._print_queue_contents()
-        self._print_queue_status()
+        if trace:
+            log.debug("QUEUE: Successfully dequeued: '%s' by %s", song.title, song.artist)
+            log.debug("QUEUE: Queue size after dequeue: %d", len(self.queue))
+            log.debug("QUEUE: Total songs dequeued so far: %d", self.total_dequeued)
+
+            if self.queue:
+                log.debug("QUEUE: New front of queue: '%s'", self.queue[0].title)
+            else:
+                log.debug("QUEUE: Queue is now EMPTY")
+
+            self._print_queue_contents()
+            self._print_queue_status()
         
         return song
 
     def peek_next(self) -> Optional[Song]:
         """View the next song without removing it with verbose logging"""
-        print(f"\nQUEUE PEEK: Checking front of queue without removing")
+        log.debug("\nQUEUE PEEK: Checking front of queue without removing")
         
         if self.queue:
             front_song = self.queue[0]
-            print(f"QUEUE: Front song: '{front_song.title}' by {front_song.artist}")
-            print(f"QUEUE: This song will be next to dequeue")
-            print(f"QUEUE: Position in queue: 1 (front)")
+            log.debug("QUEUE: Front song: '%s' by %s", front_song.title, front_song.artist)
+            log.debug("QUEUE: This song will be next to dequeue")
+            log.debug("QUEUE: Position in queue: 1 (front)")
             return front_song
         else:
-            print("QUEUE: Queue is empty - nothing to peek")
+            log.debug("QUEUE: Queue is empty - nothing to peek")
             return None
 
+    def contains(self, song_id) -> bool:
+        """Check whether a song is queued (unsaved songs are looked up by the Song itself)"""
+        return song_id in self.queue
+
+    def remove(self, song_id) -> Optional[Song]:
+        """Take a song out of the queue wherever it is, in O(1)"""
+        song = self.queue.remove(song_id)
+        if song is None:
+            log.debug("QUEUE REMOVE: Song %s is not queued", song_id)
+            return None
+        log.debug("QUEUE REMOVE: Removed '%s' (%d songs left)", song.title, len(self.queue))
+        self._print_queue_contents()
+        return song
+
+    def move_to_front(self, song_id) -> bool:
+        """Make a queued song the next one to dequeue, in O(1)"""
+        moved = self.queue.move_after(song_id)
+        log.debug("QUEUE MOVE: Song %s %s", song_id, "moved to FRONT" if moved else "is not queued")
+        self._print_queue_contents()
+        return moved
+
+    def move_after(self, song_id, anchor_id) -> bool:
+        """Move a queued song to just after another queued song, in O(1)"""
+        moved = self.queue.move_after(song_id, anchor_id)
+        log.debug("QUEUE MOVE: Song %s %s song %s", song_id,
+                  "moved after" if moved else "could not be moved after", anchor_id)
+        self._print_queue_contents()
+        return moved
+
     def get_queue_size(self) -> int:
         """Return the number of songs in queue with verbose logging"""
         size = len(self.queue)
-        print(f"QUEUE SIZE: Current queue contains {size} songs")
+        log.debug("QUEUE SIZE: Current queue contains %d songs", size)
         if size > 0:
-            print(f"QUEUE SIZE: Songs waiting to be processed: {size}")
-            print(f"QUEUE SIZE: Estimated processing time: {size * 2} seconds")
+            log.debug("QUEUE SIZE: Songs waiting to be processed: %d", size)
+            log.debug("QUEUE SIZE: Estimated processing time: %d seconds", size * 2)
         return size
 
     def is_empty(self) -> bool:
         """Check if queue is empty with verbose logging"""
         empty = len(self.queue) == 0
-        print(f"QUEUE EMPTY CHECK: Queue is {'EMPTY' if empty else 'NOT EMPTY'}")
+        log.debug("QUEUE EMPTY CHECK: Queue is %s", "EMPTY" if empty else "NOT EMPTY")
         if not empty:
-            print(f"QUEUE EMPTY CHECK: {len(self.queue)} songs still in queue")
+            log.debug("QUEUE EMPTY CHECK: %d songs still in queue", len(self.queue))
         return empty
 
     def clear_queue(self):
         """Remove all songs from queue with verbose logging"""
-        print(f"\nQUEUE CLEAR: Removing all {len(self.queue)} songs from queue")
+        log.debug("\nQUEUE CLEAR: Removing all %d songs from queue", len(self.queue))
         
-        if self.queue:
-            print("QUEUE CLEAR: Songs being cleared:")
+        if self.queue and log.isEnabledFor(logging.DEBUG):
+            log.debug("QUEUE CLEAR: Songs being cleared:")
             for i, song in enumerate(self.queue, 1):
-                print(f"   {i}. {song.title} - {song.artist}")
+                log.debug("   %d. %s - %s", i, song.title, song.artist)
         
         cleared_count = len(self.queue)
         self.queue.clear()
-        print(f"QUEUE CLEAR: Successfully cleared {cleared_count} songs")
-        print("QUEUE CLEAR: Queue is now empty")
+        log.debug("QUEUE CLEAR: Successfully cleared %d songs", cleared_count)
+        log.debug("QUEUE CLEAR: Queue is now empty")
         self._print_queue_status()
 
     def view_queue(self):
@@ -133,80 +312,326 @@ class SongQueue:
         else:
             print("QUEUE VIEW: Queue is empty - no songs to display")
 
-    def process_queue(self):
-        """Insert all songs in queue to database and clear queue with verbose logging"""
-        print(f"\nQUEUE PROCESS: Starting batch processing of {len(self.queue)} songs")
+
+    def process_queue(self, chunk_size: Optional[int] = None,
+                      progress: Optional[Callable[[int, int], None]] = None,
+                      should_stop: Optional[Callable[[], bool]] = None) -> List[Tuple[Song, str]]:
+        """Insert all songs in queue to database in one batch and clear queue.
+
+        Songs go to the database through insert_songs_bulk (a single
+        transaction, chunk_size rows per executemany). Returns the songs
+        that could not be inserted together with the error for each.
+
+        For long runs pass progress and/or should_stop: songs are then
+        committed chunk by chunk, progress(done, total) is called after each
+        chunk, and when should_stop() returns True the songs not yet
+        inserted go back to the front of the queue. A background task should
+        not call this (the queue is not thread-safe): see take_all below.
+        """
+        trace = log.isEnabledFor(logging.DEBUG)
+        log.debug("\nQUEUE PROCESS: Starting batch processing of %d songs", len(self.queue))
         
         if not self.queue:
-            print("QUEUE PROCESS: No songs to process - queue is empty")
-            return
+            log.debug("QUEUE PROCESS: No songs to process - queue is empty")
+            return []
 
-        songs_to_process = list(self.queue)  # Create copy for logging
-        print("QUEUE PROCESS: Songs to be processed (in FIFO order):")
-        for i, song in enumerate(songs_to_process, 1):
-            print(f"   {i}. {song.title} - {song.artist}")
+        if trace:
+            log.debug("QUEUE PROCESS: Songs to be processed (in FIFO order):")
+            for i, song in enumerate(self.queue, 1):
+                log.debug("   %d. %s - %s", i, song.title, song.artist)
 
         # Import here to avoid circular imports
         try:
-            from src.db.database import insert_song_to_db
-            songs_processed = 0
-            failed_songs = []
-
-            print("\nQUEUE PROCESS: Beginning database insertion process...")
-            print("QUEUE PROCESS: Processing songs in FIFO order (first enqueued = first processed)")
-            
-            while not self.is_empty():
-                song = self.dequeue_song()
-                print(f"\nQUEUE PROCESS: Processing song #{songs_processed + 1}: {song.title}")
-                print(f"QUEUE PROCESS: Attempting database insertion...")
-                
-                if insert_song_to_db(song):
-                    songs_processed += 1
-                    print(f"QUEUE PROCESS: Successfully inserted '{song.title}' to database")
-                else:
-                    failed_songs.append(song)
-                    print(f"QUEUE PROCESS: Failed to insert '{song.title}' to database")
-
-            print(f"\nQUEUE PROCESS COMPLETE:")
-            print(f"   Successfully processed: {songs_processed} songs")
-            print(f"   Failed to process: {len(failed_songs)} songs")
-            print(f"   Processing efficiency: {(songs_processed/(songs_processed + len(failed_songs)))*100:.1f}%")
-            
-            if failed_songs:
-                print("   Failed songs:")
-                for song in failed_songs:
-                    print(f"     - {song.title} - {song.artist}")
-            
-            print("QUEUE PROCESS: All songs have been dequeued from queue")
-            self._print_queue_status()
-            
+            self._get_batch_inserter()
         except ImportError:
-            print("QUEUE PROCESS: Database module not available - clearing queue without saving")
-            print("QUEUE PROCESS: Simulating processing by clearing queue...")
-            processed_songs = list(self.queue)
+            log.warning("QUEUE PROCESS: Database module not available - clearing queue without saving")
+            log.debug("QUEUE PROCESS: Simulating processing by clearing queue...")
+            processed_count = len(self.queue)
             self.clear_queue()
-            print(f"QUEUE PROCESS: Simulated processing of {len(processed_songs)} songs")
+            log.debug("QUEUE PROCESS: Simulated processing of %d songs", processed_count)
+            return []
+
+        songs = self.take_all()
+        _, failed_songs, not_attempted = self.insert_batch(songs, chunk_size, progress, should_stop)
+        self.requeue_front(not_attempted)
+        
+        log.debug("QUEUE PROCESS: All songs have been dequeued from queue")
+        self._print_queue_status()
+        return failed_songs
+
+    # process_queue in three steps, for callers that insert on a background thread.
+    # take_all and requeue_front change the queue, so they run on the thread that
+    # owns it; insert_batch only reads its songs list and may run on a worker.
+
+    def take_all(self) -> List[Song]:
+        """Dequeue every queued song at once, in FIFO order"""
+        songs = list(self.queue)
+        self.queue.clear()
+        self.total_dequeued += len(songs)
+        return songs
+
+    def requeue_front(self, songs: List[Song]):
+        """Put songs back at the front of the queue, keeping their order"""
+        if not songs:
+            return
+        self.queue.extendleft(reversed(songs))
+        self.total_dequeued -= len(songs)
+        log.info("QUEUE PROCESS: %d songs returned to the queue", len(songs))
+
+    def insert_batch(self, songs: List[Song], chunk_size: Optional[int] = None,
+                     progress: Optional[Callable[[int, int], None]] = None,
+                     should_stop: Optional[Callable[[], bool]] = None
+                     ) -> Tuple[int, List[Tuple[Song, str]], List[Song]]:
+        """Insert songs taken with take_all() into the database; the queue itself is not touched.
+
+        Returns (inserted_count, [(failed_song, error), ...], songs not
+        attempted because should_stop() returned True).
+        """
+        try:
+            insert_batch = self._get_batch_inserter()
+        except ImportError:
+            log.warning("QUEUE PROCESS: Database module not available - songs not saved")
+            return 0, [], []
+
+        log.debug("\nQUEUE PROCESS: Beginning database insertion process...")
+        log.debug("QUEUE PROCESS: Inserting %d songs in FIFO order as one batch", len(songs))
+
+        not_attempted = []
+        if progress is not None or should_stop is not None:
+            songs_processed, failed_songs, not_attempted = self._insert_in_chunks(
+                insert_batch, songs, chunk_size or PROGRESS_CHUNK_SIZE, progress, should_stop)
+        elif chunk_size is None:
+            songs_processed, failed_songs = insert_batch(songs)
+        else:
+            songs_processed, failed_songs = insert_batch(songs, chunk_size)
+
+        log.info("\nQUEUE PROCESS COMPLETE:")
+        log.info("   Successfully processed: %d songs", songs_processed)
+        log.info("   Failed to process: %d songs", len(failed_songs))
+        log.info("   Processing efficiency: %.1f%%", (songs_processed / max(len(songs), 1)) * 100)
+        
+        if failed_songs:
+            log.warning("   Failed songs:")
+            for song, error in failed_songs:
+                log.warning("     - %s - %s (%s)", song.title, song.artist, error)
+        return songs_processed, failed_songs, not_attempted
+
+    @staticmethod
+    def _insert_in_chunks(insert_batch, songs: List[Song], chunk_size: int,
+                          progress: Optional[Callable[[int, int], None]],
+                          should_stop: Optional[Callable[[], bool]]
+                          ) -> Tuple[int, List[Tuple[Song, str]], List[Song]]:
+        """Insert songs one committed chunk at a time, reporting progress and honouring should_stop"""
+        songs_processed = 0
+        failed_songs = []
+        for start in range(0, len(songs), chunk_size):
+            if should_stop is not None and should_stop():
+                log.info("QUEUE PROCESS: Stopped early - %d songs not inserted", len(songs) - start)
+                return songs_processed, failed_songs, songs[start:]
+
+            inserted, failed = insert_batch(songs[start:start + chunk_size], chunk_size)
+            songs_processed += inserted
+            failed_songs.extend(failed)
+            if progress is not None:
+                progress(min(start + chunk_size, len(songs)), len(songs))
+        return songs_processed, failed_songs, []
+
+    @staticmethod
+    def _get_batch_inserter():
+        """Return the database bulk insert, falling back to one insert per song"""
+        try:
+            from src.db.database import insert_songs_bulk
+            return insert_songs_bulk
+        except ImportError:
+            from src.db.database import insert_song_to_db
+
+        def insert_one_by_one(songs, chunk_size=None):
+            failed = [(song, "insert failed") for song in songs if not insert_song_to_db(song)]
+            return len(songs) - len(failed), failed
+
+        return insert_one_by_one
 
     def _print_queue_contents(self):
-        """Internal method to print current queue contents"""
+        """Internal method to log current queue contents"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
         if not self.queue:
-            print("QUEUE STATE: []")
+            log.debug("QUEUE STATE: []")
             return
             
         if len(self.queue) <= 5:
             queue_display = " -> ".join([f"'{song.title}'" for song in self.queue])
-            print(f"QUEUE STATE: [FRONT: {queue_display} :BACK]")
+            log.debug("QUEUE STATE: [FRONT: %s :BACK]", queue_display)
         else:
-            front_songs = [f"'{song.title}'" for song in list(self.queue)[:2]]
-            back_songs = [f"'{song.title}'" for song in list(self.queue)[-2:]]
-            print(f"QUEUE STATE: [FRONT: {' -> '.join(front_songs)} -> ... -> {' -> '.join(back_songs)} :BACK]")
+            # Index the ends directly instead of walking the whole list
+            front_songs = [f"'{self.queue[i].title}'" for i in (0, 1)]
+            back_songs = [f"'{self.queue[i].title}'" for i in (-2, -1)]
+            log.debug("QUEUE STATE: [FRONT: %s -> ... -> %s :BACK]",
+                      " -> ".join(front_songs), " -> ".join(back_songs))
 
     def _print_queue_status(self):
-        """Internal method to print queue statistics"""
-        print(f"QUEUE STATS: Size={len(self.queue)}, Total Enqueued={self.total_enqueued}, Total Dequeued={self.total_dequeued}")
+        """Internal method to log queue statistics"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        log.debug("QUEUE STATS: Size=%d, Total Enqueued=%d, Total Dequeued=%d",
+                  len(self.queue), self.total_enqueued, self.total_dequeued)
         if self.total_enqueued > 0:
             efficiency = (self.total_dequeued / self.total_enqueued) * 100
-            print(f"QUEUE STATS: Processing Efficiency={efficiency:.1f}%")
+            log.debug("QUEUE STATS: Processing Efficiency=%.1f%%", efficiency)
+
+
+class PrioritySongQueue:
+    """Play queue ordered by priority, backed by a binary min-heap.
+
+    Lower priority values play first; songs with equal priority keep their
+    enqueue order. Heap entries are [priority, sequence, key, song] and
+    self.position maps each song's key to its index in the heap, so a
+    queued song can be found in O(1) and reprioritized or removed in
+    O(log n) by sifting it up or down from where it is.
+    """
+
+    def __init__(self):
+        self.heap: List[list] = []
+        self.position = {}
+        self._sequence = 0
+        self.total_enqueued = 0
+        self.total_dequeued = 0
+        log.debug("PRIORITY QUEUE: Initialized empty binary heap (lowest priority value plays first)")
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, song_id):
+        return song_id in self.position
+
+    def enqueue_song(self, song: Song, priority: int = 0):
+        """Add a song with a priority; a song already queued is just reprioritized"""
+        key = _queue_key(song)
+        if key in self.position:
+            self.reprioritize(key, priority)
+            return
+
+        self.heap.append([priority, self._sequence, key, song])
+        self._sequence += 1
+        self.position[key] = len(self.heap) - 1
+        self._sift_up(len(self.heap) - 1)
+        self.total_enqueued += 1
+        log.debug("PRIORITY QUEUE: Enqueued '%s' with priority %s (size %d)", song.title, priority, len(self.heap))
+
+    def dequeue_song(self) -> Optional[Song]:
+        """Remove and return the song with the lowest priority value"""
+        if not self.heap:
+            log.debug("PRIORITY QUEUE: Cannot dequeue - queue is EMPTY!")
+            return None
+        song = self._remove_at(0)
+        self.total_dequeued += 1
+        log.debug("PRIORITY QUEUE: Dequeued '%s' (size %d)", song.title, len(self.heap))
+        return song
+
+    def peek_next(self) -> Optional[Song]:
+        """Return the song that plays next without removing it"""
+        return self.heap[0][3] if self.heap else None
+
+    def priority_of(self, song_id) -> Optional[int]:
+        index = self.position.get(song_id)
+        return self.heap[index][0] if index is not None else None
+
+    def reprioritize(self, song_id, priority) -> bool:
+        """Change the priority of a queued song (decrease or increase); False if it is not queued"""
+        index = self.position.get(song_id)
+        if index is None:
+            log.debug("PRIORITY QUEUE: Song %s is not queued - nothing to reprioritize", song_id)
+            return False
+
+        entry = self.heap[index]
+        old_priority = entry[0]
+        entry[0] = priority
+        if priority < old_priority:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+        log.debug("PRIORITY QUEUE: Song %s priority %s -> %s", song_id, old_priority, priority)
+        return True
+
+    def remove(self, song_id) -> Optional[Song]:
+        """Remove a queued song from anywhere in the heap"""
+        index = self.position.get(song_id)
+        if index is None:
+            log.debug("PRIORITY QUEUE: Song %s is not queued - nothing to remove", song_id)
+            return None
+        song = self._remove_at(index)
+        log.debug("PRIORITY QUEUE: Removed '%s' (size %d)", song.title, len(self.heap))
+        return song
+
+    def get_queue_size(self) -> int:
+        return len(self.heap)
+
+    def is_empty(self) -> bool:
+        return not self.heap
+
+    def clear_queue(self):
+        self.heap.clear()
+        self.position.clear()
+        log.debug("PRIORITY QUEUE: Cleared")
+
+    def songs_in_order(self) -> List[Song]:
+        """Queued songs in play order, without emptying the queue"""
+        return [entry[3] for entry in sorted(self.heap, key=lambda entry: (entry[0], entry[1]))]
+
+    def _remove_at(self, index: int) -> Song:
+        entry = self.heap[index]
+        del self.position[entry[2]]
+        last = self.heap.pop()
+        if index < len(self.heap):
+            # Fill the hole with the last entry and restore the heap property around it
+            self.heap[index] = last
+            self.position[last[2]] = index
+            if (last[0], last[1]) < (entry[0], entry[1]):
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+        return entry[3]
+
+    def _sift_up(self, index: int):
+        heap, position = self.heap, self.position
+        entry = heap[index]
+        rank = (entry[0], entry[1])
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if rank >= (parent[0], parent[1]):
+                break
+            heap[index] = parent
+            position[parent[2]] = index
+            index = parent_index
+        heap[index] = entry
+        position[entry[2]] = index
+
+    def _sift_down(self, index: int):
+        heap, position = self.heap, self.position
+        size = len(heap)
+        entry = heap[index]
+        rank = (entry[0], entry[1])
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            child = heap[child_index]
+            right_index = child_index + 1
+            if right_index < size:
+                right = heap[right_index]
+                if (right[0], right[1]) < (child[0], child[1]):
+                    child_index, child = right_index, right
+            if rank <= (child[0], child[1]):
+                break
+            heap[index] = child
+            position[child[2]] = index
+            index = child_index
+        heap[index] = entry
+        position[entry[2]] = index
+
 
 # Test functionality with verbose output
 if __name__ == "__main__":
@@ -1,121 +1,211 @@
 from src.model.song import Song
-from typing import Optional, List
+from src.ds.events import ChangeNotifier, ADDED, REMOVED
+from src.utils.logger import get_logger
+from typing import Iterable, Iterator, List, Optional
+import logging
+import sys
+
+log = get_logger("stack")
+
+# Areas of the deleted_songs log: songs still in the undo session, and flushed history
+SESSION = "session"
+HISTORY = "history"
+
+# Songs read back from the log at a time once the in-memory part of the session runs out
+DEFAULT_PAGE_SIZE = 100
+
+
+def _song_bytes(song: Song) -> int:
+    """Approximate memory held by a song: the object plus its strings"""
+    return sys.getsizeof(song) + sum(sys.getsizeof(value) for value in
+                                     (song.title, song.artist, song.album, song.file_path, song.genre))
+
 
 class DeleteStack:
-    def __init__(self):
+    """Undo stack of deleted songs plus the history of flushed deletions.
+
+    By default both live in memory without a limit. With max_depth (songs)
+    and/or max_bytes set, each of them keeps only its newest songs in
+    memory: when one goes over budget its oldest half is appended to the
+    deleted_songs table, and the stack reads spilled songs back a page at a
+    time as pops empty the in-memory part. Spilled songs survive a restart
+    and a bounded stack picks them up again (persist() writes out the
+    in-memory part on exit), so a long session runs in constant memory
+    without losing its undo history.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, max_bytes: Optional[int] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE):
         self.stack = []
         self.total_pushes = 0
         self.total_pops = 0
         self.total_permanent_deletes = 0
         self.max_size_reached = 0
         self.deleted_songs_history = []  # Track all permanently deleted songs
-        print("STACK: Initialized delete stack with flush session capability")
-        print("STACK: Functions as a staging area before permanent database deletion")
+        # Subscribers get REMOVED on delete and ADDED on restore
+        self.changes = ChangeNotifier()
+
+        self.max_depth = max_depth
+        self.max_bytes = max_bytes
+        self.page_size = page_size
+        self.spilled = {SESSION: 0, HISTORY: 0}  # songs of each area held in the deleted_songs table
+        self._memory_bytes = {SESSION: 0, HISTORY: 0}
+        if self.bounded:
+            for area in (SESSION, HISTORY):
+                self.spilled[area] = self._count_spilled(area)
+            if self.spilled[SESSION]:
+                log.info("STACK: Resuming delete session with %d songs from the on-disk log", self.spilled[SESSION])
+        log.debug("STACK: Initialized delete stack with flush session capability")
+        log.debug("STACK: Functions as a staging area before permanent database deletion")
         self._print_stack_status()
     
     def push_song(self, song: Song):
         """Add a deleted song to the stack and remove from database immediately"""
-        print(f"\nSTACK PUSH: Adding '{song.title}' by {song.artist} to delete stack")
-        
-        # Show stack state before push
-        print(f"STACK: Stack size before push: {len(self.stack)}")
-        if self.stack:
-            print(f"STACK: Current top of stack: '{self.stack[-1].title}'")
-        else:
-            print("STACK: Stack is currently empty")
-        
-        # IMMEDIATE DATABASE DELETION - This is the key change
-        print(f"DATABASE DELETE: Immediately removing '{song.title}' from database...")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nSTACK PUSH: Adding '%s' by %s to delete stack", song.title, song.artist)
+
+            # Show stack state before push
+            log.debug("STACK: Stack size before push: %d", len(self.stack))
+            if self.stack:
+                log.debug("STACK: Current top of stack: '%s'", self.stack[-1].title)
+            else:
+                log.debug("STACK: Stack is currently empty")
+
+            # IMMEDIATE DATABASE DELETION - This is the key change
+            log.debug("DATABASE DELETE: Immediately removing '%s' from database...", song.title)
         try:
             from src.db.database import delete_song_from_db
             
             if delete_song_from_db(song.id):
-                print(f"DATABASE DELETE: Successfully removed '{song.title}' from database")
-                
-                # Add to stack for tracking and potential restoration
-                self.stack.append(song)
-                self.total_pushes += 1
-                
-                # Update maximum size tracking
-                if len(self.stack) > self.max_size_reached:
-                    self.max_size_reached = len(self.stack)
-                
-                print(f"STACK PUSH: Song added to delete stack for session tracking")
-                print(f"STACK: Stack size after push: {len(self.stack)}")
-                print(f"STACK: Total songs in delete session: {self.total_pushes}")
-                
-                self._print_stack_contents()
-                self._print_stack_status()
+                log.debug("DATABASE DELETE: Successfully removed '%s' from database", song.title)
+                self.push_deleted(song)
                 return True
             else:
-                print(f"DATABASE DELETE: Failed to remove '{song.title}' from database")
-                print(f"STACK: Song NOT added to delete stack due to database error")
+                log.warning("DATABASE DELETE: Failed to remove '%s' from database", song.title)
+                log.warning("STACK: Song NOT added to delete stack due to database error")
                 return False
                 
         except ImportError:
-            print(f"DATABASE DELETE: Database module not available")
-            print(f"STACK: Adding to stack for simulation (no actual database deletion)")
+            log.warning("DATABASE DELETE: Database module not available")
+            log.debug("STACK: Adding to stack for simulation (no actual database deletion)")
             
             # Still add to stack for demonstration purposes
-            self.stack.append(song)
+            self._append(SESSION, song)
             self.total_pushes += 1
             
-            if len(self.stack) > self.max_size_reached:
-                self.max_size_reached = len(self.stack)
+            if self.session_size() > self.max_size_reached:
+                self.max_size_reached = self.session_size()
             
+            self.changes.emit(REMOVED, song)
             self._print_stack_contents()
             self._print_stack_status()
             return True
     
+    def push_deleted(self, song: Song):
+        """Push a song that has already been deleted from the database.
+
+        Lets a background task run the DELETE while the stack itself is
+        only changed on the thread that owns it.
+        """
+        # Add to stack for tracking and potential restoration
+        self._append(SESSION, song)
+        self.total_pushes += 1
+        
+        # Update maximum size tracking
+        if self.session_size() > self.max_size_reached:
+            self.max_size_reached = self.session_size()
+        
+        self.changes.emit(REMOVED, song)
+        
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("STACK PUSH: Song added to delete stack for session tracking")
+            log.debug("STACK: Stack size after push: %d", len(self.stack))
+            log.debug("STACK: Total songs in delete session: %d", self.total_pushes)
+
+            self._print_stack_contents()
+            self._print_stack_status()
+
+    def push_many(self, song_ids: Iterable[int]) -> List[Song]:
+        """Delete many songs from the database in one transaction and push them in order.
+
+        Returns the songs that were deleted (IDs not in the database are
+        skipped); the last one ends up on top of the stack.
+        """
+        try:
+            from src.db.database import delete_songs_from_db
+        except ImportError:
+            log.warning("DATABASE DELETE: Bulk delete not available")
+            return []
+
+        songs = delete_songs_from_db(song_ids)
+        for song in songs:
+            self._append(SESSION, song)
+            self.changes.emit(REMOVED, song)
+        self.total_pushes += len(songs)
+        if self.session_size() > self.max_size_reached:
+            self.max_size_reached = self.session_size()
+
+        log.debug("STACK PUSH MANY: Deleted and pushed %d songs (stack size %d)", len(songs), self.session_size())
+        self._print_stack_status()
+        return songs
+
     def pop_song(self) -> Optional[Song]:
         """Remove song from delete stack (for potential restoration)"""
-        print(f"\nSTACK POP: Attempting to remove song from TOP of delete stack")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nSTACK POP: Attempting to remove song from TOP of delete stack")
         
-        if not self.stack:
-            print("STACK POP: Cannot pop - Delete stack is EMPTY!")
+        if not self.stack and not self._page_in():
+            log.debug("STACK POP: Cannot pop - Delete stack is EMPTY!")
             return None
         
-        # Show stack state before pop
-        print(f"STACK: Stack size before pop: {len(self.stack)}")
-        top_song = self.stack[-1]
-        print(f"STACK: Song at TOP (to be removed from session): '{top_song.title}'")
+        if trace:
+            # Show stack state before pop
+            log.debug("STACK: Stack size before pop: %d", len(self.stack))
+            log.debug("STACK: Song at TOP (to be removed from session): '%s'", self.stack[-1].title)
         
         # Perform LIFO pop operation
-        popped_song = self.stack.pop()
+        popped_song = self._pop(SESSION)
         self.total_pops += 1
         
-        print(f"STACK POP: Removed '{popped_song.title}' from delete session")
-        print(f"STACK: Stack size after pop: {len(self.stack)}")
-        print(f"STACK: Note - Song was already deleted from database!")
-        
-        if self.stack:
-            print(f"STACK: New top of stack: '{self.stack[-1].title}'")
-        else:
-            print("STACK: Delete stack is now EMPTY")
-        
-        self._print_stack_contents()
-        self._print_stack_status()
+        if trace:
+            log.debug("STACK POP: Removed '%s' from delete session", popped_song.title)
+            log.debug("STACK: Stack size after pop: %d", len(self.stack))
+            log.debug("STACK: Note - Song was already deleted from database!")
+
+            if self.stack:
+                log.debug("STACK: New top of stack: '%s'", self.stack[-1].title)
+            else:
+                log.debug("STACK: Delete stack is now EMPTY")
+
+            self._print_stack_contents()
+            self._print_stack_status()
         
         return popped_song
     
     def flush_delete_session(self) -> List[Song]:
         """Flush the entire delete session - finalize all deletions using LIFO stack operations"""
-        print(f"\nSTACK FLUSH: Flushing delete session with {len(self.stack)} songs")
-        print("STACK FLUSH: This will finalize all deletions using LIFO (Last In, First Out) order")
-        print("STACK FLUSH: Songs will be permanently deleted in reverse order of deletion")
-        
-        if not self.stack:
-            print("STACK FLUSH: No songs in delete session to flush")
+        trace = log.isEnabledFor(logging.DEBUG)
+        if trace:
+            log.debug("\nSTACK FLUSH: Flushing delete session with %d songs", len(self.stack))
+            log.debug("STACK FLUSH: This will finalize all deletions using LIFO (Last In, First Out) order")
+            log.debug("STACK FLUSH: Songs will be permanently deleted in reverse order of deletion")
+        
+        if not self.stack and not self.spilled[SESSION]:
+            log.debug("STACK FLUSH: No songs in delete session to flush")
             return []
         
-        # Show songs before flushing
-        songs_to_flush = list(self.stack)  # Copy for return
+        if trace:
+            log.debug("STACK FLUSH: Songs to be permanently deleted (LIFO order):")
+            for i, song in enumerate(reversed(self.stack), 1):
+                log.debug("   %d. %s - %s (ID: %s) [Will be deleted #%d]", i, song.title, song.artist, song.id, i)
+
+            log.debug("\nSTACK FLUSH: Beginning LIFO flush process...")
         
-        print("STACK FLUSH: Songs to be permanently deleted (LIFO order):")
-        for i, song in enumerate(reversed(self.stack), 1):
-            print(f"   {i}. {song.title} - {song.artist} (ID: {song.id}) [Will be deleted #{i}]")
+        if self.spilled[SESSION]:
+            return self._flush_spilled_session()
         
-        print("\nSTACK FLUSH: Beginning LIFO flush process...")
         flushed_songs = []
         flush_count = 0
         
@@ -124,177 +214,429 @@ class DeleteStack:
             flush_count += 1
             
             # Pop from top of stack (LIFO)
-            song_to_flush = self.stack.pop()
+            song_to_flush = self._pop(SESSION)
             self.total_pops += 1
             
-            print(f"\nSTACK FLUSH #{flush_count}: Popping '{song_to_flush.title}' from top of stack")
-            print(f"STACK FLUSH: Stack size before pop: {len(self.stack) + 1}")
-            print(f"STACK FLUSH: Stack size after pop: {len(self.stack)}")
+            if trace:
+                log.debug("\nSTACK FLUSH #%d: Popping '%s' from top of stack", flush_count, song_to_flush.title)
+                log.debug("STACK FLUSH: Stack size before pop: %d", len(self.stack) + 1)
+                log.debug("STACK FLUSH: Stack size after pop: %d", len(self.stack))
             
             # Add to permanent delete history
             flushed_songs.append(song_to_flush)
-            self.deleted_songs_history.append(song_to_flush)
+            self._append(HISTORY, song_to_flush)
             self.total_permanent_deletes += 1
             
-            print(f"STACK FLUSH: '{song_to_flush.title}' moved to permanent deletion history")
-            
-            # Show remaining stack contents
-            if self.stack:
-                print(f"STACK FLUSH: Remaining in stack: {len(self.stack)} songs")
-                print(f"STACK FLUSH: Next to be flushed: '{self.stack[-1].title}' (top of stack)")
-            else:
-                print("STACK FLUSH: Stack is now empty - all songs flushed")
-        
-        print(f"\nSTACK FLUSH COMPLETE:")
-        print(f"STACK FLUSH: Successfully flushed {len(flushed_songs)} songs using LIFO order")
-        print(f"STACK FLUSH: Total permanent deletions (all-time): {self.total_permanent_deletes}")
-        print("STACK FLUSH: All songs moved to permanent deletion history")
-        print("STACK FLUSH: Delete session cleared - ready for new deletions")
-        
-        print("\nSTACK FLUSH: Final flush order (LIFO - Last In, First Out):")
-        for i, song in enumerate(flushed_songs, 1):
-            print(f"   Flush #{i}: {song.title} - {song.artist}")
-        
-        self._print_stack_status()
+            if trace:
+                log.debug("STACK FLUSH: '%s' moved to permanent deletion history", song_to_flush.title)
+
+                # Show remaining stack contents
+                if self.stack:
+                    log.debug("STACK FLUSH: Remaining in stack: %d songs", len(self.stack))
+                    log.debug("STACK FLUSH: Next to be flushed: '%s' (top of stack)", self.stack[-1].title)
+                else:
+                    log.debug("STACK FLUSH: Stack is now empty - all songs flushed")
+
+        if trace:
+            log.debug("\nSTACK FLUSH COMPLETE:")
+            log.debug("STACK FLUSH: Successfully flushed %d songs using LIFO order", len(flushed_songs))
+            log.debug("STACK FLUSH: Total permanent deletions (all-time): %d", self.total_permanent_deletes)
+            log.debug("STACK FLUSH: All songs moved to permanent deletion history")
+            log.debug("STACK FLUSH: Delete session cleared - ready for new deletions")
+
+            log.debug("\nSTACK FLUSH: Final flush order (LIFO - Last In, First Out):")
+            for i, song in enumerate(flushed_songs, 1):
+                log.debug("   Flush #%d: %s - %s", i, song.title, song.artist)
+
+            self._print_stack_status()
         
         return flushed_songs
     
+    def _flush_spilled_session(self) -> List[Song]:
+        """Flush a session whose older part is spilled, without loading it.
+
+        The in-memory history and session are written to the on-disk history
+        in the transaction that moves the spilled session there, so if it
+        fails the stack and the log are left as they were.
+        """
+        try:
+            from src.db.database import flush_deleted_session
+        except ImportError:
+            return []
+
+        # History stays in flush order: in-memory session newest first, then the spilled part
+        flushed_songs = list(reversed(self.stack))
+        written = len(self.deleted_songs_history) + len(flushed_songs)
+        moved = flush_deleted_session(self.deleted_songs_history + flushed_songs)
+        if moved is None:
+            log.warning("STACK FLUSH: Could not write the delete session to the on-disk history - nothing flushed")
+            return []
+
+        self.stack.clear()
+        self.deleted_songs_history.clear()
+        self._memory_bytes = {SESSION: 0, HISTORY: 0}
+        self.spilled[SESSION] = 0
+        self.spilled[HISTORY] += written + moved
+        self.total_pops += len(flushed_songs) + moved
+        self.total_permanent_deletes += len(flushed_songs) + moved
+        log.debug("STACK FLUSH: Moved %d in-memory and %d spilled songs to the on-disk history",
+                  len(flushed_songs), moved)
+        self._print_stack_status()
+        return flushed_songs
+
+    def persist(self) -> bool:
+        """Write the in-memory songs of a bounded stack to the on-disk log, e.g. on exit.
+
+        The next bounded stack then resumes the whole session and history.
+        An unbounded stack keeps nothing across restarts.
+        """
+        if not self.bounded:
+            return True
+        return self._spill(HISTORY, len(self.deleted_songs_history)) and self._spill(SESSION, len(self.stack))
+
+    def session_size(self) -> int:
+        """Songs in the current delete session, in memory and spilled"""
+        return len(self.stack) + self.spilled[SESSION]
+
+    def history_size(self) -> int:
+        """Permanently deleted songs, in memory and spilled"""
+        return len(self.deleted_songs_history) + self.spilled[HISTORY]
+
+    def iter_deleted_songs_history(self) -> Iterator[Song]:
+        """Yield the deletion history oldest first, paging spilled songs in lazily"""
+        yield from self._iter_spilled(HISTORY)
+        yield from list(self.deleted_songs_history)
+
+    def iter_current_delete_session(self) -> Iterator[Song]:
+        """Yield the current session bottom (oldest) to top, paging spilled songs in lazily"""
+        yield from self._iter_spilled(SESSION)
+        yield from list(self.stack)
+
     def get_deleted_songs_history(self) -> List[Song]:
         """Get complete history of all permanently deleted songs"""
-        print(f"\nSTACK HISTORY: Retrieving complete deletion history")
-        print(f"STACK HISTORY: Total permanently deleted songs: {len(self.deleted_songs_history)}")
-        
-        if self.deleted_songs_history:
-            print("STACK HISTORY: All permanently deleted songs:")
-            for i, song in enumerate(self.deleted_songs_history, 1):
-                print(f"   {i}. {song.title} - {song.artist} (ID: {song.id})")
-        else:
-            print("STACK HISTORY: No songs have been permanently deleted yet")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("\nSTACK HISTORY: Retrieving complete deletion history")
+            log.debug("STACK HISTORY: Total permanently deleted songs: %d", len(self.deleted_songs_history))
+
+            if self.deleted_songs_history:
+                log.debug("STACK HISTORY: All permanently deleted songs:")
+                for i, song in enumerate(self.deleted_songs_history, 1):
+                    log.debug("   %d. %s - %s (ID: %s)", i, song.title, song.artist, song.id)
+            else:
+                log.debug("STACK HISTORY: No songs have been permanently deleted yet")
         
+        if self.spilled[HISTORY]:
+            return list(self.iter_deleted_songs_history())
         return self.deleted_songs_history.copy()
     
     def get_current_delete_session(self) -> List[Song]:
         """Get songs in current delete session (not yet flushed)"""
-        print(f"\nSTACK SESSION: Current delete session contains {len(self.stack)} songs")
-        
-        if self.stack:
-            print("STACK SESSION: Songs in current session (LIFO order):")
-            for i, song in enumerate(reversed(self.stack), 1):
-                stack_position = len(self.stack) - i + 1
-                print(f"   {i}. [Position {stack_position}] {song.title} - {song.artist} (ID: {song.id})")
-        else:
-            print("STACK SESSION: Current delete session is empty")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("\nSTACK SESSION: Current delete session contains %d songs", len(self.stack))
+
+            if self.stack:
+                log.debug("STACK SESSION: Songs in current session (LIFO order):")
+                for i, song in enumerate(reversed(self.stack), 1):
+                    stack_position = len(self.stack) - i + 1
+                    log.debug("   %d. [Position %d] %s - %s (ID: %s)",
+                              i, stack_position, song.title, song.artist, song.id)
+            else:
+                log.debug("STACK SESSION: Current delete session is empty")
         
+        if self.spilled[SESSION]:
+            return list(self.iter_current_delete_session())
         return self.stack.copy()
     
     def peek(self) -> Optional[Song]:
         """Return the most recent song added to the stack without removing it"""
-        print(f"\nSTACK PEEK: Checking top of delete stack without removing")
+        log.debug("\nSTACK PEEK: Checking top of delete stack without removing")
         
-        if self.stack:
+        if self.stack or self._page_in():
             top_song = self.stack[-1]
-            print(f"STACK PEEK: Top song: '{top_song.title}' by {top_song.artist}")
-            print(f"STACK PEEK: This song was most recently deleted")
-            print(f"STACK PEEK: Stack position: {len(self.stack)} (top)")
+            log.debug("STACK PEEK: Top song: '%s' by %s", top_song.title, top_song.artist)
+            log.debug("STACK PEEK: This song was most recently deleted")
+            log.debug("STACK PEEK: Stack position: %d (top)", len(self.stack))
             return top_song
         else:
-            print("STACK PEEK: Delete stack is empty - no recent deletions")
+            log.debug("STACK PEEK: Delete stack is empty - no recent deletions")
             return None
     
     def is_empty(self) -> bool:
         """Return True if the delete stack has no songs"""
-        empty = len(self.stack) == 0
-        print(f"STACK EMPTY CHECK: Delete stack is {'EMPTY' if empty else 'NOT EMPTY'}")
+        empty = not self.stack and not self.spilled[SESSION]
+        log.debug("STACK EMPTY CHECK: Delete stack is %s", "EMPTY" if empty else "NOT EMPTY")
         if not empty:
-            print(f"STACK EMPTY CHECK: {len(self.stack)} songs in current delete session")
+            log.debug("STACK EMPTY CHECK: %d songs in current delete session", len(self.stack))
         return empty
     
+    def undo_pop(self, song: Song):
+        """Put a popped song back on top, e.g. when restoring it to the database failed"""
+        self._append(SESSION, song)
+        self.total_pops -= 1
+
+    def restore_many(self, count: int) -> List[Song]:
+        """Pop up to count songs and restore them under their original IDs in one transaction.
+
+        Songs that cannot be restored go back on the stack in their old
+        positions. Returns the restored songs, most recently deleted first.
+        """
+        songs = []
+        while len(songs) < count and (self.stack or self._page_in()):
+            songs.append(self._pop(SESSION))
+        if not songs:
+            return []
+        self.total_pops += len(songs)
+
+        try:
+            from src.db.database import restore_songs_to_db
+            _, failed = restore_songs_to_db(songs)
+        except ImportError:
+            log.warning("STACK RESTORE: Bulk restore not available")
+            failed = [(song, "database module not available") for song in songs]
+
+        failed_songs = {id(song) for song, _ in failed}
+        for song in reversed(songs):
+            if id(song) in failed_songs:
+                self.undo_pop(song)
+        restored = [song for song in songs if id(song) not in failed_songs]
+        for song in restored:
+            self.changes.emit(ADDED, song)
+
+        log.debug("STACK RESTORE MANY: Restored %d of %d songs", len(restored), len(songs))
+        return restored
+
     def restore_song_to_database(self, song: Song) -> bool:
-        """Restore a song back to the database (undo deletion)"""
-        print(f"\nSTACK RESTORE: Attempting to restore '{song.title}' to database")
+        """Restore a song back to the database (undo deletion), keeping its original ID"""
+        log.debug("\nSTACK RESTORE: Attempting to restore '%s' to database", song.title)
         
         try:
-            from src.db.database import insert_song_to_db
+            restore = self._get_restorer()
             
-            if insert_song_to_db(song):
-                print(f"STACK RESTORE: Successfully restored '{song.title}' to database")
+            if restore(song):
+                log.debug("STACK RESTORE: Successfully restored '%s' to database", song.title)
+                self.changes.emit(ADDED, song)
                 return True
             else:
-                print(f"STACK RESTORE: Failed to restore '{song.title}' to database")
+                log.warning("STACK RESTORE: Failed to restore '%s' to database", song.title)
                 return False
                 
         except ImportError:
-            print(f"STACK RESTORE: Database module not available for restoration")
+            log.warning("STACK RESTORE: Database module not available for restoration")
             return False
     
     def view_stack(self):
         """Display all songs in delete stack with verbose logging"""
         print(f"\nSTACK VIEW: Displaying complete delete session")
-        print(f"STACK VIEW: Current session contains {len(self.stack)} songs")
+        print(f"STACK VIEW: Current session contains {self.session_size()} songs")
         print(f"STACK VIEW: Stack follows LIFO principle (Last In, First Out)")
         print(f"STACK VIEW: Songs shown were deleted from database but tracked in session")
         
-        if not self.stack:
+        if not self.stack and not self.spilled[SESSION]:
             print("STACK VIEW: Current delete session is empty")
         else:
             print("STACK VIEW: Songs in current delete session (LIFO order):")
             
+            # With spilled songs the bottom of the session is on disk, and the
+            # in-memory part may even be empty (after pops, or when resuming a session)
+            oldest_in_memory = not self.spilled[SESSION]
             for i, song in enumerate(reversed(self.stack), 1):
                 stack_position = len(self.stack) - i + 1
-                age_desc = "MOST RECENT" if i == 1 else "OLDEST" if i == len(self.stack) else f"Position {stack_position}"
+                age_desc = ("MOST RECENT" if i == 1 else "OLDEST" if i == len(self.stack) and oldest_in_memory
+                            else f"Position {stack_position}")
                 
                 print(f"   {i}. [TOP-{i}] [{age_desc}] {song.title} - {song.artist} (ID: {song.id})")
             
-            print(f"STACK VIEW: Most recently deleted: '{self.stack[-1].title}' (top)")
-            print(f"STACK VIEW: First deleted this session: '{self.stack[0].title}' (bottom)")
+            if self.stack:
+                print(f"STACK VIEW: Most recently deleted: '{self.stack[-1].title}' (top)")
+                if oldest_in_memory:
+                    print(f"STACK VIEW: First deleted this session: '{self.stack[0].title}' (bottom)")
+        if self.spilled[SESSION]:
+            print(f"STACK VIEW: Plus {self.spilled[SESSION]} older songs in the on-disk log")
         
         print(f"STACK VIEW: Session stats - Added: {self.total_pushes}, Removed: {self.total_pops}")
         print(f"STACK VIEW: Total permanent deletions (all time): {self.total_permanent_deletes}")
     
     def clear_session(self):
         """Clear current delete session without flushing"""
-        print(f"\nSTACK CLEAR: Clearing current delete session ({len(self.stack)} songs)")
-        print("STACK CLEAR: Warning - This will lose track of deleted songs in current session")
-        
-        if self.stack:
-            print("STACK CLEAR: Songs being cleared from session tracking:")
-            for i, song in enumerate(self.stack, 1):
-                print(f"   {i}. {song.title} - {song.artist}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("\nSTACK CLEAR: Clearing current delete session (%d songs)", len(self.stack))
+            log.debug("STACK CLEAR: Warning - This will lose track of deleted songs in current session")
+
+            if self.stack:
+                log.debug("STACK CLEAR: Songs being cleared from session tracking:")
+                for i, song in enumerate(self.stack, 1):
+                    log.debug("   %d. %s - %s", i, song.title, song.artist)
         
-        cleared_count = len(self.stack)
+        cleared_count = self.session_size()
         self.stack.clear()
-        
-        print(f"STACK CLEAR: Cleared {cleared_count} songs from session tracking")
-        print("STACK CLEAR: Note - Songs were already deleted from database")
+        self._memory_bytes[SESSION] = 0
+        if self.spilled[SESSION]:
+            try:
+                from src.db.database import clear_deleted_songs
+                if clear_deleted_songs(SESSION):
+                    self.spilled[SESSION] = 0
+            except ImportError:
+                pass
+        
+        log.debug("STACK CLEAR: Cleared %d songs from session tracking", cleared_count)
+        log.debug("STACK CLEAR: Note - Songs were already deleted from database")
         self._print_stack_status()
     
+    @staticmethod
+    def _get_restorer():
+        """Return a restore that keeps the song's ID, falling back to a plain insert"""
+        try:
+            from src.db.database import restore_songs_to_db
+        except ImportError:
+            from src.db.database import insert_song_to_db
+            return insert_song_to_db
+
+        def restore_one(song):
+            restored, _ = restore_songs_to_db([song])
+            return restored == 1
+
+        return restore_one
+
+    @property
+    def bounded(self) -> bool:
+        return self.max_depth is not None or self.max_bytes is not None
+
+    def _songs(self, area: str) -> List[Song]:
+        return self.stack if area == SESSION else self.deleted_songs_history
+
+    def _append(self, area: str, song: Song):
+        songs = self._songs(area)
+        songs.append(song)
+        if not self.bounded:
+            return
+        self._memory_bytes[area] += _song_bytes(song)
+        if self._over_budget(len(songs), self._memory_bytes[area], 1):
+            self._spill(area, self._spill_count(area))
+
+    def _pop(self, area: str) -> Song:
+        song = self._songs(area).pop()
+        if self.bounded:
+            self._memory_bytes[area] -= _song_bytes(song)
+        return song
+
+    def _over_budget(self, count: int, size_bytes: int, divisor: int) -> bool:
+        return ((self.max_depth is not None and count > self.max_depth // divisor) or
+                (self.max_bytes is not None and size_bytes > self.max_bytes // divisor))
+
+    def _spill_count(self, area: str) -> int:
+        """How many of the oldest songs to spill to get back to half the budget"""
+        songs = self._songs(area)
+        count, size_bytes = len(songs), self._memory_bytes[area]
+        spill = 0
+        while spill < len(songs) - 1 and self._over_budget(count, size_bytes, 2):
+            size_bytes -= _song_bytes(songs[spill])
+            count -= 1
+            spill += 1
+        return spill
+
+    def _spill(self, area: str, count: int) -> bool:
+        """Append the count oldest in-memory songs of an area to the on-disk log"""
+        if count <= 0:
+            return True
+        try:
+            from src.db.database import spill_deleted_songs
+        except ImportError:
+            log.debug("STACK SPILL: Database module not available - keeping songs in memory")
+            return False
+
+        songs = self._songs(area)
+        if not spill_deleted_songs(area, songs[:count]):
+            log.warning("STACK SPILL: Could not write %d songs to the on-disk log - keeping them in memory", count)
+            return False
+        self._memory_bytes[area] -= sum(_song_bytes(song) for song in songs[:count])
+        del songs[:count]
+        self.spilled[area] += count
+        log.debug("STACK SPILL: Moved %d oldest %s songs to disk (%d in memory, %d on disk)",
+                  count, area, len(songs), self.spilled[area])
+        return True
+
+    def _page_in(self) -> bool:
+        """Read the newest page of spilled session songs back under the in-memory part"""
+        if not self.spilled[SESSION]:
+            return False
+        try:
+            from src.db.database import take_deleted_songs
+        except ImportError:
+            return False
+
+        songs = take_deleted_songs(SESSION, self.page_size)
+        if not songs:
+            # Keep counting what is still on disk, so a failed read does not lose the session
+            self.spilled[SESSION] = self._count_spilled(SESSION)
+            log.warning("STACK: Spilled delete session could not be read back (%d songs on disk)",
+                        self.spilled[SESSION])
+            return False
+        self.stack[:0] = songs
+        self.spilled[SESSION] -= len(songs)
+        self._memory_bytes[SESSION] += sum(_song_bytes(song) for song in songs)
+        log.debug("STACK: Paged %d songs back in from disk (%d still on disk)", len(songs), self.spilled[SESSION])
+        return True
+
+    def _iter_spilled(self, area: str) -> Iterator[Song]:
+        if not self.spilled[area]:
+            return
+        try:
+            from src.db.database import get_deleted_songs_page
+        except ImportError:
+            return
+        after_seq = 0
+        while True:
+            page = get_deleted_songs_page(area, after_seq, self.page_size)
+            if not page:
+                return
+            for _, song in page:
+                yield song
+            after_seq = page[-1][0]
+
+    def _count_spilled(self, area: str) -> int:
+        try:
+            from src.db.database import count_deleted_songs
+        except ImportError:
+            return 0
+        return count_deleted_songs(area)
+
     def _print_stack_contents(self):
-        """Internal method to print current stack contents"""
+        """Internal method to log current stack contents"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
         if not self.stack:
-            print("STACK STATE: [] (empty session)")
+            log.debug("STACK STATE: [] (empty session)")
             return
         
         if len(self.stack) <= 4:
             stack_display = " | ".join([f"'{song.title}'" for song in reversed(self.stack)])
-            print(f"STACK STATE: [TOP: {stack_display} :BOTTOM]")
+            log.debug("STACK STATE: [TOP: %s :BOTTOM]", stack_display)
         else:
             top_songs = [f"'{song.title}'" for song in reversed(self.stack[:2])]
             bottom_songs = [f"'{song.title}'" for song in reversed(self.stack[-2:])]
-            print(f"STACK STATE: [TOP: {' | '.join(top_songs)} | ... | {' | '.join(bottom_songs)} :BOTTOM]")
+            log.debug("STACK STATE: [TOP: %s | ... | %s :BOTTOM]", " | ".join(top_songs), " | ".join(bottom_songs))
     
     def _print_stack_status(self):
-        """Internal method to print stack statistics"""
-        print(f"STACK STATS: Current Session={len(self.stack)}, Total Pushes={self.total_pushes}, Total Pops={self.total_pops}")
-        print(f"STACK STATS: Permanent Deletions={self.total_permanent_deletes}, Max Session Size={self.max_size_reached}")
+        """Internal method to log stack statistics"""
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+
+        log.debug("STACK STATS: Current Session=%d, Total Pushes=%d, Total Pops=%d",
+                  len(self.stack), self.total_pushes, self.total_pops)
+        log.debug("STACK STATS: Permanent Deletions=%d, Max Session Size=%d",
+                  self.total_permanent_deletes, self.max_size_reached)
     
     def __str__(self):
         """Return a string showing the current delete session"""
-        if not self.stack:
+        if not self.stack and not self.spilled[SESSION]:
             return "Delete session is empty."
         
-        result = f"Current Delete Session ({len(self.stack)} songs):\n"
+        result = f"Current Delete Session ({self.session_size()} songs):\n"
         for i, song in enumerate(reversed(self.stack), 1):
             result += f"  {i}. {song.title} - {song.artist} (ID: {song.id})\n"
+        if self.spilled[SESSION]:
+            result += f"  ... plus {self.spilled[SESSION]} older songs in the on-disk log\n"
         
         result += f"\nSession Stats: {self.total_pushes} deleted, {self.total_permanent_deletes} permanent deletions (all-time)"
         return result.strip()
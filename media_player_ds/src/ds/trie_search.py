@@ -0,0 +1,216 @@
+from src.model.song import Song
+from src.utils.logger import get_logger
+from typing import Dict, Iterable, List, Optional, Tuple
+import logging
+
+log = get_logger("trie")
+
+# Completions cached per node; complete() never returns more than this
+DEFAULT_TOP_K = 10
+
+# Fields offered as completions
+INDEXED_FIELDS = ("title", "artist", "album")
+
+
+class TrieNode:
+    """Node of the prefix trie.
+
+    entries maps a display value (e.g. "Hotel California") to the number of
+    songs that have it in some indexed field, for values whose key ends at
+    this node. top caches the best completions of the whole subtree and is
+    None when a change below this node made it stale.
+    """
+    __slots__ = ("children", "entries", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "TrieNode"] = {}
+        self.entries: Dict[str, int] = {}
+        self.top: Optional[List[Tuple[str, int]]] = []
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _keys_for(value: str) -> List[str]:
+    """Keys that lead to a value: the whole value and every word-start suffix.
+
+    "Hotel California" is found by typing "hot..." or "cal...".
+    """
+    words = _normalize(value).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+def _rank(item: Tuple[str, int]):
+    display, count = item
+    return -count, display.lower(), display
+
+
+class SongTrie:
+    """Prefix index over song titles, artists and albums for autocomplete.
+
+    Every node caches the top-k completions of its subtree, so complete()
+    costs O(len(prefix)) when the cache is warm. Changes only invalidate the
+    caches on the path to the changed keys; they are rebuilt lazily from the
+    children's caches on the next lookup, which keeps incremental add,
+    update and remove cheap and makes bulk loads a single pass.
+    """
+
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.root = TrieNode()
+        self.top_k = top_k
+        self.node_count = 1
+        # song id -> display values currently indexed for it
+        self._values_by_song: Dict[object, Tuple[str, ...]] = {}
+        log.debug("TRIE: Initialized empty prefix index (top-%d completions per node)", top_k)
+
+    def __len__(self):
+        return len(self._values_by_song)
+
+    def __contains__(self, song_id):
+        return song_id in self._values_by_song
+
+    def add_song(self, song: Song):
+        """Index a song, replacing whatever was indexed for its id before"""
+        values = self._values_of(song)
+        old_values = self._values_by_song.get(song.id, ())
+        if values == old_values:
+            return
+
+        for value in old_values:
+            if value not in values:
+                self._change(value, -1)
+        for value in values:
+            if value not in old_values:
+                self._change(value, 1)
+        self._values_by_song[song.id] = values
+
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("TRIE: Indexed song %s: %s", song.id, ", ".join(values))
+
+    # An update is a re-add: only the values that changed touch the trie
+    update_song = add_song
+
+    def add_songs(self, songs: Iterable[Song]):
+        """Index many songs; caches are rebuilt once on the next lookup"""
+        for song in songs:
+            self.add_song(song)
+
+    def remove_song(self, song_id) -> bool:
+        """Drop a song from the index; returns False if it was not indexed"""
+        values = self._values_by_song.pop(song_id, None)
+        if values is None:
+            return False
+        for value in values:
+            self._change(value, -1)
+        log.debug("TRIE: Removed song %s", song_id)
+        return True
+
+    def clear(self):
+        self.root = TrieNode()
+        self.node_count = 1
+        self._values_by_song.clear()
+
+    def complete(self, prefix: str, limit: int = DEFAULT_TOP_K) -> List[str]:
+        """Return up to limit values starting with (a word of) prefix, most common first"""
+        node = self._find(_normalize(prefix))
+        if node is None:
+            return []
+        limit = min(limit, self.top_k)
+        return [display for display, _ in self._top(node)[:limit]]
+
+    def _values_of(self, song: Song) -> Tuple[str, ...]:
+        values = []
+        for field in INDEXED_FIELDS:
+            value = (getattr(song, field, "") or "").strip()
+            if value and value not in values:
+                values.append(value)
+        return tuple(values)
+
+    def _find(self, key: str) -> Optional[TrieNode]:
+        node = self.root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def _change(self, value: str, delta: int):
+        """Add delta songs to value under each of its keys, invalidating caches on the way"""
+        for key in _keys_for(value):
+            node = self.root
+            path = [node]
+            node.top = None
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = TrieNode()
+                    self.node_count += 1
+                node = child
+                node.top = None
+                path.append(node)
+
+            count = node.entries.get(value, 0) + delta
+            if count > 0:
+                node.entries[value] = count
+            else:
+                node.entries.pop(value, None)
+                self._prune(key, path)
+
+    def _prune(self, key: str, path: List[TrieNode]):
+        """Remove nodes left with no entries and no children after a delete"""
+        for depth in range(len(key), 0, -1):
+            node = path[depth]
+            if node.entries or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+            self.node_count -= 1
+
+    def _top(self, node: TrieNode) -> List[Tuple[str, int]]:
+        """Return node's cached completions, rebuilding stale caches bottom-up"""
+        if node.top is not None:
+            return node.top
+
+        # Iterative post-order over the stale part of the subtree
+        stack = [(node, False)]
+        while stack:
+            current, children_done = stack.pop()
+            if children_done:
+                current.top = self._merge(current)
+                continue
+            stack.append((current, True))
+            for child in current.children.values():
+                if child.top is None:
+                    stack.append((child, False))
+        return node.top
+
+    def _merge(self, node: TrieNode) -> List[Tuple[str, int]]:
+        # A value reachable through several keys (one per word) has the same
+        # song count under each, so keep the largest instead of summing.
+        best: Dict[str, int] = dict(node.entries)
+        for child in node.children.values():
+            for display, count in child.top:
+                if count > best.get(display, 0):
+                    best[display] = count
+        return sorted(best.items(), key=_rank)[:self.top_k]
+
+
+# Test functionality with verbose output
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TRIE DEMONSTRATION: Search-as-you-type completions")
+    print("=" * 60)
+
+    trie = SongTrie()
+    trie.add_songs([
+        Song(song_id=1, title="Hotel California", artist="Eagles", album="Hotel California"),
+        Song(song_id=2, title="Hey Jude", artist="The Beatles", album="Hey Jude"),
+        Song(song_id=3, title="Help!", artist="The Beatles", album="Help!"),
+        Song(song_id=4, title="Heroes", artist="David Bowie", album="Heroes"),
+    ])
+
+    for prefix in ["he", "hel", "cal", "beat", "x"]:
+        print(f"complete({prefix!r}) -> {trie.complete(prefix)}")
+
+    trie.remove_song(3)
+    print(f"after removing song 3, complete('hel') -> {trie.complete('hel')}")
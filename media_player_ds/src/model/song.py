@@ -1,8 +1,17 @@
 from datetime import datetime
+from time import time
 
 
 class Song:
-    """Enhanced Song data model"""
+    """Enhanced Song data model
+
+    Songs are held by the million across the hash table, BST, queue and
+    stack, so the class uses __slots__ (no per-instance __dict__). When no
+    created_at is given, construction only records a cheap time.time()
+    float; it is turned into a datetime the first time created_at is read.
+    """
+    __slots__ = ("id", "title", "artist", "album", "duration", "file_path",
+                 "genre", "year", "_created_at", "_created_ts")
 
     def __init__(self, song_id=None, title="", artist="", album="", duration=0,
                  file_path="", genre="", year=None, created_at=None):
@@ -14,11 +23,22 @@ class Song:
         self.file_path = file_path
         self.genre = genre
         self.year = year
-        self.created_at = created_at or datetime.now()
-    
+        self._created_at = created_at or None
+        self._created_ts = None if self._created_at is not None else time()
+
+    @property
+    def created_at(self):
+        if self._created_at is None:
+            self._created_at = datetime.fromtimestamp(self._created_ts)
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = value or datetime.now()
+
     def __str__(self):
         return f"{self.title} - {self.artist}"
-    
+
     def __repr__(self):
         return f"Song(id={self.id}, title='{self.title}', artist='{self.artist}')"
 
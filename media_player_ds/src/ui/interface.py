@@ -5,9 +5,17 @@ import sys
 
 from src.model.song import Song
 from src.ds.queue_create import SongQueue
-from src.ds.bst_read import SongBST, read_song_data, insert, inorder
-from src.ds.hashtable_update import SongTable
+from src.ds.bst_read import inorder
+from src.ds.catalog import SongCatalog
 from src.ds.stack_delete import DeleteStack
+from src.ui.song_list import PagedSongList
+from src.ui.tasks import TaskRunner
+
+# Deleted songs kept in memory for undo/history; older ones spill to the deleted_songs table
+DELETE_STACK_MEMORY_DEPTH = 1000
+
+# Rows listed per tab in the deletion history window (newest first)
+HISTORY_WINDOW_ROWS = 1000
 
 class MediaPlayerUI:
     def __init__(self, root):
@@ -18,42 +26,63 @@ class MediaPlayerUI:
         
         # DATA STRUCTURE INITIALIZATION
         self.song_queue = SongQueue()
-        self.song_table = SongTable()
-        self.delete_stack = DeleteStack()
+        self.delete_stack = DeleteStack(max_depth=DELETE_STACK_MEMORY_DEPTH)
+        
+        # Database and index work runs on a worker thread; results come back via root.after
+        self.tasks = TaskRunner(root)
+        self.process_task = None
         
-        # For viewing songs
+        # One shared catalog: BST (READ) and hash table (UPDATE) index the same Song objects
+        self.catalog = SongCatalog()
+        self.song_table = self.catalog.table
+        self.bst = self.catalog.bst
         self.bst_root = None
         self.songs_listbox = None  # Will store reference to songs display
-        self.reload_bst()
         
-        # Load update table
-        try:
-            all_songs = read_song_data()
-            song_objects = []
-            for song_dict in all_songs:
-                song_obj = Song(
-                    song_id=song_dict.get('id'),
-                    title=song_dict.get('title', ''),
-                    artist=song_dict.get('artist', ''),
-                    album=song_dict.get('album', ''),
-                    year=song_dict.get('year')
-                )
-                song_objects.append(song_obj)
-            self.song_table.load_from_list(song_objects)
-        except:
-            print("Could not load songs into hash table")
+        # Edits reach the BST and the song list as deltas instead of full reloads.
+        # Deletes and restores run on the worker, so their deltas are marshalled to the Tk thread.
+        self.delete_stack.changes.subscribe(self.tasks.on_main_thread(self.apply_library_change))
+        self.catalog.changes.subscribe(self.on_library_change)
         
         self.setup_widgets()
+        self.reload_catalog()
+    
+    def shutdown(self):
+        """Stop background work and save the delete stack so the next start resumes it"""
+        self.tasks.shutdown()
+        if not self.delete_stack.persist():
+            print("Could not save the delete stack; its newest deletions cannot be undone after a restart")
+    
+    def apply_library_change(self, change):
+        """Forward a delta to whichever catalog is current (it may have been reloaded)"""
+        self.catalog.apply_change(change)
+    
+    def reload_catalog(self):
+        """Load the library from DB once and rebuild every in-memory index from it, in the background"""
+        def load(task):
+            catalog = SongCatalog()
+            catalog.load()
+            return catalog
+        
+        def on_loaded(catalog):
+            self.catalog.changes.unsubscribe(self.on_library_change)
+            self.catalog = catalog
+            self.catalog.changes.subscribe(self.on_library_change)
+            self.song_table = self.catalog.table
+            self.bst = self.catalog.bst
+            self.bst_root = self.bst.root
+            self.refresh_song_display()
+        
+        def on_error(error):
+            print(f"Could not load song catalog: {error}")
+        
+        self.tasks.submit(load, on_done=on_loaded, on_error=on_error, name="reload catalog")
     
     def reload_bst(self):
-        """Rebuild BST from DB"""
-        self.bst_root = None
-        try:
-            songs = read_song_data()
-            for song in songs:
-                self.bst_root = insert(self.bst_root, song)
-        except:
-            print("Could not load BST")
+        """Rebuild the BST from the in-memory catalog with an O(n) bulk load"""
+        self.catalog.rebuild_bst()
+        self.bst = self.catalog.bst
+        self.bst_root = self.bst.root
     
     def setup_widgets(self):
         """Initialize UI widgets and layout"""
@@ -85,6 +114,10 @@ class MediaPlayerUI:
                                    font=("Arial", 10), bg="#f0f0f0")
         self.status_label.pack(pady=10)
         
+        # Shown only while a long background job (queue processing) can be cancelled
+        self.cancel_button = tk.Button(left_frame, text="Cancel", command=self.on_cancel_task,
+                                       bg="#c0392b", fg="white", font=("Arial", 9, "bold"))
+        
         # Right side - Song Display
         right_frame = tk.LabelFrame(main_frame, text="Song Library", 
                                    font=("Arial", 12, "bold"), bg="#f0f0f0", padx=10, pady=10)
@@ -169,18 +202,35 @@ class MediaPlayerUI:
                                font=("Arial", 10, "bold"), bg="#f0f0f0")
         instructions.pack(anchor="w", pady=(0, 10))
         
-        # Create frame for listbox and scrollbar
-        display_frame = tk.Frame(parent, bg="#f0f0f0")
-        display_frame.pack(fill="both", expand=True)
-        
-        # Listbox with scrollbar
-        scrollbar = tk.Scrollbar(display_frame)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.songs_listbox = tk.Listbox(display_frame, yscrollcommand=scrollbar.set, 
-                                       font=("Courier", 10), height=20, selectmode=tk.SINGLE)
-        self.songs_listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=self.songs_listbox.yview)
+        # Search-as-you-type: completions come from the in-memory trie
+        search_frame = tk.Frame(parent, bg="#f0f0f0")
+        search_frame.pack(fill="x", pady=(0, 5))
+        tk.Label(search_frame, text="Quick search:", font=("Arial", 10, "bold"), bg="#f0f0f0").pack(side="left")
+        self.quick_search_entry = tk.Entry(search_frame, font=("Arial", 10))
+        self.quick_search_entry.pack(side="left", fill="x", expand=True, padx=(5, 0))
+        self.quick_search_entry.bind('<KeyRelease>', self.on_quick_search_key)
+        self.quick_search_entry.bind('<Return>', self.on_quick_search_submit)
+        
+        self.suggestions_listbox = tk.Listbox(parent, font=("Arial", 10), height=5)
+        self.suggestions_listbox.bind('<Double-Button-1>', self.on_suggestion_selected)
+        self.suggestions_listbox.bind('<Return>', self.on_suggestion_selected)
+        
+        # Sort order of the song list; both orders are keyset-paginated on a covering index
+        order_frame = tk.Frame(parent, bg="#f0f0f0")
+        order_frame.pack(fill="x", pady=(0, 5))
+        tk.Label(order_frame, text="Sort by:", font=("Arial", 10, "bold"), bg="#f0f0f0").pack(side="left")
+        self.song_order = tk.StringVar(value="id")
+        for text, order_by in (("ID", "id"), ("Title", "title")):
+            tk.Radiobutton(order_frame, text=text, value=order_by, variable=self.song_order,
+                           command=lambda: self.song_list.set_order(self.song_order.get()),
+                           bg="#f0f0f0").pack(side="left", padx=(5, 0))
+        
+        # Virtualized list: only the visible rows are fetched (keyset pages) and drawn
+        header = f"{'ID':<4} | {'Title':<25} | {'Artist':<20} | {'Album':<20}"
+        self.song_list = PagedSongList(parent, count_songs=lambda: len(self.catalog),
+                                       format_line=self.format_song_line, header=header,
+                                       order_by=self.song_order.get())
+        self.songs_listbox = self.song_list.listbox
         
         # Bind double-click to fill form
         self.songs_listbox.bind('<Double-Button-1>', self.on_song_double_click)
@@ -191,42 +241,69 @@ class MediaPlayerUI:
         refresh_btn.pack(pady=10)
     
     def refresh_song_display(self):
-        """Refresh the song display with current database contents"""
+        """Re-read the visible page of songs from the database"""
         if not self.songs_listbox:
             return
-            
-        # Clear current contents
-        self.songs_listbox.delete(0, tk.END)
         
         try:
-            # Get songs from database
-            songs = read_song_data()
-            
-            if not songs:
-                self.songs_listbox.insert(tk.END, "No songs in library")
-                return
-            
-            # Sort songs by ID for consistent display
-            songs_sorted = sorted(songs, key=lambda x: x.get('id', 0))
-            
-            # Add header
-            header = f"{'ID':<4} | {'Title':<25} | {'Artist':<20} | {'Album':<20}"
-            self.songs_listbox.insert(tk.END, header)
-            self.songs_listbox.insert(tk.END, "-" * 75)
-            
-            # Add each song with clear ID display
-            for song in songs_sorted:
-                song_id = song.get('id', 'N/A')
-                title = song.get('title', 'Unknown')[:25]
-                artist = song.get('artist', 'Unknown')[:20]
-                album = song.get('album', 'Unknown')[:20]
-                
-                song_line = f"{song_id:<4} | {title:<25} | {artist:<20} | {album:<20}"
-                self.songs_listbox.insert(tk.END, song_line)
-                
+            self.song_list.refresh()
         except Exception as e:
+            self.songs_listbox.delete(0, tk.END)
             self.songs_listbox.insert(tk.END, f"Error loading songs: {e}")
     
+    def format_song_line(self, song):
+        """One row of the song list"""
+        song_id = song.id if song.id is not None else 'N/A'
+        title = (song.title or 'Unknown')[:25]
+        artist = (song.artist or 'Unknown')[:20]
+        album = (song.album or 'Unknown')[:20]
+        return f"{song_id:<4} | {title:<25} | {artist:<20} | {album:<20}"
+    
+    def on_library_change(self, change):
+        """Apply one catalog delta: the indexes are already updated, so just redraw the visible page"""
+        self.bst = self.catalog.bst
+        self.bst_root = self.bst.root  # rotations may have moved the root
+        self.refresh_song_display()
+    
+    def on_quick_search_key(self, event):
+        """Refresh completions for the text typed so far"""
+        if event.keysym in ("Return", "Up", "Down"):
+            if event.keysym == "Down" and self.suggestions_listbox.size():
+                self.suggestions_listbox.focus_set()
+                self.suggestions_listbox.selection_set(0)
+            return
+        
+        prefix = self.quick_search_entry.get()
+        suggestions = self.song_table.complete(prefix) if prefix.strip() else []
+        
+        self.suggestions_listbox.delete(0, tk.END)
+        for suggestion in suggestions:
+            self.suggestions_listbox.insert(tk.END, suggestion)
+        
+        if suggestions:
+            if not self.suggestions_listbox.winfo_ismapped():
+                self.suggestions_listbox.pack(fill="x", pady=(0, 5), after=self.quick_search_entry.master)
+        else:
+            self.suggestions_listbox.pack_forget()
+    
+    def on_suggestion_selected(self, event):
+        """Search for the chosen completion"""
+        selection = self.suggestions_listbox.curselection()
+        if not selection:
+            return
+        suggestion = self.suggestions_listbox.get(selection[0])
+        self.quick_search_entry.delete(0, tk.END)
+        self.quick_search_entry.insert(0, suggestion)
+        self.suggestions_listbox.pack_forget()
+        self.show_search_results(suggestion)
+    
+    def on_quick_search_submit(self, event):
+        """Search for whatever is typed in the quick search box"""
+        search_term = self.quick_search_entry.get().strip()
+        if search_term:
+            self.suggestions_listbox.pack_forget()
+            self.show_search_results(search_term)
+    
     def on_song_double_click(self, event):
         """Handle double-click on song to fill form"""
         selection = self.songs_listbox.curselection()
@@ -244,24 +321,18 @@ class MediaPlayerUI:
             # Parse the song ID from the line
             song_id = int(line.split("|")[0].strip())
             
-            # Get full song data
-            songs = read_song_data()
-            selected_song = None
-            
-            for song in songs:
-                if song.get('id') == song_id:
-                    selected_song = song
-                    break
+            # Get full song data (O(1) hash table lookup)
+            selected_song = self.song_table.get_song(song_id)
             
             if selected_song:
                 # Fill the form with song data
                 self.clear_fields()
-                self.entry_title.insert(0, selected_song.get('title', ''))
-                self.entry_artist.insert(0, selected_song.get('artist', ''))
-                self.entry_album.insert(0, selected_song.get('album', ''))
-                self.entry_genre.insert(0, selected_song.get('genre', ''))
-                if selected_song.get('year'):
-                    self.entry_year.insert(0, str(selected_song.get('year')))
+                self.entry_title.insert(0, selected_song.title or '')
+                self.entry_artist.insert(0, selected_song.artist or '')
+                self.entry_album.insert(0, selected_song.album or '')
+                self.entry_genre.insert(0, selected_song.genre or '')
+                if selected_song.year:
+                    self.entry_year.insert(0, str(selected_song.year))
                 
                 self.status_label.config(text=f"Loaded song ID {song_id} into form")
                 
@@ -320,18 +391,74 @@ class MediaPlayerUI:
             messagebox.showinfo("Empty Queue", "No songs to process.")
             return
         
-        queue_size = self.song_queue.get_queue_size()
-        self.song_queue.process_queue()
-        self.reload_bst()
-        self.song_table.load_from_database()
-        self.refresh_song_display()  # Refresh the display
-        self.status_label.config(text=f"✅ Processed {queue_size} songs from queue.")
+        if self.process_task is not None:
+            messagebox.showinfo("Queue Busy", "The queue is already being processed.")
+            return
+        
+        # The queue is only changed here, on the Tk thread: the batch is taken off it now
+        # and anything the worker did not reach is put back in on_done
+        songs = self.song_queue.take_all()
+        queue_size = len(songs)
+        
+        def process(task):
+            return self.song_queue.insert_batch(songs, progress=task.report_progress,
+                                                should_stop=lambda: task.cancelled)
+        
+        def on_progress(done, total):
+            self.status_label.config(text=f"⏳ Processing queue: {done} of {total} songs...")
+        
+        def on_done(result):
+            _, failed_songs, not_attempted = result
+            self.song_queue.requeue_front(not_attempted)
+            self.process_task = None
+            self.cancel_button.pack_forget()
+            remaining = len(not_attempted)
+            processed = queue_size - remaining
+            self.reload_catalog()
+            
+            if failed_songs:
+                messagebox.showwarning("Some Songs Failed",
+                                       f"{len(failed_songs)} of {processed} songs could not be saved:\n\n" +
+                                       "\n".join([f"• {song.title} - {song.artist}: {error}"
+                                                  for song, error in failed_songs[:5]]) +
+                                       (f"\n... and {len(failed_songs)-5} more" if len(failed_songs) > 5 else ""))
+            status = f"✅ Processed {processed - len(failed_songs)} of {queue_size} songs from queue."
+            if remaining:
+                status += f" Cancelled - {remaining} songs left in queue."
+            self.status_label.config(text=status)
+        
+        def on_error(error):
+            # Songs that never got an id did not reach the database
+            self.song_queue.requeue_front([song for song in songs if song.id is None])
+            self.process_task = None
+            self.cancel_button.pack_forget()
+            messagebox.showerror("Process Queue Failed", f"Could not process the queue: {error}")
+        
+        def on_cancel():
+            # Cancelled before the job started: nothing was written
+            self.song_queue.requeue_front(songs)
+            self.process_task = None
+            self.cancel_button.pack_forget()
+            self.status_label.config(text=f"✅ Cancelled - {queue_size} songs left in queue.")
+        
+        self.status_label.config(text=f"⏳ Processing {queue_size} songs in the background...")
+        self.cancel_button.pack(pady=(0, 10))
+        self.process_task = self.tasks.submit(process, on_done=on_done, on_error=on_error,
+                                              on_progress=on_progress, on_cancel=on_cancel,
+                                              name="process queue")
+    
+    def on_cancel_task(self):
+        """Stop queue processing after the chunk in progress; the rest stays queued"""
+        if self.process_task is not None:
+            self.process_task.cancel()
+            self.status_label.config(text="⏳ Cancelling after the current chunk...")
     
     def on_view_songs(self):
         """Handler for viewing all songs using BST"""
         # The song display is always visible, just refresh it
         self.refresh_song_display()
-        self.status_label.config(text="✅ Song list refreshed (sorted by ID)")
+        order = "title" if self.song_order.get() == "title" else "ID"
+        self.status_label.config(text=f"✅ Song list refreshed (sorted by {order})")
         
         # Also show BST traversal in a popup for educational purposes
         if not self.bst_root:
@@ -364,47 +491,55 @@ class MediaPlayerUI:
     
     def on_search_song(self):
         """Handler for searching songs"""
-        search_term = simpledialog.askstring("Search Songs", "Enter title, artist, or album to search for:")
+        search_term = simpledialog.askstring("Search Songs", "Enter title, artist, or album to search for:\n" +
+                                             "(word prefixes work, e.g. 'hot cal')")
         if not search_term:
             return
-        
+        self.show_search_results(search_term)
+    
+    def show_search_results(self, search_term):
+        """Count full-text matches in the background, then page through the ranked results in a window"""
         try:
-            from src.db.database import search_songs
-            results = search_songs(search_term)
-            
-            if not results:
-                messagebox.showinfo("Search Results", f"No songs found matching '{search_term}'")
-                return
-            
-            # Create window to show search results
-            search_window = tk.Toplevel(self.root)
-            search_window.title(f"Search Results for '{search_term}'")
-            search_window.geometry("600x400")
-            
-            # Create listbox for results
-            result_listbox = tk.Listbox(search_window, font=("Courier", 10))
-            result_listbox.pack(fill="both", expand=True, padx=10, pady=10)
-            
-            # Add header
-            header = f"{'ID':<4} | {'Title':<25} | {'Artist':<20} | {'Album':<15}"
-            result_listbox.insert(tk.END, header)
-            result_listbox.insert(tk.END, "-" * 70)
-            
-            # Add search results
-            for song in results:
-                song_line = f"{song.id:<4} | {song.title[:25]:<25} | {song.artist[:20]:<20} | {song.album[:15]:<15}"
-                result_listbox.insert(tk.END, song_line)
-            
-            self.status_label.config(text=f"Found {len(results)} songs matching '{search_term}'")
-            
+            from src.db.database import count_search_results
         except ImportError:
             messagebox.showerror("Error", "Search functionality not available")
+            return
+        
+        self.status_label.config(text=f"⏳ Searching for '{search_term}'...")
+        self.tasks.submit(lambda task: count_search_results(search_term),
+                          on_done=lambda total: self.display_search_results(search_term, total),
+                          on_error=lambda error: messagebox.showerror("Search Failed", str(error)),
+                          name="search")
+    
+    def display_search_results(self, search_term, total):
+        """Show search results (runs on the Tk thread)"""
+        if not total:
+            self.status_label.config(text=f"No songs found matching '{search_term}'")
+            messagebox.showinfo("Search Results", f"No songs found matching '{search_term}'")
+            return
+        
+        # Create window to show search results
+        search_window = tk.Toplevel(self.root)
+        search_window.title(f"Search Results for '{search_term}' (best matches first)")
+        search_window.geometry("600x400")
+        
+        # Only the visible results are fetched, a keyset page at a time in relevance order
+        frame = tk.Frame(search_window, bg="#f0f0f0")
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+        header = f"{'ID':<4} | {'Title':<25} | {'Artist':<20} | {'Album':<15}"
+        results = PagedSongList(frame, count_songs=lambda: total, format_line=self.format_search_line,
+                                header=header, order_by="rank", query=search_term,
+                                empty_text="No songs found")
+        results.refresh()
+        
+        self.status_label.config(text=f"Found {total} songs matching '{search_term}' (ranked by relevance)")
+    
+    def format_search_line(self, song):
+        """One row of the search results window"""
+        return f"{song.id:<4} | {song.title[:25]:<25} | {song.artist[:20]:<20} | {(song.album or '')[:15]:<15}"
     
     def on_update_song(self):
         """Handler for updating song metadata"""
-        # Show current songs first
-        self.refresh_song_display()
-        
         song_id = simpledialog.askinteger("Update Song", 
                                          "Enter Song ID (see the list on the right):\n\n" +
                                          "Tip: Double-click a song to load it into the form first!")
@@ -431,20 +566,31 @@ class MediaPlayerUI:
             except ValueError:
                 messagebox.showwarning("Invalid Year", "Year must be a number. Keeping current year.")
         
-        success = self.song_table.update_song(song_id, title, artist, album, genre, year)
+        # In-memory update (and its BST/song list deltas) happens here; the UPDATE runs on the worker
+        success = self.song_table.update_song(song_id, title, artist, album, genre, year, persist=False)
         
-        if success:
-            self.status_label.config(text=f"✅ Song {song_id} updated successfully.")
-            self.reload_bst()
-            self.refresh_song_display()
-        else:
+        if not success:
             messagebox.showerror("Update Failed", f"Failed to update song ID {song_id}")
+            return
+        
+        def save(task):
+            from src.db.database import update_song_in_db
+            return update_song_in_db(song)
+        
+        def on_saved(saved):
+            if saved:
+                self.status_label.config(text=f"✅ Song {song_id} updated successfully.")
+            else:
+                messagebox.showwarning("Update Not Saved",
+                                       f"Song {song_id} was updated in memory but could not be saved to the database.")
+        
+        self.status_label.config(text=f"⏳ Saving song {song_id}...")
+        self.tasks.submit(save, on_done=on_saved,
+                          on_error=lambda error: messagebox.showerror("Update Failed", str(error)),
+                          name="update song")
     
     def on_delete_song(self):
         """Handler for deleting a song - IMMEDIATE database deletion"""
-        # Show current songs first
-        self.refresh_song_display()
-        
         song_id = simpledialog.askinteger("Delete Song", 
                                          "Enter Song ID to delete (see the list on the right):\n\n" +
                                          "WARNING: Song will be immediately deleted from database!\n" +
@@ -465,18 +611,26 @@ class MediaPlayerUI:
                                          f"Continue with deletion?")
             
             if confirm:
-                # Use the new push_song method that immediately deletes from database
-                success = self.delete_stack.push_song(song)
+                try:
+                    from src.db.database import delete_song_from_db
+                except ImportError:
+                    # No database: push_song only simulates the delete, nothing to wait for
+                    self.delete_stack.push_song(song)
+                    return
+                
+                # The DELETE runs on the worker; the stack is only changed here, on the Tk thread
+                def on_deleted(success):
+                    if success:
+                        # The REMOVED event drops it from the hash table, BST and song list
+                        self.delete_stack.push_deleted(song)
+                        self.status_label.config(text=f"✅ Song '{song.title}' deleted from database and added to delete session.")
+                    else:
+                        messagebox.showerror("Delete Failed", f"Failed to delete '{song.title}' from database.")
                 
-                if success:
-                    # Remove from hash table as well since it's deleted from DB
-                    if song_id in self.song_table.table:
-                        del self.song_table.table[song_id]
-                    
-                    self.status_label.config(text=f"✅ Song '{song.title}' deleted from database and added to delete session.")
-                    self.refresh_song_display()  # Will show song is gone
-                else:
-                    messagebox.showerror("Delete Failed", f"Failed to delete '{song.title}' from database.")
+                self.status_label.config(text=f"⏳ Deleting '{song.title}'...")
+                self.tasks.submit(lambda task: delete_song_from_db(song.id), on_done=on_deleted,
+                                  on_error=lambda error: messagebox.showerror("Delete Failed", str(error)),
+                                  name="delete song")
         else:
             messagebox.showerror("Not Found", f"Song ID {song_id} not found.\n\nPlease check the song list on the right.")
     
@@ -548,20 +702,26 @@ class MediaPlayerUI:
             restored_song = self.delete_stack.pop_song()
             
             if restored_song:
-                # Try to restore to database
-                success = self.delete_stack.restore_song_to_database(restored_song)
+                def on_restored(success):
+                    if success:
+                        # The ADDED event put it back into the hash table, BST and song list
+                        messagebox.showinfo("Song Restored", f"'{restored_song.title}' has been restored to the database!")
+                        self.status_label.config(text=f"✅ Restored '{restored_song.title}' to database.")
+                    else:
+                        # Put it back on stack if restoration failed
+                        self.delete_stack.undo_pop(restored_song)
+                        messagebox.showerror("Restore Failed", f"Failed to restore '{restored_song.title}' to database.")
                 
-                if success:
-                    # Add back to hash table
-                    self.song_table.table[restored_song.id] = restored_song
-                    
-                    messagebox.showinfo("Song Restored", f"'{restored_song.title}' has been restored to the database!")
-                    self.refresh_song_display()
-                    self.status_label.config(text=f"✅ Restored '{restored_song.title}' to database.")
-                else:
-                    # Put it back on stack if restoration failed
-                    self.delete_stack.stack.append(restored_song)
-                    messagebox.showerror("Restore Failed", f"Failed to restore '{restored_song.title}' to database.")
+                def on_error(error):
+                    self.delete_stack.undo_pop(restored_song)
+                    messagebox.showerror("Restore Failed", str(error))
+                
+                # The INSERT runs on the worker. restore_song_to_database does not touch the
+                # stack (its ADDED event reaches the UI through on_main_thread); popping and
+                # undo_pop stay here on the Tk thread
+                self.status_label.config(text=f"⏳ Restoring '{restored_song.title}'...")
+                self.tasks.submit(lambda task: self.delete_stack.restore_song_to_database(restored_song),
+                                  on_done=on_restored, on_error=on_error, name="restore song")
     
     def on_flush_delete_session(self):
         """Flush the delete session - finalize all deletions"""
@@ -569,27 +729,36 @@ class MediaPlayerUI:
             messagebox.showinfo("Nothing to Flush", "The delete session is empty.")
             return
             
-        # Get current session songs
-        current_session = self.delete_stack.get_current_delete_session()
+        # Get the most recent songs of the current session
+        session_size = self.delete_stack.session_size()
+        recent_songs = list(reversed(self.delete_stack.stack[-5:]))
         
         # Confirm flush
         confirm = messagebox.askyesno("Confirm Flush Delete Session", 
-                                     f"Finalize deletion of {len(current_session)} songs?\n\n" +
-                                     "Songs in current session:\n" +
-                                     "\n".join([f"• {song.title} - {song.artist}" for song in current_session[:5]]) +
-                                     (f"\n... and {len(current_session)-5} more" if len(current_session) > 5 else "") +
+                                     f"Finalize deletion of {session_size} songs?\n\n" +
+                                     "Most recent songs in current session:\n" +
+                                     "\n".join([f"• {song.title} - {song.artist}" for song in recent_songs]) +
+                                     (f"\n... and {session_size-len(recent_songs)} more" if session_size > len(recent_songs) else "") +
                                      "\n\nThis will finalize all deletions and clear the session.\n" +
                                      "Songs are already deleted from database.")
         
         if confirm:
-            flushed_songs = self.delete_stack.flush_delete_session()
+            # Spilled songs are moved to history on disk, so count from the session size
+            self.delete_stack.flush_delete_session()
+            flushed_count = session_size - self.delete_stack.session_size()
             
             messagebox.showinfo("Delete Session Flushed", 
-                               f"Successfully finalized deletion of {len(flushed_songs)} songs.\n\n" +
+                               f"Successfully finalized deletion of {flushed_count} songs.\n\n" +
                                f"These songs have been permanently removed and\n" +
                                f"moved to the deletion history.")
             
-            self.status_label.config(text=f"✅ Flushed {len(flushed_songs)} songs from delete session.")
+            self.status_label.config(text=f"✅ Flushed {flushed_count} songs from delete session.")
+    
+    @staticmethod
+    def newest_songs(songs, total):
+        """Last HISTORY_WINDOW_ROWS of an oldest-first iterator of total songs"""
+        skip = max(total - HISTORY_WINDOW_ROWS, 0)
+        return [song for i, song in enumerate(songs) if i >= skip]
     
     def on_view_deleted_history(self):
         """View complete history of all deleted songs"""
@@ -606,14 +775,16 @@ class MediaPlayerUI:
                               font=("Arial", 14, "bold"))
         title_label.pack(pady=(0, 10))
         
-        # Get deletion history
-        deleted_history = self.delete_stack.get_deleted_songs_history()
-        current_session = self.delete_stack.get_current_delete_session()
+        # Get deletion history; only the newest rows are listed, older ones stay on disk
+        history_size = self.delete_stack.history_size()
+        session_size = self.delete_stack.session_size()
+        deleted_history = self.newest_songs(self.delete_stack.iter_deleted_songs_history(), history_size)
+        current_session = self.newest_songs(self.delete_stack.iter_current_delete_session(), session_size)
         
         # Statistics
-        stats_text = f"Total Permanently Deleted: {len(deleted_history)} songs\n" + \
-                    f"Current Delete Session: {len(current_session)} songs\n" + \
-                    f"Grand Total Deletions: {len(deleted_history) + len(current_session)} songs"
+        stats_text = f"Total Permanently Deleted: {history_size} songs\n" + \
+                    f"Current Delete Session: {session_size} songs\n" + \
+                    f"Grand Total Deletions: {history_size + session_size} songs"
         
         stats_label = tk.Label(content_frame, text=stats_text, font=("Arial", 10), 
                               justify="left", bg="#ecf0f1")
@@ -625,7 +796,7 @@ class MediaPlayerUI:
         
         # Tab 1: Permanently Deleted (Flushed)
         flushed_frame = tk.Frame(notebook)
-        notebook.add(flushed_frame, text=f"Permanently Deleted ({len(deleted_history)})")
+        notebook.add(flushed_frame, text=f"Permanently Deleted ({history_size})")
         
         if deleted_history:
             flushed_listbox = tk.Listbox(flushed_frame, font=("Courier", 10))
@@ -635,7 +806,8 @@ class MediaPlayerUI:
             flushed_listbox.insert(tk.END, "Permanently Deleted Songs (Flushed Sessions):")
             flushed_listbox.insert(tk.END, "=" * 50)
             
-            for i, song in enumerate(deleted_history, 1):
+            first_number = history_size - len(deleted_history) + 1
+            for i, song in enumerate(deleted_history, first_number):
                 song_line = f"{i:3d}. ID:{song.id:<4} | {song.title[:30]:<30} | {song.artist[:20]:<20}"
                 flushed_listbox.insert(tk.END, song_line)
         else:
@@ -646,7 +818,7 @@ class MediaPlayerUI:
         
         # Tab 2: Current Session
         session_frame = tk.Frame(notebook)
-        notebook.add(session_frame, text=f"Current Session ({len(current_session)})")
+        notebook.add(session_frame, text=f"Current Session ({session_size})")
         
         if current_session:
             session_listbox = tk.Listbox(session_frame, font=("Courier", 10))
@@ -0,0 +1,171 @@
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Callable, List, Optional
+
+from src.model.song import Song
+
+
+class PagedSongList:
+    """Virtualized song list over database.get_songs_page.
+
+    Only the rows that fit in the window exist in the Listbox. They are
+    fetched with keyset-paginated queries (rows after the cursor of the
+    last shown song), so a refresh or a scroll step costs one small query
+    regardless of how many songs the library holds, and Tk never holds more
+    than a screenful of lines. The scrollbar is driven manually from the
+    row offset and the song count.
+
+    order_by is one of the database ORDER_BY_* orders; with a query the
+    list pages through full-text search results instead of the library.
+    """
+
+    def __init__(self, parent, count_songs: Callable[[], int], format_line: Callable[[Song], str],
+                 header: str, font=("Courier", 10), order_by: str = "id", query: Optional[str] = None,
+                 empty_text: str = "No songs in library"):
+        self.count_songs = count_songs
+        self.format_line = format_line
+        self.order_by = order_by
+        self.query = query
+        self.empty_text = empty_text
+        self.songs: List[Song] = []      # songs currently shown, one per Listbox row
+        self.cursors: List[tuple] = []   # their page cursors (sort keys), row for row
+        self.offset = 0                  # position of the first shown song in list order
+        self.total = 0
+        self.visible_rows = 20
+        self._line_height = tkfont.Font(font=font).metrics("linespace")
+
+        frame = tk.Frame(parent, bg="#f0f0f0")
+        frame.pack(fill="both", expand=True)
+
+        tk.Label(frame, text=header, font=font, anchor="w", bg="#f0f0f0").pack(fill="x")
+        tk.Label(frame, text="-" * len(header), font=font, anchor="w", bg="#f0f0f0").pack(fill="x")
+
+        self.scrollbar = tk.Scrollbar(frame, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox = tk.Listbox(frame, font=font, height=self.visible_rows, selectmode=tk.SINGLE)
+        self.listbox.pack(side="left", fill="both", expand=True)
+
+        self.listbox.bind('<Configure>', self.on_resize)
+        self.listbox.bind('<MouseWheel>', self.on_mouse_wheel)
+        self.listbox.bind('<Button-4>', lambda event: self.scroll_rows(-3))
+        self.listbox.bind('<Button-5>', lambda event: self.scroll_rows(3))
+        self.listbox.bind('<Prior>', lambda event: self.scroll_rows(-self.visible_rows))
+        self.listbox.bind('<Next>', lambda event: self.scroll_rows(self.visible_rows))
+
+    def set_order(self, order_by: str):
+        """Switch the sort order and go back to the top"""
+        self.order_by = order_by
+        self.songs, self.cursors, self.offset = [], [], 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-read the rows currently in view (after any change to the library)"""
+        self.total = self.count_songs()
+        after = None
+        if self.cursors and self.offset > 0:
+            # Start at the first shown row if it still exists, else at the row now after it
+            before_first = self._fetch(before=self.cursors[0], limit=1)
+            after = before_first.last
+        if after is None:
+            self.offset = 0
+        self._show(self._fetch(after=after, limit=self.visible_rows))
+
+        # Rows were deleted at the end: pull earlier rows in to fill the window
+        missing = self.visible_rows - len(self.songs)
+        if missing > 0 and self.offset > 0:
+            self.scroll_rows(-missing)
+        self._update_scrollbar()
+
+    def scroll_rows(self, delta: int):
+        """Move the window by delta rows (positive scrolls down)"""
+        if not self.songs:
+            return
+        if delta > 0:
+            extra = self._fetch(after=self.cursors[-1], limit=delta)
+            if not extra.songs:
+                return
+            shift = len(extra.songs)
+            self.offset += shift
+            self._show(extra, keep=slice(shift, None), at_end=True)
+        elif delta < 0:
+            extra = self._fetch(before=self.cursors[0], limit=-delta)
+            if not extra.songs:
+                return
+            self.offset = max(self.offset - len(extra.songs), 0)
+            self._show(extra, keep=slice(None, self.visible_rows - len(extra.songs)), at_end=False)
+        self._update_scrollbar()
+
+    def scroll_to_offset(self, offset: int):
+        """Jump to the row at offset (scrollbar drag): one index seek plus one page"""
+        offset = max(0, min(offset, self.total - self.visible_rows))
+        after = None
+        if offset > 0:
+            after = self._cursor_at(offset - 1)
+        self.offset = offset
+        self._show(self._fetch(after=after, limit=self.visible_rows))
+        self._update_scrollbar()
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to_offset(int(float(amount) * self.total))
+        elif action == "scroll":
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def on_mouse_wheel(self, event):
+        self.scroll_rows(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def on_resize(self, event):
+        rows = max(1, event.height // self._line_height)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self.refresh()
+
+    def _show(self, page, keep: Optional[slice] = None, at_end: bool = True):
+        """Show page, or when keep is given, the kept part of the current rows plus page"""
+        songs, cursors = list(page.songs), list(page.cursors)
+        if keep is not None:
+            if at_end:
+                songs, cursors = self.songs[keep] + songs, self.cursors[keep] + cursors
+            else:
+                songs, cursors = songs + self.songs[keep], cursors + self.cursors[keep]
+        self.songs, self.cursors = songs, cursors
+        self.listbox.delete(0, tk.END)
+        if not songs:
+            self.listbox.insert(tk.END, self.empty_text)
+            return
+        for song in songs:
+            self.listbox.insert(tk.END, self.format_line(song))
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        self.scrollbar.set(self.offset / self.total,
+                           min(1.0, (self.offset + len(self.songs)) / self.total))
+
+    def _fetch(self, after: Optional[tuple] = None, before: Optional[tuple] = None, limit: int = 1):
+        try:
+            from src.db.database import get_songs_page
+        except ImportError:
+            return _EMPTY_PAGE
+        return get_songs_page(after=after, limit=limit, order_by=self.order_by, before=before,
+                              query=self.query)
+
+    def _cursor_at(self, offset: int) -> Optional[tuple]:
+        try:
+            from src.db.database import get_page_cursor_at
+            return get_page_cursor_at(offset, self.order_by, self.query)
+        except ImportError:
+            return None
+
+
+class _EmptyPage:
+    songs: List[Song] = []
+    cursors: List[tuple] = []
+    last = first = None
+
+
+_EMPTY_PAGE = _EmptyPage()
@@ -0,0 +1,156 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.utils.logger import get_logger
+
+log = get_logger("tasks")
+
+# How often the Tk thread checks for finished work while tasks are running
+POLL_INTERVAL_MS = 30
+
+
+class Task:
+    """Handle for one background job.
+
+    The job runs as job(task) on a worker thread. Long jobs call
+    task.report_progress(done, total) and check task.cancelled between
+    steps; both are safe to use from the worker. A job cancelled before it
+    started never runs, and on_cancel is called instead of on_done.
+    """
+
+    def __init__(self, runner: "TaskRunner", name: str, job: Callable[["Task"], Any],
+                 on_done: Optional[Callable[[Any], None]], on_error: Optional[Callable[[BaseException], None]],
+                 on_progress: Optional[Callable[[int, int], None]],
+                 on_cancel: Optional[Callable[[], None]] = None):
+        self.name = name
+        self.job = job
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self._runner = runner
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Ask the job to stop; a job that has not started yet never runs"""
+        self._cancel_event.set()
+
+    def report_progress(self, done: int, total: int):
+        if self.on_progress is not None:
+            self._runner.call_soon(self.on_progress, done, total)
+
+
+class TaskRunner:
+    """Runs database and index work off the Tk main loop.
+
+    Jobs execute on a worker thread pool (one worker by default, so jobs run
+    in submission order and never contend with each other for the SQLite
+    write lock). Results, errors, progress updates and call_soon callbacks
+    are put on a thread-safe queue that the Tk thread drains with
+    root.after, so every callback runs on the Tk thread and may touch
+    widgets and the in-memory data structures.
+    """
+
+    def __init__(self, root, max_workers: int = 1):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="media-player-task")
+        self._callbacks: "queue.Queue" = queue.Queue()
+        self._active = set()
+        self._polling = False
+        self._main_thread = threading.current_thread()
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._active)
+
+    def submit(self, job: Callable[[Task], Any], on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[BaseException], None]] = None,
+               on_progress: Optional[Callable[[int, int], None]] = None, name: str = "task",
+               on_cancel: Optional[Callable[[], None]] = None) -> Task:
+        """Run job(task) on a worker; on_done(result) / on_error(exc) run on the Tk thread.
+
+        on_cancel() runs (on the Tk thread) instead when the task is
+        cancelled before its job starts.
+        """
+        task = Task(self, name, job, on_done, on_error, on_progress, on_cancel)
+        self._active.add(task)
+        self._executor.submit(self._run, task)
+        log.debug("TASKS: Submitted '%s' (%d pending)", name, len(self._active))
+        self._ensure_polling()
+        return task
+
+    def call_soon(self, callback: Callable, *args):
+        """Queue callback(*args) to run on the Tk thread (safe from any thread)"""
+        self._callbacks.put((callback, args))
+        if threading.current_thread() is self._main_thread:
+            self._ensure_polling()
+
+    def on_main_thread(self, callback: Callable) -> Callable:
+        """Wrap callback so calls from a worker are marshalled to the Tk thread"""
+        def wrapper(*args):
+            if threading.current_thread() is self._main_thread:
+                callback(*args)
+            else:
+                self.call_soon(callback, *args)
+        return wrapper
+
+    def shutdown(self):
+        """Cancel outstanding tasks and wait for the running one to return"""
+        for task in list(self._active):
+            task.cancel()
+        self._executor.shutdown(wait=True)
+
+    def _run(self, task: Task):
+        # Runs on the worker thread
+        if task.cancelled:
+            log.debug("TASKS: '%s' cancelled before it started", task.name)
+            self._callbacks.put((self._finish, (task, False, None, None)))
+            return
+        try:
+            result = task.job(task)
+        except BaseException as e:
+            log.error("TASKS: '%s' failed: %s", task.name, e)
+            self._callbacks.put((self._finish, (task, True, None, e)))
+        else:
+            self._callbacks.put((self._finish, (task, True, result, None)))
+
+    def _finish(self, task: Task, started: bool, result, error: Optional[BaseException]):
+        # Runs on the Tk thread; a job cancelled midway still reports its (partial) result
+        self._active.discard(task)
+        log.debug("TASKS: '%s' finished (%d pending)", task.name, len(self._active))
+        if error is not None:
+            if task.on_error is not None:
+                task.on_error(error)
+        elif not started:
+            if task.on_cancel is not None:
+                task.on_cancel()
+        elif task.on_done is not None:
+            task.on_done(result)
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def _poll(self):
+        while True:
+            try:
+                callback, args = self._callbacks.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                log.exception("TASKS: Callback %r failed", callback)
+
+        if self._active or not self._callbacks.empty():
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
+
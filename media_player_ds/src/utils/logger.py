@@ -0,0 +1,108 @@
+"""Logging utilities for the media player data structures.
+
+Each data structure traces its operations through its own child of the
+``media_player`` logger (``media_player.bst``, ``media_player.queue``,
+``media_player.hashtable``, ``media_player.stack``, ``media_player.trie``,
+plus ``media_player.catalog``, ``media_player.events``,
+``media_player.tasks`` and ``media_player.db`` for the shared catalog,
+change deltas, background tasks and the database layer), so verbosity can
+be tuned per structure. Messages use %-style arguments and multi-line dumps
+are guarded with ``isEnabledFor``, so when tracing is switched off the hot
+paths skip all string formatting and console I/O.
+
+The default level comes from the ``MEDIA_PLAYER_LOG_LEVEL`` environment
+variable (e.g. ``WARNING`` for quiet production runs) and falls back to
+``DEBUG``, which keeps the step-by-step console output of the demos.
+"""
+import logging
+import os
+import sys
+from contextlib import contextmanager
+from typing import Optional, Union
+
+ROOT_LOGGER_NAME = "media_player"
+LOG_LEVEL_ENV_VAR = "MEDIA_PLAYER_LOG_LEVEL"
+DEFAULT_LEVEL = logging.DEBUG
+
+# Structures that log through media_player.<name>
+STRUCTURES = ("bst", "queue", "hashtable", "stack", "trie", "catalog", "events", "tasks", "db")
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """StreamHandler bound to whatever sys.stdout is at emit time.
+
+    The GUI captures traversal output by swapping sys.stdout, and pytest's
+    capsys does the same, so the stream must not be fixed at import time.
+    """
+
+    def __init__(self):
+        super().__init__(sys.stdout)
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+def _parse_level(level: Union[int, str, None]) -> int:
+    if level is None:
+        return DEFAULT_LEVEL
+    if isinstance(level, int):
+        return level
+    parsed = logging.getLevelName(level.strip().upper())
+    return parsed if isinstance(parsed, int) else DEFAULT_LEVEL
+
+
+def configure(level: Union[int, str, None] = None):
+    """Attach the console handler and set the base level for all structures"""
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if not any(isinstance(h, _StdoutHandler) for h in root.handlers):
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        root.addHandler(handler)
+    root.propagate = False
+
+    if level is None:
+        level = os.environ.get(LOG_LEVEL_ENV_VAR)
+    root.setLevel(_parse_level(level))
+
+
+def get_logger(structure: str) -> logging.Logger:
+    """Return the logger for a data structure, e.g. get_logger("bst")"""
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{structure}")
+
+
+def set_level(level: Union[int, str], structure: Optional[str] = None):
+    """Set the level for one structure, or for all of them when structure is None"""
+    if structure is None:
+        logging.getLogger(ROOT_LOGGER_NAME).setLevel(_parse_level(level))
+        for name in STRUCTURES:
+            get_logger(name).setLevel(logging.NOTSET)
+    else:
+        get_logger(structure).setLevel(_parse_level(level))
+
+
+def set_verbose(verbose: bool, structure: Optional[str] = None):
+    """Switch step-by-step tracing on (DEBUG) or off (WARNING)"""
+    set_level(logging.DEBUG if verbose else logging.WARNING, structure)
+
+
+@contextmanager
+def temporary_level(level: Union[int, str], structure: Optional[str] = None):
+    """Context manager that applies a level and restores the previous one"""
+    logger = logging.getLogger(ROOT_LOGGER_NAME) if structure is None else get_logger(structure)
+    previous = {logger.name: logger.level}
+    if structure is None:
+        previous.update({get_logger(name).name: get_logger(name).level for name in STRUCTURES})
+    set_level(level, structure)
+    try:
+        yield
+    finally:
+        for name, old_level in previous.items():
+            logging.getLogger(name).setLevel(old_level)
+
+
+configure()
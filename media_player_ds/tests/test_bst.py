@@ -1,4 +1,5 @@
 import os, sys
+import random
 import pytest
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -8,6 +9,7 @@ sys.path.insert(0, project_root)
 from src.ds.bst_read import SongBST
 from src.model.song import Song
 from src.db.database import get_all_songs
+from src.utils.logger import temporary_level
 
 
 def test_insert_and_search():
@@ -32,7 +34,10 @@ def test_inorder_traversal(capsys):
     for s in all_songs:
         bst.insert(s)
 
-    bst.inorder_traversal()
+    # The traversal is printed through the bst logger: pin it to DEBUG so the
+    # test also passes under MEDIA_PLAYER_LOG_LEVEL=WARNING
+    with temporary_level("DEBUG", "bst"):
+        bst.inorder_traversal()
 
     captured = capsys.readouterr()
     output_lines = captured.out.strip().split("\n")
@@ -44,4 +49,204 @@ def test_inorder_traversal(capsys):
     ]
     expected_titles = sorted([s.title for s in all_songs])
 
-    assert titles_from_bst == expected_titles
\ No newline at end of file
+    assert titles_from_bst == expected_titles
+
+def _check_avl(node):
+    """Return subtree height, asserting ordering and AVL balance on the way"""
+    if node is None:
+        return 0
+    left = _check_avl(node.left)
+    right = _check_avl(node.right)
+    assert abs(left - right) <= 1
+    assert node.height == 1 + max(left, right)
+    assert node.size == 1 + (node.left.size if node.left else 0) + (node.right.size if node.right else 0)
+    if node.left:
+        assert node.left.song.title < node.song.title
+    if node.right:
+        assert node.right.song.title > node.song.title
+    return node.height
+
+
+def test_sorted_inserts_stay_balanced():
+    bst = SongBST()
+    songs = [Song(song_id=i, title=f"Track {i:05d}", artist="A") for i in range(2000)]
+
+    for s in songs:
+        bst.insert(s)
+
+    assert bst.node_count == 2000
+    assert _check_avl(bst.root) == bst.height()
+    # AVL height bound: h < 1.45 * log2(n + 2)
+    assert bst.height() <= 16
+    assert [s.title for s in bst.inorder_traversal()] == [s.title for s in songs]
+    assert bst.search_by_title("Track 01234").id == 1234
+    assert bst.search_by_title("Missing") is None
+
+
+def test_duplicate_title_is_skipped():
+    bst = SongBST()
+    bst.insert(Song(song_id=1, title="Same", artist="First"))
+    bst.insert(Song(song_id=2, title="Same", artist="Second"))
+
+    assert bst.node_count == 1
+    assert bst.search_by_title("Same").artist == "First"
+
+
+def test_legacy_insert_is_balanced():
+    from src.ds.bst_read import insert
+
+    root = None
+    for i in range(1024):
+        root = insert(root, {"id": i, "title": f"Song {i:04d}", "artist": "A"})
+
+    assert _check_avl(root) <= 11
+
+
+def test_from_sorted_builds_balanced_tree():
+    songs = [Song(song_id=i, title=f"Track {i:05d}", artist="A") for i in range(1000)]
+    bst = SongBST.from_sorted(songs)
+
+    assert bst.node_count == 1000
+    assert _check_avl(bst.root) == bst.height() == 10
+    assert bst.inorder_traversal() == songs
+    assert bst.search_by_title("Track 00999") is songs[-1]
+
+    # The bulk-loaded tree keeps balancing on later inserts
+    bst.insert(Song(song_id=1000, title="Track 01000", artist="A"))
+    assert _check_avl(bst.root) == bst.height()
+
+
+def test_from_sorted_skips_duplicates_and_handles_empty():
+    songs = [
+        Song(song_id=1, title="A", artist="First"),
+        Song(song_id=2, title="A", artist="Second"),
+        Song(song_id=3, title="B", artist="Third"),
+    ]
+    bst = SongBST.from_sorted(songs)
+    assert bst.node_count == 2
+    assert bst.search_by_title("A").artist == "First"
+
+    assert SongBST.from_sorted([]).root is None
+
+
+def test_delete_keeps_tree_balanced():
+    songs = [Song(song_id=i, title=f"Track {i:04d}", artist="A") for i in range(500)]
+    bst = SongBST.from_sorted(songs)
+
+    rng = random.Random(7)
+    doomed = rng.sample(songs, 300)
+    for s in doomed:
+        assert bst.delete(s.title) is s
+        _check_avl(bst.root)
+
+    remaining = sorted(set(s.title for s in songs) - set(s.title for s in doomed))
+    assert bst.node_count == len(remaining)
+    assert [s.title for s in bst.inorder_traversal()] == remaining
+    assert bst.delete("Track 9999") is None
+
+
+def test_delete_only_removes_the_indexed_song():
+    first = Song(song_id=1, title="Same Title", artist="A")
+    second = Song(song_id=2, title="Same Title", artist="B")
+    bst = SongBST()
+    bst.insert(first)
+    bst.insert(second)  # duplicate title, not indexed
+
+    assert bst.delete("Same Title", second) is None
+    assert bst.delete("Same Title", first) is first
+    assert bst.root is None
+
+
+def test_range_prefix_and_neighbours():
+    titles = ["Alpha", "Mambo", "Mango", "Money", "Moon", "Night", "Zebra"]
+    bst = SongBST()
+    for i, title in enumerate(reversed(titles)):
+        bst.insert(Song(song_id=i, title=title, artist="A"))
+
+    assert [s.title for s in bst.range("Mango", "Night")] == ["Mango", "Money", "Moon"]
+    assert [s.title for s in bst.range(hi="Mango")] == ["Alpha", "Mambo"]
+    assert [s.title for s in bst.range()] == titles
+    assert [s.title for s in bst.prefix("M")] == ["Mambo", "Mango", "Money", "Moon"]
+    assert [s.title for s in bst.prefix("Mo")] == ["Money", "Moon"]
+    assert list(bst.prefix("Q")) == []
+
+    assert bst.successor("Mango").title == "Money"
+    assert bst.successor("N").title == "Night"
+    assert bst.successor("Zebra") is None
+    assert bst.predecessor("Mango").title == "Mambo"
+    assert bst.predecessor("Alpha") is None
+
+
+def test_kth_and_rank_follow_inserts_and_deletes():
+    songs = [Song(song_id=i, title=f"Track {i:04d}", artist="A") for i in range(300)]
+    bst = SongBST.from_sorted(songs)
+
+    rng = random.Random(3)
+    for s in rng.sample(songs, 100):
+        bst.delete(s.title)
+    extra = [Song(song_id=1000 + i, title=f"Extra {i:03d}", artist="B") for i in range(50)]
+    for s in extra:
+        bst.insert(s)
+    _check_avl(bst.root)
+
+    ordered = bst.inorder_traversal()
+    assert bst.root.size == bst.node_count == len(ordered)
+    for i, song in enumerate(ordered):
+        assert bst.kth(i) is song
+        assert bst.rank(song.title) == i
+    assert bst.kth(-1) is ordered[-1]
+    assert bst.rank("Track") == len(extra)
+
+    with pytest.raises(IndexError):
+        bst.kth(len(ordered))
+
+
+def test_update_key_moves_or_rekeys_in_place():
+    songs = [Song(song_id=i, title=f"Track {i:03d}", artist="A") for i in range(100)]
+    bst = SongBST.from_sorted(songs)
+    root = bst.root
+
+    # Still between Track 049 and Track 051: same node, new key
+    assert bst.update_key("Track 050", "Track 050b") is songs[50]
+    assert bst.root is root and root.song is songs[50]
+
+    # Moves to the front; the song object carries the new title
+    assert bst.update_key("Track 070", "A Track") is songs[70]
+    assert songs[70].title == "A Track"
+    assert bst.kth(0) is songs[70]
+    _check_avl(bst.root)
+    assert bst.node_count == 100
+
+    # Title already changed on the object (as SongTable.update_song does)
+    songs[20].title = "Zulu"
+    assert bst.update_key("Track 020", "Zulu", songs[20]) is songs[20]
+    titles = [s.title for s in bst.inorder_traversal()]
+    assert titles == sorted(titles) and titles[-1] == "Zulu"
+
+    assert bst.update_key("Missing", "Other") is None
+    # Colliding with an indexed title drops the moved song, like a duplicate insert
+    assert bst.update_key("Track 030", "Track 031") is None
+    assert bst.search_by_title("Track 031") is songs[31]
+    assert bst.node_count == 99
+
+
+def test_from_sorted_streams_with_a_count():
+    songs = [Song(song_id=i, title=f"Track {i:04d}", artist="A") for i in range(1000)]
+
+    bst = SongBST.from_sorted(iter(songs), len(songs))
+    assert bst.node_count == 1000
+    assert _check_avl(bst.root) == bst.height() == 10
+    assert bst.inorder_traversal() == songs
+
+    # Duplicates make the stream come up short: the tree is rebuilt balanced
+    with_duplicates = [s for song in songs[:300] for s in (song, Song(title=song.title, artist="B"))]
+    bst = SongBST.from_sorted(iter(with_duplicates), len(with_duplicates))
+    assert bst.node_count == 300
+    assert _check_avl(bst.root) == bst.height()
+    assert bst.inorder_traversal() == songs[:300]
+
+    # More songs than announced: the extra ones are inserted
+    bst = SongBST.from_sorted(iter(songs), 600)
+    assert bst.node_count == 1000
+    assert _check_avl(bst.root) == bst.height()
+    assert bst.inorder_traversal() == songs
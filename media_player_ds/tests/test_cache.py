@@ -0,0 +1,46 @@
+import pytest
+
+from src.db.cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=3)
+    for key in "abc":
+        cache.put(key, key.upper())
+    assert cache.get("a") == "A"  # a is now the most recently used
+    cache.put("d", "D")
+
+    assert "b" not in cache
+    assert [key for key in "acd" if key in cache] == ["a", "c", "d"]
+    assert cache.get("b") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (1, 1, 1, 3)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_byte_limit_and_oversized_values():
+    cache = LRUCache(max_entries=100, max_bytes=300, sizeof=len)
+    assert cache.put("a", "x" * 120)
+    assert cache.put("b", "x" * 120)
+    assert cache.put("c", "x" * 120)  # 360 bytes: a goes
+    assert "a" not in cache and cache.bytes == 240
+    assert not cache.put("huge", "x" * 301)
+    assert "huge" not in cache and len(cache) == 2
+
+
+def test_invalidation_blocks_stale_puts():
+    cache = LRUCache(max_entries=10)
+    cache.put(1, ("row", 1))
+
+    generation = cache.generation  # a reader misses on 2 and starts its query...
+    cache.invalidate(1)            # ...while a writer commits
+    assert not cache.put(2, ("old row", 2), generation)
+    assert 1 not in cache and 2 not in cache
+    assert cache.put(2, ("new row", 2), cache.generation)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.bytes == 0
+    assert cache.stats()["invalidations"] == 2
+
+    with pytest.raises(ValueError):
+        LRUCache(max_entries=0)
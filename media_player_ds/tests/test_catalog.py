@@ -0,0 +1,103 @@
+import pytest
+
+from src.db import connection, database
+from src.ds import bst_read
+from src.ds.catalog import SongCatalog
+from src.ds.events import ADDED, REMOVED, UPDATED
+from src.ds.stack_delete import DeleteStack
+from src.model.song import Song
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the database layer at a fresh file for each test"""
+    db_path = str(tmp_path / "songs.db")
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+    database.init_db()
+    database.insert_songs_bulk([
+        Song(title="Yesterday", artist="The Beatles", album="Help!", duration=125,
+             file_path="/m/yesterday.mp3", genre="Pop", year=1965),
+        Song(title="Imagine", artist="John Lennon", album="Imagine", duration=183,
+             file_path="/m/imagine.mp3", genre="Rock", year=1971),
+    ])
+    yield db_path
+    connection.close_connection(db_path)
+
+
+def test_catalog_loads_every_column_once_and_shares_songs(temp_db):
+    catalog = SongCatalog()
+    assert catalog.load()
+    assert len(catalog) == 2
+
+    by_title = catalog.bst.search_by_title("Imagine")
+    by_id = catalog.get_song(by_title.id)
+    assert by_title is by_id
+    assert (by_id.duration, by_id.genre, by_id.file_path) == (183, "Rock", "/m/imagine.mp3")
+    assert [s.title for s in catalog.songs_by_id()] == ["Yesterday", "Imagine"]
+
+
+def test_rebuild_bst_uses_in_memory_songs(temp_db):
+    catalog = SongCatalog()
+    catalog.load()
+    catalog.table.remove_song(catalog.bst.search_by_title("Yesterday").id)
+
+    catalog.rebuild_bst()
+    assert [s.title for s in catalog.bst.inorder_traversal()] == ["Imagine"]
+
+
+def test_legacy_get_all_songs_keeps_all_columns(temp_db):
+    songs = bst_read.get_all_songs()
+    assert {s.genre for s in songs} == {"Pop", "Rock"}
+    assert {s.duration for s in songs} == {125, 183}
+
+
+def test_title_update_moves_song_in_bst_without_reload(temp_db):
+    catalog = SongCatalog()
+    catalog.load()
+    seen = []
+    catalog.changes.subscribe(seen.append)
+    song = catalog.bst.search_by_title("Yesterday")
+
+    assert catalog.table.update_song(song.id, title="Across the Universe")
+    assert catalog.bst.search_by_title("Yesterday") is None
+    assert catalog.bst.search_by_title("Across the Universe") is song
+    assert [(c.kind, c.old_values["title"]) for c in seen] == [(UPDATED, "Yesterday")]
+    assert database.get_song_by_id(song.id).title == "Across the Universe"
+
+
+def test_delete_and_restore_are_applied_as_deltas(temp_db):
+    catalog = SongCatalog()
+    catalog.load()
+    stack = DeleteStack()
+    stack.changes.subscribe(catalog.apply_change)
+    seen = []
+    catalog.changes.subscribe(lambda change: seen.append(change.kind))
+    song = catalog.bst.search_by_title("Imagine")
+
+    assert stack.push_song(song)
+    assert catalog.get_song(song.id) is None
+    assert catalog.bst.search_by_title("Imagine") is None
+
+    restored = stack.pop_song()
+    assert stack.restore_song_to_database(restored)
+    assert catalog.get_song(restored.id) is restored
+    assert catalog.bst.search_by_title("Imagine") is restored
+    assert seen == [REMOVED, ADDED]
+
+
+def test_retitle_deep_in_a_large_catalog_keeps_bst_ordered():
+    songs = [Song(song_id=i, title=f"Track {i:03d}", artist="A") for i in range(200)]
+    catalog = SongCatalog()
+    catalog.load_from_list(songs)
+
+    # Stays between its neighbours: re-keyed in place
+    assert catalog.table.update_song(10, title="Track 010 (Live)", persist=False)
+    # Jumps to the other end of the title order: moved in the tree
+    assert catalog.table.update_song(11, title="Zz Last", persist=False)
+
+    titles = [s.title for s in catalog.bst.inorder_traversal()]
+    assert titles == sorted(titles)
+    assert titles[10:12] == ["Track 010 (Live)", "Track 012"] and titles[-1] == "Zz Last"
+    assert catalog.bst.search_by_title("Zz Last") is songs[11]
+    assert catalog.bst.search_by_title("Track 011") is None
+    assert catalog.bst.node_count == 200
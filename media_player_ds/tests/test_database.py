@@ -0,0 +1,429 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+import pytest
+
+from src.db import connection, database
+from src.model.song import Song
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Point the database layer at a fresh file for each test"""
+    db_path = str(tmp_path / "songs.db")
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+    database.init_db()
+    yield db_path
+    connection.close_connection(db_path)
+
+
+def test_crud_round_trip(temp_db):
+    song = Song(title="Hotel California", artist="Eagles", album="Hotel California",
+                duration=391, genre="Rock", year=1976)
+    assert database.insert_song_to_db(song)
+    assert song.id is not None
+
+    stored = database.get_song_by_id(song.id)
+    assert (stored.title, stored.duration, stored.genre) == ("Hotel California", 391, "Rock")
+
+    song.artist = "The Eagles"
+    assert database.update_song_in_db(song)
+    assert database.get_song_by_id(song.id).artist == "The Eagles"
+    assert [s.id for s in database.search_songs("eagles")] == [song.id]
+
+    assert database.delete_song_from_db(song.id)
+    assert database.get_song_by_id(song.id) is None
+    assert not database.delete_song_from_db(song.id)
+    assert not database.update_song_in_db(song)
+
+
+def test_song_cache_serves_fresh_copies_and_follows_writes(temp_db):
+    song = Song(title="Roxanne", artist="The Police")
+    database.insert_song_to_db(song)
+    database.clear_song_cache()
+    database._song_cache.reset_stats()
+
+    first = database.get_song_by_id(song.id)
+    second = database.get_song_by_id(song.id)
+    assert first is not second
+    first.title = "Changed in memory only"
+    assert database.get_song_by_id(song.id).title == "Roxanne"
+    stats = database.song_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    song.title = "Roxanne (Live)"
+    database.update_song_in_db(song)
+    assert database.get_song_by_id(song.id).title == "Roxanne (Live)"
+
+    deleted = database.delete_songs_from_db([song.id])
+    assert database.get_song_by_id(song.id) is None
+    database.restore_songs_to_db(deleted)
+    assert database.get_song_by_id(song.id).title == "Roxanne (Live)"
+    database.delete_song_from_db(song.id)
+    assert database.get_song_by_id(song.id) is None
+
+    # Missing ids are never cached, so a later insert is seen at once
+    other = Song(title="Message in a Bottle", artist="The Police")
+    database.insert_songs_bulk([other])
+    assert database.get_song_by_id(other.id).title == "Message in a Bottle"
+
+
+def test_search_cache_is_keyed_by_normalized_query_and_write_generation(temp_db):
+    songs = [Song(title="Hotel California", artist="Eagles"), Song(title="Take It Easy", artist="Eagles")]
+    database.insert_songs_bulk(songs)
+    database.clear_search_cache()
+    database._search_cache.reset_stats()
+
+    first = database.search_songs("hotel cal")
+    assert [s.id for s in database.search_songs("  Hotel   CAL ")] == [songs[0].id]
+    assert database.search_songs("hotel cal")[0] is not first[0]
+    stats = database.search_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+
+    assert database.count_search_results("eagles") == 2
+    page = database.get_songs_page(limit=1, order_by=database.ORDER_BY_RANK, query="eagles")
+    again = database.get_songs_page(limit=1, order_by=database.ORDER_BY_RANK, query="EAGLES")
+    assert again.cursors == page.cursors and again.songs[0] is not page.songs[0]
+    assert database.search_cache_stats()["hits"] == 3
+
+    # Each write moves the generation: the next search sees it, without touching other entries
+    generation = database.write_generation()
+    extra = Song(title="Hotel Yorba", artist="The White Stripes")
+    database.insert_song_to_db(extra)
+    assert database.write_generation() == generation + 1
+    assert {s.id for s in database.search_songs("hotel")} == {songs[0].id, extra.id}
+    assert database.count_search_results("eagles") == 2
+
+    extra.title = "Fell in Love with a Girl"
+    database.update_song_in_db(extra)
+    assert [s.id for s in database.search_songs("hotel")] == [songs[0].id]
+    database.delete_song_from_db(songs[0].id)
+    assert database.search_songs("hotel") == []
+    assert database.count_search_results("eagles") == 1
+    assert database.write_generation() == generation + 3
+
+
+def test_connection_is_reused_per_thread(temp_db):
+    conn = connection.get_connection(temp_db)
+    database.get_all_songs()
+    assert connection.get_connection(temp_db) is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    worker = threading.Thread(target=lambda: other.append(connection.get_connection(temp_db)))
+    worker.start()
+    worker.join()
+    assert other[0] is not conn
+    connection.close_all()
+
+
+def test_failed_write_rolls_back(temp_db):
+    with pytest.raises(ValueError):
+        with connection.transaction(temp_db) as conn:
+            conn.execute("INSERT INTO songs (title, artist) VALUES ('Ghost', 'Nobody')")
+            raise ValueError("abort")
+
+    assert database.get_all_songs() == []
+
+
+def test_bulk_insert_assigns_ids_across_chunks(temp_db):
+    songs = [Song(title=f"Song {i:03d}", artist="Bulk", year=2000 + i % 20) for i in range(250)]
+
+    inserted, failed = database.insert_songs_bulk(songs, chunk_size=64)
+
+    assert inserted == 250
+    assert failed == []
+    assert [s.id for s in songs] == list(range(1, 251))
+    assert database.get_song_by_id(songs[200].id).title == "Song 200"
+
+
+def test_bulk_insert_reports_row_failures(temp_db):
+    songs = [Song(title=f"Song {i}", artist="Bulk") for i in range(10)]
+    songs[3].title = None  # violates NOT NULL
+
+    inserted, failed = database.insert_songs_bulk(songs, chunk_size=4)
+
+    assert inserted == 9
+    assert [song for song, _ in failed] == [songs[3]]
+    assert "NOT NULL" in failed[0][1]
+    assert len(database.get_all_songs()) == 9
+    assert all(database.get_song_by_id(s.id).title == s.title for s in songs if s is not songs[3])
+
+
+def test_bulk_insert_rollback_clears_assigned_ids(temp_db, monkeypatch):
+    songs = [Song(title=f"Song {i}", artist="Bulk") for i in range(10)]
+
+    def fail(conn, after_id):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    # Fails after every chunk was written and given ids
+    monkeypatch.setattr(database.search_index, "index_rows_after", fail)
+    inserted, failed = database.insert_songs_bulk(songs, chunk_size=4)
+
+    assert inserted == 0
+    assert [song for song, _ in failed] == songs
+    assert all(song.id is None for song in songs)
+    assert database.get_all_songs() == []
+
+
+def test_bulk_insert_keeps_search_index_in_sync(temp_db):
+    database.insert_song_to_db(Song(title="Before Bulk", artist="A"))
+    songs = [Song(title=f"Bulk Song {i}", artist="Bulk Artist") for i in range(50)]
+    database.insert_songs_bulk(songs, chunk_size=20)
+
+    assert len(database.search_songs("bulk song")) == 50
+    assert [s.title for s in database.search_songs("before")] == ["Before Bulk"]
+
+    # Per-row indexing is back on once the bulk load has committed
+    later = Song(title="After Bulk", artist="A")
+    database.insert_song_to_db(later)
+    assert [s.id for s in database.search_songs("after")] == [later.id]
+
+
+def test_search_uses_prefixes_and_ranks_title_hits_first(temp_db):
+    in_album = Song(title="Wasted Time", artist="Eagles", album="Hotel California")
+    in_title = Song(title="Hotel California", artist="Eagles", album="Hotel California")
+    other = Song(title="Imagine", artist="John Lennon", album="Imagine")
+    database.insert_songs_bulk([in_album, in_title, other])
+
+    assert [s.id for s in database.search_songs("hotel")] == [in_title.id, in_album.id]
+    assert [s.id for s in database.search_songs("Cal hot")] == [in_title.id, in_album.id]
+    assert [s.id for s in database.search_songs("lenn")] == [other.id]
+    assert database.search_songs("zeppelin") == []
+
+
+def test_search_index_follows_updates_and_deletes(temp_db):
+    song = Song(title="Yesterday", artist="The Beatles", album="Help!")
+    database.insert_song_to_db(song)
+
+    song.title = "Tomorrow"
+    database.update_song_in_db(song)
+    assert database.search_songs("yesterday") == []
+    assert [s.id for s in database.search_songs("tomorrow")] == [song.id]
+
+    database.delete_song_from_db(song.id)
+    assert database.search_songs("tomorrow") == []
+
+
+def test_search_index_rebuild_and_like_fallback(temp_db):
+    conn = connection.get_connection(temp_db)
+    conn.execute("INSERT INTO songs (title, artist) VALUES ('Dream On', 'Aerosmith')")
+    conn.execute("DELETE FROM songs_fts")  # simulate an index that drifted out of sync
+    conn.commit()
+    assert database.search_songs("dream") == []
+
+    assert database.rebuild_search_index()
+    assert [s.title for s in database.search_songs("dream")] == ["Dream On"]
+
+    # No searchable words: falls back to a substring scan
+    assert database.search_songs("!!") == []
+    conn.execute("UPDATE songs SET title = 'Dream On!!'")
+    conn.commit()
+    database.invalidate_caches()  # raw SQL: the write generation did not move
+    assert [s.title for s in database.search_songs("!!")] == ["Dream On!!"]
+
+
+def test_keyset_pages_by_id(temp_db):
+    songs = [Song(title=f"Song {i}", artist="A") for i in range(10)]
+    database.insert_songs_bulk(songs)
+    ids = [s.id for s in songs]
+    database.delete_song_from_db(ids[3])
+    remaining = ids[:3] + ids[4:]
+
+    assert [s.id for s in database.get_songs_after_id(None, 4)] == remaining[:4]
+    assert [s.id for s in database.get_songs_after_id(remaining[3], 4)] == remaining[4:8]
+    assert [s.id for s in database.get_songs_after_id(remaining[-1], 4)] == []
+    assert [s.id for s in database.get_songs_before_id(remaining[5], 3)] == remaining[2:5]
+    assert database.get_song_id_at(3) == remaining[3]
+    assert database.get_song_id_at(99) is None
+    assert database.count_songs() == 9
+
+
+def test_keyset_pages_by_title_survive_deletes(temp_db):
+    # Duplicate (title, artist) pairs: id breaks the tie
+    songs = [Song(title=f"Track {i % 4}", artist="Same" if i % 2 else "Other") for i in range(12)]
+    database.insert_songs_bulk(songs)
+    expected = [s.id for s in sorted(songs, key=lambda s: (s.title, s.artist, s.id))]
+
+    first = database.get_songs_page(limit=5)
+    assert [s.id for s in first.songs] == expected[:5]
+    assert first.last == (first.songs[-1].title, first.songs[-1].artist, first.songs[-1].id)
+
+    # The cursor stays valid when the song it was taken from is deleted
+    database.delete_song_from_db(expected[4])
+    second = database.get_songs_page(after=first.last, limit=5)
+    assert [s.id for s in second.songs] == expected[5:10]
+    back = database.get_songs_page(before=second.first, limit=3)
+    assert [s.id for s in back.songs] == expected[1:4]
+
+    remaining = expected[:4] + expected[5:]
+    assert database.get_page_cursor_at(4) == second.first
+    assert [s.id for s in database.get_songs_page(after=database.get_page_cursor_at(9)).songs] == remaining[10:]
+    assert database.get_page_cursor_at(99) is None
+
+    with pytest.raises(ValueError):
+        database.get_songs_page(after=(1,), order_by=database.ORDER_BY_TITLE)
+    with pytest.raises(ValueError):
+        database.get_songs_page(order_by=database.ORDER_BY_RANK)
+
+
+def test_search_pages_in_rank_order(temp_db):
+    songs = [Song(title=f"Other {i}", artist="Band", album=f"Blue {i}") for i in range(6)]
+    songs += [Song(title=f"Blue {i}", artist="Band") for i in range(6)]
+    songs.append(Song(title="Red", artist="Band"))
+    database.insert_songs_bulk(songs)
+
+    ranked = [s.id for s in database.search_songs("blue")]
+    assert database.count_search_results("blue") == len(ranked) == 12
+
+    page = database.get_songs_page(limit=5, order_by=database.ORDER_BY_RANK, query="blue")
+    pages = [s.id for s in page.songs]
+    for _ in range(len(ranked)):  # bounded, so a cursor that never advances fails instead of hanging
+        page = database.get_songs_page(after=page.last, limit=5, order_by=database.ORDER_BY_RANK, query="blue")
+        if not page.songs:
+            break
+        pages += [s.id for s in page.songs]
+    assert pages == ranked
+
+    cursor = database.get_page_cursor_at(6, database.ORDER_BY_RANK, "blue")
+    back = database.get_songs_page(before=cursor, limit=4, order_by=database.ORDER_BY_RANK, query="blue")
+    assert [s.id for s in back.songs] == ranked[2:6]
+
+    # Filtered pages in title order too
+    titles = database.get_songs_page(limit=3, query="blue")
+    assert [s.title for s in titles.songs] == ["Blue 0", "Blue 1", "Blue 2"]
+
+
+def test_bulk_delete_and_restore_keep_ids(temp_db):
+    songs = [Song(title=f"Cleanup {i}", artist="Band", album="Album", year=2000 + i) for i in range(5)]
+    database.insert_songs_bulk(songs)
+    ids = [song.id for song in songs]
+    stored_at = database.get_song_by_id(ids[3]).created_at
+
+    deleted = database.delete_songs_from_db([ids[3], ids[1], 9999, ids[3]])
+    assert [song.id for song in deleted] == [ids[3], ids[1]]
+    assert deleted[0].year == 2003
+    assert database.count_songs() == 3
+    assert database.search_songs("cleanup 3") == []
+
+    assert database.restore_songs_to_db(deleted) == (2, [])
+    assert database.get_song_by_id(ids[3]).title == "Cleanup 3"
+    assert database.get_song_by_id(ids[3]).created_at == stored_at
+    assert [song.id for song in database.search_songs("cleanup")] != []
+    assert database.count_songs() == 5
+
+    # Restoring a song whose id is taken only rejects that song
+    new = Song(song_id=50, title="New", artist="Band", created_at=datetime(2024, 5, 6, 7, 8, 9, 123456))
+    restored, failed = database.restore_songs_to_db([deleted[0], new])
+    assert restored == 1
+    assert [song.id for song, _ in failed] == [ids[3]]
+    # A datetime is stored the way CURRENT_TIMESTAMP writes it
+    assert database.get_song_by_id(50).created_at == "2024-05-06 07:08:09"
+
+
+def test_migrations_upgrade_a_legacy_database(tmp_path, monkeypatch):
+    from src.db import migrations, search_index
+
+    # A database written before schema versioning: tables present, user_version 0
+    db_path = str(tmp_path / "legacy.db")
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+    conn = connection.get_connection(db_path)
+    migrations._create_songs(conn)
+    search_index.create_search_index(conn)
+    conn.execute("INSERT INTO songs (title, artist) VALUES ('Old Song', 'Old Band')")
+    conn.commit()
+    assert migrations.schema_version(conn) == 0
+
+    database.init_db()
+    assert migrations.schema_version(conn) == migrations.LATEST_VERSION
+    assert [s.title for s in database.get_all_songs()] == ["Old Song"]
+    assert [s.title for s in database.search_songs("old")] == ["Old Song"]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_songs_title_keyset", "idx_deleted_songs_area"} <= indexes
+
+    # Already current: nothing to do
+    database.init_db()
+    assert migrations.schema_version(conn) == migrations.LATEST_VERSION
+
+    # A newer schema than this code knows about is left untouched
+    conn.execute(f"PRAGMA user_version = {migrations.LATEST_VERSION + 1}")
+    conn.commit()
+    database.init_db()
+    assert migrations.schema_version(conn) == migrations.LATEST_VERSION + 1
+    connection.close_connection(db_path)
+
+
+def _query_plan(conn, sql):
+    # Traced SQL has its parameters filled in on newer Pythons; bind NULLs otherwise
+    return [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, [None] * sql.count("?"))]
+
+
+def test_hot_queries_use_indexes(temp_db):
+    conn = connection.get_connection(temp_db)
+    statements = []
+    conn.set_trace_callback(statements.append)
+    try:
+        songs = [Song(title=f"Plan {i}", artist=f"Band {i % 3}", year=1990 + i) for i in range(20)]
+        database.insert_songs_bulk(songs)
+        database.insert_song_to_db(Song(title="Single", artist="Solo"))
+        database.get_all_songs()
+        database.get_song_by_id(songs[0].id)
+        database.get_songs_after_id(songs[4].id, 5)
+        database.get_songs_before_id(songs[9].id, 5)
+        database.get_song_id_at(3)
+        page = database.get_songs_page(limit=5)
+        database.get_songs_page(after=page.last, limit=5)
+        database.get_songs_page(before=page.last, limit=5)
+        database.get_page_cursor_at(7)
+        database.get_songs_page(limit=5, query="plan", order_by=database.ORDER_BY_RANK)
+        database.count_search_results("plan")
+        database.count_songs()
+        database.search_songs("plan")
+        database.search_songs("!!")  # no words: LIKE fallback
+        songs[1].title = "Plan One"
+        database.update_song_in_db(songs[1])
+        database.delete_song_from_db(songs[2].id)
+        deleted = database.delete_songs_from_db([songs[3].id, songs[4].id])
+        database.restore_songs_to_db(deleted)
+        database.spill_deleted_songs("session", deleted)
+        database.get_deleted_songs_page("session", 0, 10)
+        database.count_deleted_songs("session")
+        database.flush_deleted_session()
+        database.take_deleted_songs("history", 1)
+        database.clear_deleted_songs("history")
+    finally:
+        conn.set_trace_callback(None)
+
+    queries = [sql for sql in statements
+               if sql.lstrip().split(None, 1)[0].upper() in ("SELECT", "INSERT", "UPDATE", "DELETE")]
+    assert queries
+    for sql in queries:
+        if "restore_staging" in sql:
+            continue  # reads the staged restore batch, sorted by id on purpose
+        for detail in _query_plan(conn, sql):
+            if detail == "SCAN CONSTANT ROW" or "sqlite_master" in detail:
+                continue  # no table, the schema catalogue
+            # Every table read is a primary key / index search or a scan of an index,
+            # except COUNT(*) and id-order offset jumps, which walk the rowid b-tree itself
+            rowid_walk = sql == "SELECT COUNT(*) FROM songs" or ("OFFSET" in sql and "ORDER BY songs.id" in sql)
+            if detail.startswith("SCAN ") and not rowid_walk:
+                assert "INDEX" in detail, (sql, detail)
+            # Only BM25 ranking needs a sort; every other ORDER BY is served by an index
+            if "TEMP B-TREE" in detail:
+                assert "bm25" in sql, (sql, detail)
+
+
+def test_streaming_readers_match_the_list_apis(temp_db):
+    songs = [Song(title=f"Stream {i % 7} {i}", artist=f"Band {i % 3}") for i in range(25)]
+    database.insert_songs_bulk(songs)
+
+    stream = database.iter_songs(batch_size=4)
+    first = next(stream)
+    assert first.title == min(s.title for s in songs)
+    assert [s.id for s in [first] + list(stream)] == [s.id for s in database.get_all_songs()]
+
+    matches = list(database.iter_search("stream 3", batch_size=2))
+    assert [s.id for s in matches] == [s.id for s in database.search_songs("stream 3")]
+    assert {s.title.split()[1] for s in matches} == {"3"}
+    assert list(database.iter_search("nothing here")) == []
@@ -8,6 +8,7 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.dirname(current_dir)
 sys.path.insert(0, project_root)
 
+from src.ds.events import UPDATED
 from src.ds.hashtable_update import SongTable
 from src.model.song import Song
 
@@ -113,3 +114,50 @@ def test_table_structure(song_table):
         assert hasattr(song, "title")
         assert hasattr(song, "artist")
         assert hasattr(song, "duration")
+
+
+def test_find_by_secondary_indexes(song_table):
+    assert {s.id for s in song_table.find_by("genre", " ROCK ")} == {"S001", "S002"}
+    assert [s.id for s in song_table.find_by("year", 1975)] == ["S002"]
+    assert song_table.find_by("artist", "Nobody") == []
+    with pytest.raises(ValueError):
+        song_table.find_by("title", "Imagine")
+
+
+def test_secondary_indexes_follow_changes(song_table):
+    # Build the indexes first so every change below has to keep them in step
+    song_table.find_by("artist", "Queen")
+    song_table.find_by("year", 1971)
+
+    song_table.update_song("S002", artist="Freddie Mercury", year=1976)
+    assert song_table.find_by("artist", "Queen") == []
+    assert [s.id for s in song_table.find_by("artist", "freddie mercury")] == ["S002"]
+    assert [s.id for s in song_table.find_by("year", 1976)] == ["S002"]
+
+    song_table.add_song(Song(song_id="S003", title="Heroes", artist="David Bowie", year=1976))
+    song_table.load_from_list([Song(song_id="S001", title="Imagine", artist="Lennon", year=1971)])
+    assert {s.id for s in song_table.find_by("year", 1976)} == {"S002", "S003"}
+    assert song_table.find_by("artist", "John Lennon") == []
+    assert [s.id for s in song_table.find_by("artist", "Lennon")] == ["S001"]
+
+    song_table.remove_song("S003")
+    assert [s.id for s in song_table.find_by("year", 1976)] == ["S002"]
+    assert song_table.facet_counts("artist") == {"lennon": 1, "freddie mercury": 1}
+
+
+def test_refresh_song_reindexes(song_table, monkeypatch):
+    song_table.find_by("album", "Imagine")
+    refreshed = Song(song_id="S001", title="Imagine", artist="John Lennon", album="Imagine (Remastered)",
+                     genre="Rock", year=1971, duration=183, file_path="/music/imagine.mp3")
+    monkeypatch.setitem(sys.modules, "src.db.database",
+                        type("mockmod", (), {"get_song_by_id": staticmethod(lambda song_id: refreshed)}))
+
+    song = song_table.get_song("S001")
+    changes = []
+    song_table.changes.subscribe(changes.append)
+
+    assert song_table.refresh_song("S001")
+    assert song_table.find_by("album", "Imagine") == []
+    assert song_table.find_by("album", "imagine (remastered)") == [song]
+    assert song.album == "Imagine (Remastered)"
+    assert changes == [(UPDATED, song, {"album": "Imagine"})]
@@ -0,0 +1,43 @@
+import logging
+
+from src.ds.bst_read import SongBST
+from src.ds.queue_create import SongQueue
+from src.model.song import Song
+from src.utils.logger import get_logger, set_level, temporary_level
+
+
+def test_quiet_mode_prints_nothing(capsys):
+    with temporary_level(logging.WARNING):
+        bst = SongBST()
+        bst.insert(Song(song_id=1, title="Quiet", artist="A"))
+        assert bst.search_by_title("Quiet").id == 1
+
+    assert capsys.readouterr().out == ""
+
+
+def test_verbose_mode_writes_to_current_stdout(capsys):
+    with temporary_level(logging.DEBUG):
+        SongQueue().enqueue_song(Song(song_id=1, title="Loud", artist="B"))
+
+    assert "QUEUE ENQUEUE: Adding 'Loud' by B" in capsys.readouterr().out
+
+
+def test_per_structure_levels(capsys):
+    with temporary_level(logging.DEBUG):
+        set_level(logging.WARNING, "bst")
+        SongBST().insert(Song(song_id=1, title="Hidden", artist="A"))
+        SongQueue().enqueue_song(Song(song_id=2, title="Shown", artist="B"))
+
+    output = capsys.readouterr().out
+    assert "Hidden" not in output
+    assert "Shown" in output
+    assert get_logger("bst").level == logging.NOTSET
+
+
+def test_messages_are_formatted_lazily():
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted while tracing was disabled")
+
+    with temporary_level(logging.WARNING):
+        get_logger("bst").debug("BST: %s", Exploding())
@@ -0,0 +1,100 @@
+import random
+
+import pytest
+
+from src.ds.hashtable_update import SongTable
+from src.ds.open_addressing import OpenAddressingTable
+from src.model.song import Song
+
+
+class CollidingKey:
+    """Key whose hash is chosen by the test, to force long probe runs"""
+    def __init__(self, name, hash_value):
+        self.name = name
+        self.hash_value = hash_value
+
+    def __hash__(self):
+        return self.hash_value
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.name == self.name
+
+
+def test_behaves_like_dict_under_random_operations():
+    rng = random.Random(18)
+    table, expected = OpenAddressingTable(), {}
+    for _ in range(20_000):
+        key = rng.randrange(2_000)
+        action = rng.random()
+        if action < 0.5:
+            table[key] = expected[key] = rng.random()
+        elif action < 0.8:
+            assert table.pop(key, None) == expected.pop(key, None)
+        else:
+            assert table.get(key) == expected.get(key)
+            assert (key in table) == (key in expected)
+
+    assert len(table) == len(expected)
+    assert dict(table.items()) == expected
+    assert sorted(table.values()) == sorted(expected.values())
+    assert table.load_factor <= table.max_load
+
+
+def test_tombstones_keep_probe_runs_reachable_and_compact():
+    table = OpenAddressingTable(capacity=16)
+    keys = [CollidingKey(f"k{i}", 3) for i in range(5)]  # all share home slot 3
+    for i, key in enumerate(keys):
+        table[key] = i
+
+    del table[keys[1]]
+    assert table.probe_stats()["tombstones"] == 1
+    assert table[keys[4]] == 4
+    assert table.probe_stats()["max_probe"] == 5
+
+    # Re-adding reuses the tombstone instead of extending the run
+    table[keys[1]] = "again"
+    assert table.probe_stats()["tombstones"] == 0
+
+    # Deleting from the end of a run frees the slot and the tombstones before it
+    del table[keys[3]]
+    assert table.probe_stats()["tombstones"] == 1
+    del table[keys[4]]
+    assert table.probe_stats()["tombstones"] == 0
+    assert table.probe_stats()["avg_probe"] == pytest.approx((1 + 2 + 3) / 3)
+
+    del table[keys[0]]
+    table.compact()
+    assert table.probe_stats()["tombstones"] == 0
+    assert table.probe_stats()["avg_probe"] == pytest.approx((1 + 2) / 2)
+    with pytest.raises(KeyError):
+        del table[keys[4]]
+
+
+def test_grows_and_shrinks_with_load():
+    table = OpenAddressingTable()
+    for key in range(1_000):
+        table[key] = key
+    assert table.capacity == 2048
+    # Consecutive ids are spread out, so lookups stay short (hits and misses)
+    stats = table.probe_stats()
+    assert stats["avg_probe"] < 1.5
+    assert stats["avg_miss_probe"] < 3
+
+    for key in range(990):
+        del table[key]
+    assert table.capacity < 2048
+    assert table.load_factor >= table.min_load
+    assert sorted(table) == list(range(990, 1_000))
+
+
+def test_song_table_runs_on_open_addressing_backend():
+    table = SongTable(table_factory=OpenAddressingTable)
+    table.load_from_list([Song(song_id=i, title=f"Song {i}", artist="Band", year=2000 + i % 3)
+                          for i in range(100)])
+
+    assert table.update_song(5, title="Renamed", persist=False)
+    assert table.get_song(5).title == "Renamed"
+    assert len(table.find_by("year", 2001)) == 33
+    assert table.remove_song(5).title == "Renamed"
+    assert table.get_song(5) is None
+    assert isinstance(table.table, OpenAddressingTable)
@@ -2,10 +2,26 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import io
+import sqlite3
+import tempfile
 import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from contextlib import redirect_stdout
 from memory_profiler import memory_usage
+from src.db import connection, database
+from src.ds.bst_read import SongBST, read_song_data
+from src.ds.catalog import SongCatalog
+from src.ds.hashtable_update import SongTable
+from src.ds.open_addressing import OpenAddressingTable
+from src.ds.trie_search import SongTrie
+from src.ds.queue_create import PrioritySongQueue, SongQueue
 from src.ds.stack_delete import DeleteStack
+from src.ui.tasks import TaskRunner
 from src.model.song import Song
+from src.utils.logger import temporary_level
 
 
 def measure_stack_operations():
@@ -44,12 +60,884 @@ def measure_stack_operations():
     print(f"Memory used: {max(mem_usage_pop) - min(mem_usage_pop):.4f} MiB")
 
 
+def measure_bst_bulk_load():
+    print("\n=== BST REBUILD PERFORMANCE ===")
+
+    sizes = [10_000, 100_000, 1_000_000]
+    songs = [
+        Song(song_id=i, title=f"Song {i:07d}", artist=f"Artist {i % 500}")
+        for i in range(max(sizes))
+    ]
+
+    for size in sizes:
+        batch = songs[:size]
+
+        start_time = time.perf_counter()
+        with temporary_level("WARNING"):
+            bst = SongBST.from_sorted(batch)
+        end_time = time.perf_counter()
+        print(f"from_sorted: {size:>9,} songs in {end_time - start_time:.4f}s (height {bst.height()})")
+
+    # One-at-a-time inserts for comparison (the old reload_bst path)
+    size = sizes[0]
+    start_time = time.perf_counter()
+    with temporary_level("WARNING"):
+        bst = SongBST()
+        for song in songs[:size]:
+            bst.insert(song)
+    end_time = time.perf_counter()
+    print(f"insert loop: {size:>9,} songs in {end_time - start_time:.4f}s (height {bst.height()})")
+
+
+def measure_logging_overhead():
+    print("\n=== VERBOSE VS QUIET LOGGING ===")
+
+    size = 5_000
+    songs = [
+        Song(song_id=i, title=f"Song {i:05d}", artist=f"Artist {i % 50}")
+        for i in range(size)
+    ]
+
+    def build_structures():
+        bst = SongBST()
+        queue = SongQueue()
+        for song in songs:
+            bst.insert(song)
+            queue.enqueue_song(song)
+        SongTable().load_from_list(songs)
+
+    for label, level in (("verbose", "DEBUG"), ("quiet", "WARNING")):
+        sink = io.StringIO()
+        start_time = time.perf_counter()
+        with temporary_level(level), redirect_stdout(sink):
+            build_structures()
+        end_time = time.perf_counter()
+        print(f"{label:>7}: {size:,} BST inserts + enqueues + table loads in "
+              f"{end_time - start_time:.4f}s ({sink.tell():,} chars of trace output)")
+
+
+def measure_database_latency():
+    print("\n=== DATABASE CONNECTION REUSE ===")
+
+    operations = 2_000
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            for i in range(operations):
+                database.insert_song_to_db(Song(title=f"Song {i}", artist="Artist"))
+
+            # Previous behaviour: a fresh connection for every call
+            def lookup_with_new_connection(song_id):
+                conn = sqlite3.connect(database.DB_PATH)
+                try:
+                    conn.execute(f"SELECT {database.SONG_COLUMNS} FROM songs WHERE id = ?",
+                                 (song_id,)).fetchone()
+                finally:
+                    conn.close()
+
+            def insert_with_new_connection(i):
+                conn = sqlite3.connect(database.DB_PATH)
+                try:
+                    conn.execute("INSERT INTO songs (title, artist) VALUES (?, ?)", (f"Old {i}", "Artist"))
+                    conn.commit()
+                finally:
+                    conn.close()
+
+            cases = [
+                ("lookup, new connection", lookup_with_new_connection),
+                ("lookup, pooled", database.get_song_by_id),
+                ("insert, new connection", insert_with_new_connection),
+                ("insert, pooled", lambda i: database.insert_song_to_db(Song(title=f"New {i}", artist="Artist"))),
+            ]
+            for label, operation in cases:
+                start_time = time.perf_counter()
+                for i in range(1, operations + 1):
+                    operation(i)
+                elapsed = time.perf_counter() - start_time
+                print(f"{label:>24}: {elapsed / operations * 1e6:8.1f} us/op")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_bulk_queue_processing():
+    print("\n=== QUEUE PROCESSING: BULK VS PER-ROW INSERTS ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+
+            size = 5_000
+            start_time = time.perf_counter()
+            for i in range(size):
+                database.insert_song_to_db(Song(title=f"Row {i}", artist="Artist"))
+            elapsed = time.perf_counter() - start_time
+            print(f"   per-row inserts: {size:>7,} songs in {elapsed:.4f}s")
+
+            size = 100_000
+            queue = SongQueue()
+            for i in range(size):
+                queue.enqueue_song(Song(title=f"Bulk {i}", artist="Artist"))
+            start_time = time.perf_counter()
+            failed = queue.process_queue()
+            elapsed = time.perf_counter() - start_time
+            print(f"process_queue bulk: {size:>7,} songs in {elapsed:.4f}s ({len(failed)} failed)")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_search_latency(catalog_size=1_000_000):
+    print("\n=== SEARCH: FTS5 INDEX VS LIKE SCAN ===")
+
+    # ~1,000 distinct words so a single-word query hits well under 1% of the catalog
+    syllables = ["lo", "ve", "ni", "ght", "ho", "tel", "dre", "am", "ri", "ver",
+                 "fi", "re", "hea", "rt", "su", "mm", "blu", "ro", "ad", "mo",
+                 "on", "ci", "ty", "wi", "ld", "so", "ng", "ka", "ze", "pa", "ru", "mi"]
+    words = [a + b for a in syllables for b in syllables]
+
+    def word(n):
+        return words[(n * 7919) % len(words)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            start_time = time.perf_counter()
+            database.insert_songs_bulk(
+                Song(title=f"{word(i)} {word(i // 3 + 17)} {i}",
+                     artist=f"Artist {i % 5_000}", album=f"{word(i // 1000)} Album")
+                for i in range(catalog_size)
+            )
+            print(f"Loaded {catalog_size:,} songs (with index) in {time.perf_counter() - start_time:.2f}s")
+
+            conn = connection.get_connection(database.DB_PATH)
+            queries = [words[100], words[100][:3], "artist 4999", f"{words[7]} {words[40][:3]}", "12345"]
+            for query in queries:
+                start_time = time.perf_counter()
+                fts_results = database.search_songs(query)
+                fts_time = time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                like_results = database._search_songs_like(conn, query).fetchall()
+                like_time = time.perf_counter() - start_time
+                print(f"{query!r:>14}: FTS {fts_time * 1000:8.1f} ms ({len(fts_results):>7,} hits)"
+                      f" | LIKE {like_time * 1000:8.1f} ms ({len(like_results):>7,} hits)")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_autocomplete(library_size=200_000):
+    print("\n=== AUTOCOMPLETE: TRIE COMPLETIONS ===")
+
+    syllables = ["lo", "ve", "ni", "ght", "ho", "tel", "dre", "am", "ri", "ver",
+                 "fi", "re", "hea", "rt", "su", "mm", "blu", "ro", "ad", "mo"]
+    words = [a + b for a in syllables for b in syllables]
+    songs = [Song(song_id=i, title=f"{words[(i * 7919) % 400]} {words[(i // 3) % 400]}",
+                  artist=f"Artist {i % 5_000}", album=f"{words[(i // 1000) % 400]} Album")
+             for i in range(library_size)]
+
+    with temporary_level("WARNING"):
+        trie = SongTrie()
+        start_time = time.perf_counter()
+        trie.add_songs(songs)
+        print(f"Indexed {library_size:,} songs in {time.perf_counter() - start_time:.2f}s "
+              f"({trie.node_count:,} nodes)")
+
+        start_time = time.perf_counter()
+        trie.complete("")
+        print(f"First lookup (builds every cached top-k) took {time.perf_counter() - start_time:.2f}s")
+
+        prefixes = [words[42][:n] for n in range(1, 5)] + ["artist 49"]
+        iterations = 1_000
+        for prefix in prefixes:
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                trie.complete(prefix)
+            per_call = (time.perf_counter() - start_time) / iterations
+            print(f"complete({prefix!r:>12}): {per_call * 1e6:7.1f} us")
+
+        # One keystroke after an edit: only the changed path is rebuilt
+        start_time = time.perf_counter()
+        for i in range(iterations):
+            trie.update_song(Song(song_id=i, title=f"Renamed {i}", artist="Someone", album=""))
+            trie.complete("re")
+        per_call = (time.perf_counter() - start_time) / iterations
+        print(f"update + complete: {per_call * 1e6:7.1f} us")
+
+
+class _DictSong:
+    """The pre-__slots__ Song model, kept here as a benchmark baseline"""
+
+    def __init__(self, song_id=None, title="", artist="", album="", duration=0,
+                 file_path="", genre="", year=None, created_at=None):
+        self.id = song_id
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.duration = duration
+        self.file_path = file_path
+        self.genre = genre
+        self.year = year
+        self.created_at = created_at or datetime.now()
+
+
+def measure_song_model(count=1_000_000):
+    print("\n=== SONG MODEL: CONSTRUCTION TIME AND MEMORY ===")
+
+    for label, cls in (("dict-based Song", _DictSong), ("slotted Song", Song)):
+        start_time = time.perf_counter()
+        songs = [cls(song_id=i, title="Title", artist="Artist", album="Album") for i in range(count)]
+        elapsed = time.perf_counter() - start_time
+        del songs
+
+        tracemalloc.start()
+        songs = [cls(song_id=i, title="Title", artist="Artist", album="Album") for i in range(count)]
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del songs
+
+        print(f"{label:>16}: {count:,} built in {elapsed:.2f}s, "
+              f"{allocated / 2 ** 20:7.1f} MiB ({allocated / count:.0f} bytes/song)")
+
+
+def measure_catalog_startup(catalog_size=100_000):
+    print("\n=== UI STARTUP: SEPARATE LOADS VS SHARED CATALOG ===")
+
+    def separate_loads():
+        # What MediaPlayerUI.__init__ used to do: one load for the BST, another
+        # through read_song_data() for the hash table, with Song -> dict -> Song
+        bst = SongBST.from_sorted(database.get_all_songs())
+        table = SongTable()
+        table.load_from_list([Song(song_id=d["id"], title=d["title"], artist=d["artist"],
+                                   album=d["album"], year=d["year"])
+                              for d in read_song_data()])
+        return bst, table
+
+    def shared_catalog():
+        catalog = SongCatalog()
+        catalog.load()
+        return catalog
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {i:07d}", artist=f"Artist {i % 500}",
+                                            album=f"Album {i % 2_000}", genre="Rock", year=1970 + i % 50)
+                                       for i in range(catalog_size))
+
+            for label, load in (("separate loads", separate_loads), ("shared catalog", shared_catalog)):
+                start_time = time.perf_counter()
+                result = load()
+                elapsed = time.perf_counter() - start_time
+                del result
+
+                tracemalloc.start()
+                result = load()
+                retained, _ = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del result
+                print(f"{label:>15}: {catalog_size:,} songs in {elapsed:.2f}s, "
+                      f"{retained / 2 ** 20:.1f} MiB retained")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_incremental_update(catalog_size=100_000):
+    print("\n=== SINGLE EDIT: FULL RELOAD VS CHANGE DELTAS ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {i:07d}", artist=f"Artist {i % 500}")
+                                       for i in range(catalog_size))
+            catalog = SongCatalog()
+            catalog.load()
+            ids = sorted(catalog.table.table)
+
+            # Before: every edit was followed by reload_bst() and a full song list rebuild
+            edits = 5
+            start_time = time.perf_counter()
+            for n in range(edits):
+                catalog.table.changes.unsubscribe(catalog.apply_change)
+                catalog.table.update_song(ids[n], title=f"Reloaded {n}")
+                catalog.table.changes.subscribe(catalog.apply_change)
+                SongBST.from_sorted(database.get_all_songs())
+                sorted(database.get_all_songs(), key=lambda song: song.id)
+            reload_time = (time.perf_counter() - start_time) / edits
+
+            edits = 500
+            start_time = time.perf_counter()
+            for n in range(edits):
+                catalog.table.update_song(ids[-n - 1], title=f"Renamed {n}")
+            delta_time = (time.perf_counter() - start_time) / edits
+
+            print(f"{catalog_size:,} songs: full reload {reload_time * 1000:.1f} ms/edit, "
+                  f"delta {delta_time * 1000:.3f} ms/edit (incl. the UPDATE statement)")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_paged_song_list(catalog_size=200_000, visible_rows=30):
+    print("\n=== SONG LIST: FULL REPOPULATE VS KEYSET PAGE ===")
+
+    def line(song):
+        return f"{song.id:<4} | {song.title[:25]:<25} | {song.artist[:20]:<20} | {song.album[:20]:<20}"
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {i}", artist=f"Artist {i % 500}", album="Album")
+                                       for i in range(catalog_size))
+
+            start_time = time.perf_counter()
+            lines = [line(song) for song in sorted(database.get_all_songs(), key=lambda song: song.id)]
+            print(f"Full refresh ({len(lines):,} lines): {(time.perf_counter() - start_time) * 1000:.1f} ms")
+
+            for label, offset in (("top", 0), ("middle", catalog_size // 2), ("end", catalog_size - visible_rows)):
+                after_id = database.get_song_id_at(offset - 1) if offset else None
+                start_time = time.perf_counter()
+                page = [line(song) for song in database.get_songs_after_id(after_id, visible_rows)]
+                page_time = time.perf_counter() - start_time
+
+                start_time = time.perf_counter()
+                database.get_song_id_at(offset)
+                seek_time = time.perf_counter() - start_time
+                print(f"{label:>6} page ({len(page)} rows): {page_time * 1000:.2f} ms"
+                      f" | scrollbar jump seek: {seek_time * 1000:.2f} ms")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_background_queue(queue_size=50_000):
+    print("\n=== PROCESS QUEUE: TK THREAD STALL, BLOCKING VS BACKGROUND TASK ===")
+
+    class EventLoop:
+        """Minimal stand-in for Tk's mainloop: runs after() callbacks and records the longest stall"""
+        def __init__(self):
+            self.scheduled = []
+            self.longest_stall = 0.0
+
+        def after(self, delay, callback):
+            self.scheduled.append(callback)
+
+        def run(self):
+            while self.scheduled:
+                start_time = time.perf_counter()
+                self.scheduled.pop(0)()
+                self.longest_stall = max(self.longest_stall, time.perf_counter() - start_time)
+                time.sleep(0.001)
+
+    def fill_queue():
+        queue = SongQueue()
+        for i in range(queue_size):
+            queue.enqueue_song(Song(title=f"Queued {i}", artist=f"Artist {i % 100}", duration=200))
+        return queue
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+
+            queue = fill_queue()
+            start_time = time.perf_counter()
+            queue.process_queue()
+            print(f"Blocking process_queue ({queue_size:,} songs): "
+                  f"Tk thread stalled {(time.perf_counter() - start_time) * 1000:.0f} ms")
+
+            queue = fill_queue()
+            loop = EventLoop()
+            runner = TaskRunner(loop)
+            updates = []
+            start_time = time.perf_counter()
+            # As the GUI does it: the batch leaves the queue on the Tk thread, the worker only inserts
+            batch = queue.take_all()
+            runner.submit(lambda task: queue.insert_batch(batch, progress=task.report_progress,
+                                                          should_stop=lambda: task.cancelled),
+                          on_done=lambda result: queue.requeue_front(result[2]),
+                          on_progress=lambda done, total: updates.append(done))
+            loop.run()
+            total_time = time.perf_counter() - start_time
+            runner.shutdown()
+            print(f"Background task: done in {total_time * 1000:.0f} ms, {len(updates)} progress updates, "
+                  f"longest Tk thread stall {loop.longest_stall * 1000:.2f} ms")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_priority_queue(queue_size=100_000, moves=1_000):
+    print("\n=== PLAY QUEUE REORDER: DEQUE SCAN VS INDEXED LINKED LIST AND HEAP ===")
+    import random
+    rng = random.Random(42)
+    songs = [Song(song_id=i, title=f"Song {i}", artist="X") for i in range(queue_size)]
+    targets = [rng.randrange(queue_size) for _ in range(moves)]
+
+    with temporary_level("WARNING"):
+        fifo = deque(songs)
+        start_time = time.perf_counter()
+        for song_id in targets:
+            # Move to front: find the song by scanning, then re-insert it
+            for index, song in enumerate(fifo):
+                if song.id == song_id:
+                    del fifo[index]
+                    fifo.appendleft(song)
+                    break
+        deque_time = time.perf_counter() - start_time
+
+        linked = SongQueue()
+        for song in songs:
+            linked.enqueue_song(song)
+        start_time = time.perf_counter()
+        for song_id in targets:
+            linked.move_to_front(song_id)
+        linked_time = time.perf_counter() - start_time
+
+        heap = PrioritySongQueue()
+        for song in songs:
+            heap.enqueue_song(song, priority=song.id)
+        start_time = time.perf_counter()
+        for move, song_id in enumerate(targets):
+            heap.reprioritize(song_id, -move - 1)
+        heap_time = time.perf_counter() - start_time
+
+    print(f"{moves:,} reorders in a {queue_size:,}-song queue: deque scan {deque_time * 1000:.1f} ms | "
+          f"linked list move_to_front {linked_time * 1000:.2f} ms | "
+          f"heap reprioritize {heap_time * 1000:.1f} ms")
+
+
+def measure_bounded_delete_stack(deletes=20_000, max_depth=1_000):
+    print("\n=== DELETE STACK MEMORY: UNBOUNDED VS SPILL-TO-DISK ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            for label, stack_args in (("unbounded", {}), (f"max_depth={max_depth:,}", {"max_depth": max_depth})):
+                database.insert_songs_bulk(Song(title=f"Deleted {i}", artist=f"Artist {i}", album="Album " * 5)
+                                           for i in range(deletes))
+                song_ids = [song.id for song in database.get_all_songs()]
+                stack = DeleteStack(**stack_args)
+
+                # Songs are built inside the traced region, so only what the stack keeps stays allocated
+                tracemalloc.start()
+                start_time = time.perf_counter()
+                for song_id in song_ids:
+                    stack.push_song(Song(song_id=song_id, title=f"Deleted {song_id}", artist=f"Artist {song_id}",
+                                         album="Album " * 5))
+                held = len(stack.stack)
+                retained, _ = tracemalloc.get_traced_memory()
+                stack.flush_delete_session()
+                elapsed = time.perf_counter() - start_time
+                tracemalloc.stop()
+
+                print(f"{label:>16}: {deletes:,} deletes + flush in {elapsed:.2f}s | "
+                      f"{held:,} songs in memory before flush, {retained / 1024:.0f} KiB retained")
+                database.clear_deleted_songs("history")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_batch_delete(count=10_000):
+    print("\n=== PLAYLIST CLEANUP: PER-SONG VS BATCH DELETE AND RESTORE ===")
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        database.DB_PATH = os.path.join(tmp_dir, "bench.db")
+        try:
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Cleanup {i}", artist="Band") for i in range(2 * count))
+            songs = database.get_all_songs()
+            one_by_one, batched = songs[:count], [song.id for song in songs[count:]]
+
+            stack = DeleteStack()
+            start_time = time.perf_counter()
+            for song in one_by_one:
+                stack.push_song(song)
+            push_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            while not stack.is_empty():
+                stack.restore_song_to_database(stack.pop_song())
+            restore_time = time.perf_counter() - start_time
+
+            stack = DeleteStack()
+            start_time = time.perf_counter()
+            stack.push_many(batched)
+            push_many_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            stack.restore_many(count)
+            restore_many_time = time.perf_counter() - start_time
+
+            print(f"{count:,} songs: push_song x{count:,} {push_time:.2f}s | push_many {push_many_time:.3f}s")
+            print(f"{count:,} songs: restore one by one {restore_time:.2f}s | restore_many {restore_many_time:.3f}s")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_facet_lookup(catalog_size=500_000, lookups=1_000):
+    print("\n=== ARTIST / YEAR LOOKUP: FULL SCAN VS SECONDARY INDEX ===")
+    songs = [Song(song_id=i, title=f"Song {i}", artist=f"Artist {i % 5_000}", year=1950 + i % 70)
+             for i in range(catalog_size)]
+    with temporary_level("WARNING"):
+        table = SongTable()
+        table.load_from_list(songs)
+
+        artists = [f"Artist {i * 7 % 5_000}" for i in range(lookups)]
+        start_time = time.perf_counter()
+        for artist in artists[:20]:
+            [song for song in table.table.values() if song.artist == artist]
+        scan_time = (time.perf_counter() - start_time) / 20
+
+        start_time = time.perf_counter()
+        table.find_by("artist", artists[0])
+        build_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for artist in artists:
+            table.find_by("artist", artist)
+        index_time = (time.perf_counter() - start_time) / lookups
+
+    print(f"{catalog_size:,} songs, ~{catalog_size // 5_000} per artist: full scan {scan_time * 1000:.1f} ms/lookup | "
+          f"index {index_time * 1_000_000:.1f} us/lookup (one-off build {build_time * 1000:.0f} ms)")
+
+
+def measure_hash_backends(entries=1_000_000, lookups=200_000):
+    print("\n=== SONG TABLE BACKENDS: DICT VS OPEN ADDRESSING ===")
+    import random
+    rng = random.Random(18)
+    songs = [Song(song_id=i, title=f"Song {i}", artist="X") for i in range(1, entries + 1)]
+    hits = [rng.randrange(1, entries + 1) for _ in range(lookups)]
+    misses = [entries + 1 + rng.randrange(entries) for _ in range(lookups)]
+
+    for name, factory in (("dict", dict), ("open addressing", OpenAddressingTable)):
+        with temporary_level("WARNING"):
+            tracemalloc.start()
+            table = SongTable(table_factory=factory)
+            table.load_from_list(songs)
+            structure_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            # Time a separate build without tracemalloc's overhead
+            start_time = time.perf_counter()
+            SongTable(table_factory=factory).load_from_list(songs)
+            build_time = time.perf_counter() - start_time
+
+            backend = table.table
+            start_time = time.perf_counter()
+            for key in hits:
+                backend.get(key)
+            hit_time = (time.perf_counter() - start_time) / lookups
+            start_time = time.perf_counter()
+            for key in misses:
+                backend.get(key)
+            miss_time = (time.perf_counter() - start_time) / lookups
+
+        line = (f"{name:>16}: {structure_bytes / entries:.1f} bytes/entry, build {build_time:.2f}s, "
+                f"hit {hit_time * 1e9:.0f} ns, miss {miss_time * 1e9:.0f} ns")
+        if hasattr(backend, "probe_stats"):
+            stats = backend.probe_stats()
+            line += (f" | load {stats['load_factor']:.2f}, probes avg {stats['avg_probe']:.2f} "
+                     f"max {stats['max_probe']}, misses avg {stats['avg_miss_probe']:.2f}")
+        print(line)
+        del table, backend
+
+
+def measure_bst_order_queries(catalog_size=200_000, queries=1_000):
+    print("\n=== TITLE INDEX: FULL TRAVERSAL VS ORDER-STATISTIC QUERIES ===")
+    songs = [Song(song_id=i, title=f"Song {i:07d}", artist="X") for i in range(catalog_size)]
+    with temporary_level("WARNING"):
+        bst = SongBST.from_sorted(songs)
+        middle = catalog_size // 2
+
+        start_time = time.perf_counter()
+        traversal_song = bst.inorder_traversal()[middle]
+        traversal_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for i in range(queries):
+            bst.kth((middle + i) % catalog_size)
+        kth_time = (time.perf_counter() - start_time) / queries
+        assert bst.kth(middle) is traversal_song
+
+        start_time = time.perf_counter()
+        page = []
+        for song in bst.prefix(f"Song {middle:07d}"[:-2]):
+            page.append(song)
+        prefix_time = time.perf_counter() - start_time
+
+    print(f"{catalog_size:,} songs: inorder_traversal()[i] {traversal_time * 1000:.1f} ms | "
+          f"kth(i) {kth_time * 1_000_000:.1f} us | prefix scan of {len(page)} songs {prefix_time * 1000:.2f} ms")
+
+
+def measure_bst_retitle(catalog_size=200_000, edits=10_000):
+    print("\n=== TITLE INDEX RETITLE: REBUILD VS update_key ===")
+    import random
+    rng = random.Random(20)
+    songs = [Song(song_id=i, title=f"Song {i:07d}", artist="X") for i in range(catalog_size)]
+    with temporary_level("WARNING"):
+        bst = SongBST.from_sorted(songs)
+
+        start_time = time.perf_counter()
+        SongBST.from_sorted(sorted(songs, key=lambda song: song.title))
+        rebuild_time = time.perf_counter() - start_time
+
+        # Typo fixes keep their place; renames to a random title move the node
+        targets = rng.sample(songs, edits)
+        start_time = time.perf_counter()
+        for song in targets[:edits // 2]:
+            bst.update_key(song.title, song.title + " (Remastered)")
+        in_place_time = (time.perf_counter() - start_time) / (edits // 2)
+
+        start_time = time.perf_counter()
+        for n, song in enumerate(targets[edits // 2:]):
+            bst.update_key(song.title, f"Renamed {n:07d}")
+        moved_time = (time.perf_counter() - start_time) / (edits - edits // 2)
+
+    print(f"{catalog_size:,} songs: rebuild {rebuild_time * 1000:.0f} ms/edit | update_key in place "
+          f"{in_place_time * 1_000_000:.1f} us, moved {moved_time * 1_000_000:.1f} us (height {bst.height()})")
+
+
+def measure_schema_indexes(catalog_size=300_000):
+    print("\n=== SONGS TABLE: BEFORE VS AFTER THE INDEX MIGRATIONS ===")
+    from src.db import migrations
+    import random
+    rng = random.Random(21)
+    # Titles arrive in random order, as they do from a real library import
+    songs = [Song(title=f"Song {rng.randrange(10 ** 8):08d}", artist=f"Artist {i % 5_000}",
+                  album=f"Album {i % 20_000}", file_path=f"/music/{i}.mp3", genre="Rock", year=1950 + i % 70)
+             for i in range(catalog_size)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        try:
+            for label, version in (("version 3 (no indexes)", 3), (f"version {migrations.LATEST_VERSION}",
+                                                                     migrations.LATEST_VERSION)):
+                database.DB_PATH = os.path.join(tmp_dir, f"bench_{version}.db")
+                with connection.transaction(database.DB_PATH) as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    for target, _, apply in migrations.MIGRATIONS[:version]:
+                        apply(conn)
+                    conn.execute(f"PRAGMA user_version = {version}")
+
+                start_time = time.perf_counter()
+                database.insert_songs_bulk(Song(title=s.title, artist=s.artist, album=s.album,
+                                                file_path=s.file_path, genre=s.genre, year=s.year) for s in songs)
+                insert_time = time.perf_counter() - start_time
+
+                timings = []
+                for query in (database.get_all_songs, lambda: database.get_songs_after_id(None, 50),
+                              database.count_songs, lambda: database.get_song_id_at(catalog_size // 2)):
+                    start_time = time.perf_counter()
+                    query()
+                    timings.append(time.perf_counter() - start_time)
+                connection.close_all()
+                size_mb = os.path.getsize(database.DB_PATH) / 2 ** 20
+
+                print(f"{label:>22}: bulk insert {insert_time:.2f}s, get_all_songs {timings[0]:.2f}s, "
+                      f"first id page {timings[1] * 1000:.2f} ms, count {timings[2] * 1000:.1f} ms, "
+                      f"offset jump {timings[3] * 1000:.1f} ms, file {size_mb:.0f} MiB")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_streaming_load(sizes=(50_000, 200_000)):
+    print("\n=== CATALOG LOAD: fetchall() LIST VS STREAMED ROWS ===")
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        try:
+            for size in sizes:
+                database.DB_PATH = os.path.join(tmp_dir, f"bench_{size}.db")
+                database.init_db()
+                database.insert_songs_bulk(Song(title=f"Song {i:07d}", artist=f"Artist {i % 500}",
+                                                album=f"Album {i % 2_000}", genre="Rock", year=1970 + i % 50)
+                                           for i in range(size))
+
+                def list_load():
+                    # The old get_all_songs: every row tuple, then every Song, then the indexes
+                    rows = connection.get_connection(database.DB_PATH).execute(
+                        f"SELECT {database.SONG_COLUMNS} FROM songs ORDER BY title, artist").fetchall()
+                    catalog = SongCatalog()
+                    catalog.load_from_list([database._row_to_song(row) for row in rows])
+                    return catalog
+
+                def streamed_load():
+                    catalog = SongCatalog()
+                    catalog.load()
+                    return catalog
+
+                for label, load in (("fetchall list", list_load), ("streamed", streamed_load)):
+                    tracemalloc.start()
+                    start_time = time.perf_counter()
+                    catalog = load()
+                    elapsed = time.perf_counter() - start_time
+                    retained, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+                    del catalog
+                    # Whatever the peak holds beyond the finished indexes is transient load overhead
+                    print(f"{size:>9,} songs, {label:>13}: {elapsed:.2f}s, indexes {retained / 2 ** 20:.1f} MiB, "
+                          f"transient overhead {(peak - retained) / 2 ** 20:.1f} MiB")
+                connection.close_all()
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_keyset_pages(catalog_size=200_000, page_size=50):
+    print("\n=== SONG PAGES: LIMIT/OFFSET VS KEYSET (get_songs_page) ===")
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        try:
+            database.DB_PATH = os.path.join(tmp_dir, "bench_pages.db")
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {(i * 7919) % catalog_size:07d}", artist=f"Artist {i % 500}",
+                                            album=f"Album {i % 2_000}", genre="Rock", year=1970 + i % 50)
+                                       for i in range(catalog_size))
+            conn = connection.get_connection(database.DB_PATH)
+
+            for position in (0, catalog_size // 2, catalog_size - page_size):
+                start_time = time.perf_counter()
+                conn.execute(f"SELECT {database.SONG_COLUMNS} FROM songs ORDER BY title, artist, id "
+                             "LIMIT ? OFFSET ?", (page_size, position)).fetchall()
+                offset_time = time.perf_counter() - start_time
+
+                # Scrolling hands over the previous page's last cursor; locate it outside the timing
+                after = database.get_page_cursor_at(position - 1) if position else None
+                start_time = time.perf_counter()
+                page = database.get_songs_page(after=after, limit=page_size)
+                keyset_time = time.perf_counter() - start_time
+                assert len(page.songs) == page_size
+
+                print(f"row {position:>7}: OFFSET page {offset_time * 1000:7.2f} ms, "
+                      f"keyset page {keyset_time * 1000:6.2f} ms")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_song_cache(catalog_size=50_000, lookups=50_000):
+    print("\n=== get_song_by_id: SQLITE VS LRU SONG CACHE ===")
+    import random
+    rng = random.Random(24)
+    # Skewed access: most lookups go to a few hundred hot songs, as with refreshes of the visible list
+    ids = [min(int(rng.paretovariate(1.2)), catalog_size) for _ in range(lookups)]
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        try:
+            database.DB_PATH = os.path.join(tmp_dir, "bench_cache.db")
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {i}", artist=f"Artist {i % 500}", album=f"Album {i % 2_000}")
+                                       for i in range(catalog_size))
+
+            start_time = time.perf_counter()
+            for song_id in ids:
+                database.clear_song_cache()
+                database.get_song_by_id(song_id)
+            uncached = time.perf_counter() - start_time
+
+            database.clear_song_cache()
+            database._song_cache.reset_stats()
+            start_time = time.perf_counter()
+            for song_id in ids:
+                database.get_song_by_id(song_id)
+            cached = time.perf_counter() - start_time
+            stats = database.song_cache_stats()
+
+            print(f"{'always SQLite':>14}: {uncached / lookups * 1e6:6.2f} us/lookup")
+            print(f"{'LRU cache':>14}: {cached / lookups * 1e6:6.2f} us/lookup "
+                  f"(hit rate {stats['hit_rate']:.1%}, {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB)")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
+def measure_search_cache(catalog_size=200_000, repeats=200):
+    print("\n=== search_songs: REPEATED QUERIES, UNCACHED VS GENERATION-STAMPED CACHE ===")
+    with tempfile.TemporaryDirectory() as tmp_dir, temporary_level("WARNING"):
+        old_path = database.DB_PATH
+        try:
+            database.DB_PATH = os.path.join(tmp_dir, "bench_search_cache.db")
+            database.init_db()
+            database.insert_songs_bulk(Song(title=f"Song {i} {('love', 'night', 'river', 'fire')[i % 4]}",
+                                            artist=f"Artist {i % 500}", album=f"Album {i % 2_000}")
+                                       for i in range(catalog_size))
+            queries = ["love 1234", "LOVE  1234", "river 777", "album 1999"]
+
+            start_time = time.perf_counter()
+            for i in range(repeats):
+                database.clear_search_cache()
+                database.search_songs(queries[i % len(queries)])
+            uncached = time.perf_counter() - start_time
+
+            database.clear_search_cache()
+            database._search_cache.reset_stats()
+            start_time = time.perf_counter()
+            for i in range(repeats):
+                database.search_songs(queries[i % len(queries)])
+            cached = time.perf_counter() - start_time
+            stats = database.search_cache_stats()
+
+            # A write costs one counter bump, however many results are cached
+            start_time = time.perf_counter()
+            database.update_song_in_db(database.get_song_by_id(1))
+            write_time = time.perf_counter() - start_time
+
+            print(f"{'uncached':>9}: {uncached / repeats * 1000:7.3f} ms/search")
+            print(f"{'cached':>9}: {cached / repeats * 1000:7.3f} ms/search (hit rate {stats['hit_rate']:.1%}, "
+                  f"{stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB)")
+            print(f"update after caching: {write_time * 1000:.2f} ms, write generation {database.write_generation()}")
+        finally:
+            connection.close_all()
+            database.DB_PATH = old_path
+
+
 def main():
     print("=== DSA MEDIA PLAYER PERFORMANCE TESTS ===")
     measure_stack_operations()
+    measure_bst_bulk_load()
+    measure_logging_overhead()
+    measure_database_latency()
+    measure_bulk_queue_processing()
+    measure_search_latency()
+    measure_autocomplete()
+    measure_song_model()
+    measure_catalog_startup()
+    measure_incremental_update()
+    measure_paged_song_list()
+    measure_background_queue()
+    measure_priority_queue()
+    measure_bounded_delete_stack()
+    measure_batch_delete()
+    measure_facet_lookup()
+    measure_hash_backends()
+    measure_bst_order_queries()
+    measure_bst_retitle()
+    measure_schema_indexes()
+    measure_streaming_load()
+    measure_keyset_pages()
+    measure_song_cache()
+    measure_search_cache()
     # Additional calls can be added here like:
     # measure_queue_operations()
-    # measure_bst_insert_and_search()
     # measure_database_insert_delete()
 
 
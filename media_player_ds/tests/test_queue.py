@@ -1,5 +1,5 @@
 import pytest
-from src.ds.queue_create import SongQueue
+from src.ds.queue_create import PrioritySongQueue, SongQueue
 from src.model.song import Song
 
 
@@ -129,3 +129,184 @@ def test_enqueue_multiple_and_order():
     assert queue.dequeue_song().title == "Beta"
     assert queue.dequeue_song().title == "Gamma"
     assert queue.is_empty()
+
+
+def test_process_queue_uses_bulk_insert(monkeypatch):
+    queue = SongQueue()
+    songs = [Song(title=f"Bulk {i}", artist="X", duration=100) for i in range(5)]
+    for song in songs:
+        queue.enqueue_song(song)
+
+    calls = []
+
+    def insert_songs_bulk(batch, chunk_size=1000):
+        calls.append((list(batch), chunk_size))
+        return len(batch) - 1, [(batch[2], "constraint failed")]
+
+    monkeypatch.setitem(__import__("sys").modules, "src.db.database", type("mock_module", (), {
+        "insert_songs_bulk": staticmethod(insert_songs_bulk)
+    }))
+
+    failed = queue.process_queue(chunk_size=2)
+
+    assert calls == [(songs, 2)]
+    assert failed == [(songs[2], "constraint failed")]
+    assert queue.is_empty()
+
+
+def test_process_queue_reports_progress_and_stops(monkeypatch):
+    queue = SongQueue()
+    songs = [Song(title=f"Chunk {i}", artist="X", duration=100) for i in range(5)]
+    for song in songs:
+        queue.enqueue_song(song)
+
+    calls = []
+
+    def insert_songs_bulk(batch, chunk_size=1000):
+        calls.append(list(batch))
+        return len(batch), []
+
+    monkeypatch.setitem(__import__("sys").modules, "src.db.database", type("mock_module", (), {
+        "insert_songs_bulk": staticmethod(insert_songs_bulk)
+    }))
+
+    reported = []
+    failed = queue.process_queue(chunk_size=2, progress=lambda done, total: reported.append((done, total)),
+                                 should_stop=lambda: len(calls) == 2)
+
+    # Two chunks were committed, the fifth song goes back to the queue
+    assert calls == [songs[0:2], songs[2:4]]
+    assert reported == [(2, 5), (4, 5)]
+    assert failed == []
+    assert list(queue.queue) == [songs[4]]
+
+
+def test_insert_batch_leaves_the_queue_to_its_owner(monkeypatch):
+    # take_all / requeue_front run on the owning thread, insert_batch on a worker
+    queue = SongQueue()
+    songs = [Song(title=f"Batch {i}", artist="X", duration=100) for i in range(5)]
+    for song in songs:
+        queue.enqueue_song(song)
+
+    calls = []
+
+    def insert_songs_bulk(batch, chunk_size=1000):
+        calls.append(list(batch))
+        return len(batch), []
+
+    monkeypatch.setitem(__import__("sys").modules, "src.db.database", type("mock_module", (), {
+        "insert_songs_bulk": staticmethod(insert_songs_bulk)
+    }))
+
+    batch = queue.take_all()
+    assert batch == songs and queue.is_empty()
+
+    late = Song(title="Added meanwhile", artist="X", duration=100)
+    queue.enqueue_song(late)
+    inserted, failed, not_attempted = queue.insert_batch(batch, chunk_size=2, should_stop=lambda: len(calls) == 1)
+    assert (inserted, failed, not_attempted) == (2, [], songs[2:])
+    assert list(queue.queue) == [late]
+
+    queue.requeue_front(not_attempted)
+    assert list(queue.queue) == songs[2:] + [late]
+    assert queue.total_dequeued == 2
+
+
+def test_priority_queue_orders_by_priority_then_fifo():
+    queue = PrioritySongQueue()
+    low = Song(song_id=1, title="Low", artist="A", duration=100)
+    high = Song(song_id=2, title="High", artist="B", duration=100)
+    tie = Song(song_id=3, title="Tie", artist="C", duration=100)
+    queue.enqueue_song(low, priority=5)
+    queue.enqueue_song(high, priority=1)
+    queue.enqueue_song(tie, priority=5)
+
+    assert queue.peek_next() is high
+    assert [queue.dequeue_song() for _ in range(3)] == [high, low, tie]
+    assert queue.dequeue_song() is None
+
+
+def test_priority_queue_reprioritize_and_remove():
+    queue = PrioritySongQueue()
+    songs = [Song(song_id=i, title=f"Song {i}", artist="X", duration=100) for i in range(10)]
+    for song in songs:
+        queue.enqueue_song(song, priority=song.id)
+
+    assert queue.reprioritize(9, -1)
+    assert queue.reprioritize(0, 20)
+    assert not queue.reprioritize(99, 0)
+    assert queue.remove(4) is songs[4]
+    assert queue.remove(4) is None
+    assert 4 not in queue
+
+    # Enqueueing a queued song moves it instead of adding a duplicate
+    queue.enqueue_song(songs[5], priority=0)
+    assert len(queue) == 9
+
+    expected = [9, 5, 1, 2, 3, 6, 7, 8, 0]
+    assert [song.id for song in queue.songs_in_order()] == expected
+    assert [queue.dequeue_song().id for _ in range(9)] == expected
+
+
+def test_priority_queue_matches_sorted_order_under_random_updates():
+    import random
+    rng = random.Random(13)
+    queue = PrioritySongQueue()
+    priorities = {}
+    for i in range(500):
+        priorities[i] = rng.randint(0, 50)
+        queue.enqueue_song(Song(song_id=i, title=f"S{i}", artist="X"), priorities[i])
+    for _ in range(300):
+        song_id = rng.randrange(500)
+        if song_id not in priorities:
+            continue
+        if rng.random() < 0.5:
+            priorities[song_id] = rng.randint(0, 50)
+            queue.reprioritize(song_id, priorities[song_id])
+        else:
+            queue.remove(song_id)
+            del priorities[song_id]
+
+    popped = [queue.dequeue_song().id for _ in range(len(queue))]
+    assert sorted(popped) == sorted(priorities)
+    assert [priorities[song_id] for song_id in popped] == sorted(priorities.values())
+
+
+def test_remove_and_move_songs_in_the_middle():
+    queue = SongQueue()
+    songs = [Song(song_id=i, title=f"Song {i}", artist="X", duration=100) for i in range(5)]
+    for song in songs:
+        queue.enqueue_song(song)
+
+    assert queue.remove(2) is songs[2]
+    assert queue.remove(2) is None
+    assert not queue.contains(2)
+
+    assert queue.move_to_front(4)
+    assert queue.move_after(0, 3)
+    assert not queue.move_after(0, 99)
+    assert not queue.move_to_front(99)
+
+    assert [song.id for song in queue.queue] == [4, 1, 3, 0]
+    assert queue.peek_next() is songs[4]
+    assert queue.queue[-1] is songs[0]
+    assert [queue.dequeue_song().id for _ in range(4)] == [4, 1, 3, 0]
+    assert queue.is_empty()
+
+
+def test_enqueue_skips_duplicates():
+    queue = SongQueue()
+    saved = Song(song_id=7, title="Saved", artist="X", duration=100)
+    unsaved = Song(title="Unsaved", artist="X", duration=100)
+    twin = Song(title="Unsaved", artist="X", duration=100)
+
+    assert queue.enqueue_song(saved)
+    assert not queue.enqueue_song(Song(song_id=7, title="Saved again", artist="X", duration=100))
+    # Songs without an id are told apart by identity
+    assert queue.enqueue_song(unsaved)
+    assert queue.enqueue_song(twin)
+    assert not queue.enqueue_song(unsaved)
+
+    assert queue.get_queue_size() == 3
+    assert queue.remove(unsaved) is unsaved
+    assert list(queue.queue) == [saved, twin]
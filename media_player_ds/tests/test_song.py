@@ -0,0 +1,32 @@
+import pytest
+from datetime import datetime, timedelta
+from src.model.song import Song
+
+
+def test_song_has_no_instance_dict():
+    song = Song(song_id=1, title="Imagine", artist="John Lennon")
+    assert not hasattr(song, "__dict__")
+    with pytest.raises(AttributeError):
+        song.rating = 5
+
+
+def test_created_at_defaults_to_construction_time():
+    before = datetime.now() - timedelta(seconds=1)
+    song = Song(title="Imagine")
+    assert before <= song.created_at <= datetime.now()
+    assert song.created_at is song.created_at
+
+
+def test_explicit_created_at_is_kept():
+    stamp = datetime(2020, 1, 1)
+    assert Song(title="Imagine", created_at=stamp).created_at == stamp
+    assert Song(title="Imagine", created_at="2020-01-01 00:00:00").created_at == "2020-01-01 00:00:00"
+
+
+def test_to_dict_is_unchanged():
+    song = Song(song_id=7, title="Yesterday", artist="The Beatles", album="Help!",
+                duration=125, file_path="/m/y.mp3", genre="Pop", year=1965)
+    assert song.to_dict() == {
+        "id": 7, "title": "Yesterday", "artist": "The Beatles", "album": "Help!",
+        "year": 1965, "duration": 125, "genre": "Pop", "file_path": "/m/y.mp3",
+    }
@@ -1,8 +1,10 @@
 import pytest
+from src.db import connection, database
 from src.ds.stack_delete import DeleteStack
 from src.model.song import Song
 
 import sys
+import types
 
 @pytest.fixture(autouse=True)
 def mock_delete(monkeypatch):
@@ -48,6 +50,21 @@ def test_push_and_pop_behavior():
     assert stack.is_empty()
 
 
+def test_push_deleted_records_without_touching_the_database(monkeypatch):
+    # The GUI runs the DELETE on a worker and pushes on the Tk thread afterwards
+    monkeypatch.setitem(sys.modules, "src.db.database", types.SimpleNamespace())
+    stack = DeleteStack()
+    removed = []
+    stack.changes.subscribe(lambda change: removed.append(change.song.id))
+    song = Song(song_id="d1", title="Already Gone", artist="Someone", duration=120)
+
+    stack.push_deleted(song)
+
+    assert stack.peek() is song
+    assert stack.total_pushes == 1
+    assert removed == ["d1"]
+
+
 def test_peek_returns_top_song():
     stack = DeleteStack()
     s1 = Song(song_id="s123", title="Peek Song", artist="Z", duration=180)
@@ -104,3 +121,170 @@ def test_restore_song_to_database_simulation(monkeypatch):
 
     result = stack.restore_song_to_database(song)
     assert result is True
+
+
+@pytest.fixture
+def spill_db(tmp_path, monkeypatch):
+    """Real deleted_songs log in a temp file; deletes from songs still always succeed"""
+    db_path = str(tmp_path / "songs.db")
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+    database.init_db()
+    names = ["spill_deleted_songs", "take_deleted_songs", "get_deleted_songs_page",
+             "count_deleted_songs", "flush_deleted_session", "clear_deleted_songs"]
+    module = types.SimpleNamespace(delete_song_from_db=lambda song_id: True,
+                                   **{name: getattr(database, name) for name in names})
+    monkeypatch.setitem(sys.modules, "src.db.database", module)
+    yield db_path
+    connection.close_connection(db_path)
+
+
+def _songs(count):
+    return [Song(song_id=i, title=f"Song {i}", artist="X", duration=100) for i in range(count)]
+
+
+def test_bounded_stack_spills_and_pages_back_in_lifo_order(spill_db):
+    stack = DeleteStack(max_depth=4, page_size=3)
+    songs = _songs(10)
+    for song in songs:
+        stack.push_song(song)
+
+    assert len(stack.stack) <= 4
+    assert stack.spilled["session"] > 0
+    assert stack.session_size() == 10
+    assert [s.id for s in stack.get_current_delete_session()] == list(range(10))
+
+    popped = []
+    while not stack.is_empty():
+        popped.append(stack.pop_song().id)
+    assert popped == list(range(9, -1, -1))
+    assert database.count_deleted_songs("session") == 0
+
+
+def test_bounded_flush_keeps_history_order_on_disk(spill_db):
+    stack = DeleteStack(max_depth=4)
+    for song in _songs(10):
+        stack.push_song(song)
+
+    stack.flush_delete_session()
+
+    assert stack.is_empty()
+    assert stack.history_size() == 10
+    assert stack.total_permanent_deletes == 10
+    assert [s.id for s in stack.iter_deleted_songs_history()] == list(range(9, -1, -1))
+    assert len(stack.deleted_songs_history) <= 4
+
+
+def test_spilled_session_survives_a_new_stack(spill_db):
+    first = DeleteStack(max_bytes=2000)
+    for song in _songs(20):
+        first.push_song(song)
+    assert first.spilled["session"] > 0
+
+    # A new bounded stack resumes the songs that reached the disk log
+    second = DeleteStack(max_bytes=2000)
+    assert second.session_size() == first.spilled["session"]
+    assert second.pop_song().id == first.spilled["session"] - 1
+
+
+def test_persist_lets_a_new_stack_resume_everything(spill_db):
+    first = DeleteStack(max_depth=4)
+    for song in _songs(6):
+        first.push_song(song)
+    first.flush_delete_session()
+    for song in _songs(10)[6:]:
+        first.push_song(song)
+    assert first.stack
+
+    assert first.persist()
+    second = DeleteStack(max_depth=4)
+    assert second.session_size() == 4
+    assert second.history_size() == 6
+    assert [second.pop_song().id for _ in range(4)] == [9, 8, 7, 6]
+    assert [s.id for s in second.iter_deleted_songs_history()] == [5, 4, 3, 2, 1, 0]
+
+
+def test_failed_flush_leaves_the_session_as_it_was(spill_db, monkeypatch):
+    stack = DeleteStack(max_depth=4)
+    for song in _songs(10):
+        stack.push_song(song)
+    in_memory = [s.id for s in stack.stack]
+    monkeypatch.setattr(sys.modules["src.db.database"], "flush_deleted_session", lambda history=(): None)
+
+    assert stack.flush_delete_session() == []
+    assert [s.id for s in stack.stack] == in_memory
+    assert stack.session_size() == 10
+    assert stack.history_size() == 0
+    assert [s.id for s in stack.get_current_delete_session()] == list(range(10))
+
+
+def test_failed_page_in_keeps_the_spilled_count(spill_db, monkeypatch):
+    stack = DeleteStack(max_depth=4)
+    for song in _songs(10):
+        stack.push_song(song)
+    spilled = stack.spilled["session"]
+    while stack.stack:
+        stack.pop_song()
+    monkeypatch.setattr(sys.modules["src.db.database"], "take_deleted_songs", lambda area, limit: [])
+
+    assert stack.pop_song() is None
+    assert stack.spilled["session"] == spilled
+    assert not stack.is_empty()
+
+
+def test_view_of_a_resumed_session_with_nothing_in_memory(spill_db, capsys):
+    first = DeleteStack(max_depth=4)
+    for song in _songs(10):
+        first.push_song(song)
+    spilled = first.spilled["session"]
+
+    # Resuming: every session song is on disk, none in memory
+    stack = DeleteStack(max_depth=4)
+    assert stack.stack == [] and stack.spilled["session"] == spilled
+    stack.view_stack()
+    out = capsys.readouterr().out
+    assert f"contains {spilled} songs" in out
+    assert f"Plus {spilled} older songs" in out
+    assert str(stack).startswith(f"Current Delete Session ({spilled} songs)")
+    assert "Delete session is empty" not in str(stack)
+
+    # Nothing is lost: the songs still pop in LIFO order
+    assert stack.pop_song().id == spilled - 1
+
+
+@pytest.fixture
+def real_db(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "songs.db")
+    monkeypatch.setattr(database, "DB_PATH", db_path)
+    monkeypatch.setitem(sys.modules, "src.db.database", database)
+    database.init_db()
+    yield db_path
+    connection.close_connection(db_path)
+
+
+def test_push_many_and_restore_many_keep_original_ids(real_db):
+    songs = [Song(title=f"Batch {i}", artist="X", duration=100) for i in range(6)]
+    database.insert_songs_bulk(songs)
+    ids = [song.id for song in songs]
+
+    stack = DeleteStack()
+    events = []
+    stack.changes.subscribe(lambda change: events.append((change.kind, change.song.id)))
+
+    deleted = stack.push_many(ids[:4] + [12345])
+    assert [song.id for song in deleted] == ids[:4]
+    assert database.count_songs() == 2
+    assert stack.peek().id == ids[3]
+
+    restored = stack.restore_many(2)
+    assert [song.id for song in restored] == [ids[3], ids[2]]
+    assert database.get_song_by_id(ids[3]).title == "Batch 3"
+
+    # A song whose id is taken again cannot be restored and goes back on the stack
+    stack.undo_pop(Song(song_id=ids[2], title="Batch 2 copy", artist="X"))
+    restored = stack.restore_many(10)
+    assert [song.id for song in restored] == [ids[1], ids[0]]
+    assert [song.id for song in stack.get_current_delete_session()] == [ids[2]]
+    assert database.count_songs() == 6
+
+    assert events[:4] == [("removed", song_id) for song_id in ids[:4]]
+    assert events[4:] == [("added", song_id) for song_id in (ids[3], ids[2], ids[1], ids[0])]
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from src.ui.tasks import TaskRunner
+
+
+class FakeRoot:
+    """Stands in for Tk: after() callbacks are run by pump() on the test thread"""
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+    def pump(self, runner, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while self.scheduled:
+            assert time.monotonic() < deadline, "tasks did not finish"
+            time.sleep(0.001)
+            self.scheduled.pop(0)()
+
+
+@pytest.fixture
+def runner():
+    root = FakeRoot()
+    runner = TaskRunner(root)
+    yield runner
+    runner.shutdown()
+
+
+def test_result_is_delivered_on_main_thread(runner):
+    main_thread = threading.current_thread()
+    results = []
+
+    def job(task):
+        return threading.current_thread() is main_thread
+
+    runner.submit(job, on_done=lambda on_main: results.append((on_main, threading.current_thread())))
+    runner.root.pump(runner)
+
+    assert results == [(False, main_thread)]
+    assert not runner.busy
+
+
+def test_errors_and_progress_reach_callbacks(runner):
+    progress, errors = [], []
+
+    def job(task):
+        for done in (1, 2):
+            task.report_progress(done, 2)
+        raise ValueError("boom")
+
+    runner.submit(job, on_error=errors.append, on_progress=lambda done, total: progress.append(done))
+    runner.root.pump(runner)
+
+    assert progress == [1, 2]
+    assert [str(e) for e in errors] == ["boom"]
+
+
+def test_jobs_run_in_order_and_cancelled_job_is_skipped(runner):
+    release = threading.Event()
+    ran, done, cancelled = [], [], []
+
+    def blocking(task):
+        release.wait(5)
+        ran.append("first")
+
+    runner.submit(blocking, on_done=lambda result: done.append("first"))
+    second = runner.submit(lambda task: ran.append("second"), on_done=lambda result: done.append("second"),
+                           on_cancel=lambda: cancelled.append("second"))
+    runner.submit(lambda task: ran.append("third"), on_done=lambda result: done.append("third"))
+    second.cancel()
+    release.set()
+    runner.root.pump(runner)
+
+    assert ran == ["first", "third"]
+    assert done == ["first", "third"]
+    assert cancelled == ["second"]
+
+
+def test_on_main_thread_marshals_worker_calls(runner):
+    calls = []
+    callback = runner.on_main_thread(lambda value: calls.append((value, threading.current_thread())))
+
+    callback("direct")
+    runner.submit(lambda task: callback("from worker"))
+    runner.root.pump(runner)
+
+    main_thread = threading.current_thread()
+    assert calls == [("direct", main_thread), ("from worker", main_thread)]
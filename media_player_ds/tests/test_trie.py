@@ -0,0 +1,74 @@
+import pytest
+from src.ds.trie_search import SongTrie
+from src.ds.hashtable_update import SongTable
+from src.model.song import Song
+
+import sys
+
+
+@pytest.fixture
+def trie():
+    trie = SongTrie()
+    trie.add_songs([
+        Song(song_id=1, title="Hotel California", artist="Eagles", album="Hotel California"),
+        Song(song_id=2, title="Hey Jude", artist="The Beatles", album="Hey Jude"),
+        Song(song_id=3, title="Help!", artist="The Beatles", album="Help!"),
+        Song(song_id=4, title="Heroes", artist="David Bowie", album="Heroes"),
+    ])
+    return trie
+
+
+def test_complete_matches_word_prefixes(trie):
+    assert trie.complete("he") == ["Help!", "Heroes", "Hey Jude"]
+    assert trie.complete("HEL") == ["Help!"]
+    assert trie.complete("cal") == ["Hotel California"]
+    assert trie.complete("beat") == ["The Beatles"]
+    assert trie.complete("zz") == []
+
+
+def test_complete_ranks_by_song_count_and_respects_limit(trie):
+    trie.add_song(Song(song_id=5, title="Something", artist="The Beatles", album="Abbey Road"))
+    assert trie.complete("the")[0] == "The Beatles"
+    assert trie.complete("h", limit=2) == ["Help!", "Heroes"]
+
+
+def test_update_and_remove_are_incremental(trie):
+    assert trie.complete("hey") == ["Hey Jude"]
+
+    trie.update_song(Song(song_id=2, title="Hey Bulldog", artist="The Beatles", album="Yellow Submarine"))
+    assert trie.complete("hey") == ["Hey Bulldog"]
+    assert trie.complete("jud") == []
+
+    assert trie.remove_song(1)
+    assert not trie.remove_song(1)
+    assert trie.complete("hot") == []
+    assert len(trie) == 3
+
+
+def test_removing_everything_prunes_nodes(trie):
+    for song_id in (1, 2, 3, 4):
+        trie.remove_song(song_id)
+    assert trie.node_count == 1
+    assert trie.complete("h") == []
+
+
+def test_song_table_keeps_prefix_index_in_sync(monkeypatch):
+    monkeypatch.setitem(
+        sys.modules,
+        "src.db.database",
+        type("MockDB", (), {"update_song_in_db": staticmethod(lambda song: True)})
+    )
+    table = SongTable()
+    table.load_from_list([Song(song_id=1, title="Imagine", artist="John Lennon")])
+    assert table.complete("ima") == ["Imagine"]
+
+    table.update_song(1, title="Jealous Guy")
+    assert table.complete("ima") == []
+    assert table.complete("jea") == ["Jealous Guy"]
+
+    table.add_song(Song(song_id=2, title="Instant Karma", artist="John Lennon"))
+    assert table.complete("john") == ["John Lennon"]
+
+    table.remove_song(1)
+    assert table.complete("jea") == []
+    assert table.get_song(1) is None